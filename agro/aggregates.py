@@ -0,0 +1,11 @@
+from django.db.models import Aggregate, JSONField
+
+
+class JSONArrayAgg(Aggregate):
+    function = "JSON_GROUP_ARRAY"
+    output_field = JSONField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="JSONB_AGG", **extra_context
+        )
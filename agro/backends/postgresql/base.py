@@ -0,0 +1,76 @@
+from functools import partial
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.base import Database
+from django.utils.asyncio import async_unsafe
+
+from .pool import get_pool
+
+
+def is_open(connection):
+    return not connection.closed
+
+
+def check_connection(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Database.Error:
+        return False
+    return True
+
+
+def reset_connection(connection):
+    if connection.closed:
+        return False
+    status = connection.info.transaction_status
+    if status == Database.extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    try:
+        if status != Database.extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        connection.autocommit = True
+    except Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Connections are borrowed from a pool of the process and given back on
+    # close, so keep CONN_MAX_AGE at 0: Django then closes them at the end of
+    # each request. Options, from OPTIONS["pool"]: max_size, max_idle and
+    # timeout in seconds, and check, to test a connection before reusing it.
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_pool(self):
+        options = {**self.settings_dict["OPTIONS"].get("pool", {})}
+        check = options.pop("check", True)
+        # Keyed by the database too, as the test run switches NAME to the
+        # test database on the same alias.
+        key = (self.alias,) + tuple(
+            self.settings_dict[name] for name in ("NAME", "USER", "HOST", "PORT")
+        )
+        return get_pool(
+            key,
+            check=check_connection if check else is_open,
+            reset=reset_connection,
+            **options,
+        )
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        connect = partial(super().get_new_connection, conn_params)
+        return self.get_pool().getconn(connect)
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps the closed connection until the block exits
+                self.get_pool().discard(self.connection)
+            else:
+                self.get_pool().putconn(self.connection)
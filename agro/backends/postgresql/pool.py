@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.backends.postgresql.base import Database
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Database.OperationalError):
+    pass
+
+
+def get_pool(key, **options):
+    # One pool per process: a forked worker must not share the sockets of
+    # its parent, so it starts an empty pool of its own.
+    key = (os.getpid(), *key)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(**options)
+        return _pools[key]
+
+
+class ConnectionPool:
+    def __init__(self, max_size=10, max_idle=600, timeout=30, check=None, reset=None):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.check = check
+        self.reset = reset
+        # Idle connections with the time they were given back, the most
+        # recent last: it is handed out first and the oldest ones expire.
+        self.idle = deque()
+        # Connections open, idle or in use
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def getconn(self, connect):
+        while True:
+            connection = self._checkout()
+            if connection is None:
+                return self._connect(connect)
+            if self.check is None or self.check(connection):
+                return connection
+            self.discard(connection)
+
+    def putconn(self, connection):
+        if self.reset is not None and not self.reset(connection):
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Database.Error:
+            pass
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.timeout
+        expired = []
+        try:
+            with self.condition:
+                while True:
+                    now = time.monotonic()
+                    while self.idle and now - self.idle[0][1] > self.max_idle:
+                        expired.append(self.idle.popleft()[0])
+                    if self.idle:
+                        return self.idle.pop()[0]
+                    if self.size - len(expired) < self.max_size:
+                        # Reserve the slot of a new connection
+                        self.size += 1
+                        return None
+                    if not self.condition.wait(deadline - now):
+                        raise PoolTimeout(
+                            f"No database connection available in {self.timeout}s "
+                            f"(pool of {self.max_size})."
+                        )
+        finally:
+            for connection in expired:
+                self.discard(connection)
+
+    def _connect(self, connect):
+        try:
+            return connect()
+        except BaseException:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
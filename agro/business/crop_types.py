@@ -0,0 +1,110 @@
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from agro.cache import aget_data_version, bump_data_version, get_data_version
+from agro.models import CropType
+
+CROP_TYPES_VERSION_KEY = "agro:crop-types-version"
+
+# The crop types loaded by this process, replaced as a whole
+_crop_types = None
+
+
+class CropTypes:
+    def __init__(self, version, names, updated_at):
+        self.version = version
+        # Crop type names by id
+        self.names = names
+        self.updated_at = updated_at
+        self.checked_at = time.monotonic()
+
+    def __contains__(self, crop_type_id):
+        return crop_type_id in self.names
+
+    def get(self, crop_type_id):
+        name = self.names.get(crop_type_id)
+        if name is None:
+            return None
+        crop_type = CropType(id=crop_type_id, name=name)
+        crop_type._state.adding = False
+        crop_type._state.db = DEFAULT_DB_ALIAS
+        return crop_type
+
+    def get_data(self, crop_type_ids):
+        return [
+            {"id": crop_type_id, "name": self.names[crop_type_id]}
+            for crop_type_id in sorted(crop_type_ids or [])
+            if crop_type_id in self.names
+        ]
+
+
+def get_crop_types(refresh=False):
+    global _crop_types
+    crop_types = _crop_types
+    if _is_fresh(crop_types, refresh):
+        return crop_types
+    version = get_data_version(CROP_TYPES_VERSION_KEY)
+    if crop_types is None or crop_types.version != version:
+        # The version is read before the rows: a write committed meanwhile
+        # bumps it again, so older rows are never kept under a newer version.
+        crop_types = _crop_types = _build(version, list(_get_rows()))
+    crop_types.checked_at = time.monotonic()
+    return crop_types
+
+
+async def aget_crop_types(refresh=False):
+    global _crop_types
+    crop_types = _crop_types
+    if _is_fresh(crop_types, refresh):
+        return crop_types
+    version = await aget_data_version(CROP_TYPES_VERSION_KEY)
+    if crop_types is None or crop_types.version != version:
+        crop_types = _crop_types = _build(version, [row async for row in _get_rows()])
+    crop_types.checked_at = time.monotonic()
+    return crop_types
+
+
+def get_crop_types_with(crop_type_ids):
+    # An id created by another worker is only rejected once the version
+    # confirms that this process has every crop type.
+    crop_types = get_crop_types()
+    if not crop_types.names.keys() >= set(crop_type_ids):
+        crop_types = get_crop_types(refresh=True)
+    return crop_types
+
+
+def forget_crop_types():
+    global _crop_types
+    _crop_types = None
+
+
+def bump_crop_types_version():
+    bump_data_version(CROP_TYPES_VERSION_KEY)
+
+
+def _is_fresh(crop_types, refresh):
+    # Writes of other workers are seen once the version is checked again,
+    # at most CROP_TYPES_TIMEOUT seconds later.
+    return (
+        crop_types is not None
+        and not refresh
+        and time.monotonic() - crop_types.checked_at < settings.CROP_TYPES_TIMEOUT
+    )
+
+
+def _get_rows():
+    # Loaded from the primary: a lagging replica would keep the old rows
+    # under the new version until the next write.
+    return CropType.objects.using(DEFAULT_DB_ALIAS).values_list(
+        "id", "name", "updated_at"
+    )
+
+
+def _build(version, rows):
+    return CropTypes(
+        version,
+        {crop_type_id: name for crop_type_id, name, _ in rows},
+        max((updated_at for _, _, updated_at in rows), default=None),
+    )
@@ -0,0 +1,149 @@
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Exists, OuterRef, Subquery
+from django.utils import timezone
+
+from agro.aggregates import JSONArrayAgg
+from agro.business.dashboard import record_crops
+from agro.models import Crop, Farm
+from agro.transactions import bump_data_version_on_commit
+
+CROP_COLUMNS = ("id", "farm", "crop_type", "created_at", "updated_at")
+
+
+def annotate_crop_types(farms, crops=None):
+    # Correlated to the outer farm, so the database only collects the crop
+    # types of the farms actually fetched. Only the ids: the names come from
+    # the crop type registry, without a join.
+    if crops is None:
+        crops = Crop.objects.all()
+    crop_type_ids = (
+        crops.filter(farm=OuterRef("pk"))
+        .order_by()
+        .values("farm")
+        .annotate(items=JSONArrayAgg("crop_type_id"))
+        .values("items")
+    )
+    return farms.annotate(crop_type_ids=Subquery(crop_type_ids))
+
+
+def get_farms_with_crops(crops=None):
+    if crops is None:
+        crops = Crop.objects.all()
+    # Only the crops of the filter, like the export of the same filter
+    farm_crops = crops.filter(farm=OuterRef("pk"))
+    if crops.query.has_filters():
+        # A filtered crop list is selective, so its own indexes drive the query
+        farms = Farm.objects.filter(pk__in=crops.values("farm_id"))
+    else:
+        farms = Farm.objects.filter(Exists(crops.filter(farm=OuterRef("pk"))))
+    return annotate_crop_types(
+        farms.select_related("farmer").annotate(
+            crop_id=Subquery(farm_crops.order_by("-updated_at").values("id")[:1])
+        ),
+        crops,
+    ).order_by("-updated_at")
+
+
+def get_crop_types_data(farm, crop_types):
+    return crop_types.get_data(farm.crop_type_ids)
+
+
+def add_crop_types(farm, crop_type_ids):
+    with transaction.atomic():
+        existing = _lock_crop_types(farm)
+        added = [
+            crop_type_id
+            for crop_type_id in dict.fromkeys(crop_type_ids)
+            if crop_type_id not in existing
+        ]
+        return _change_crop_types(farm, added=added)
+
+
+def remove_crop_types(farm, crop_type_ids):
+    with transaction.atomic():
+        existing = _lock_crop_types(farm)
+        removed = [
+            crop_type_id
+            for crop_type_id in dict.fromkeys(crop_type_ids)
+            if crop_type_id in existing
+        ]
+        _change_crop_types(farm, removed=removed)
+    return removed
+
+
+def set_crop_types(farm, crop_type_ids):
+    crop_type_ids = dict.fromkeys(crop_type_ids)
+    with transaction.atomic():
+        existing = _lock_crop_types(farm)
+        added = [
+            crop_type_id
+            for crop_type_id in crop_type_ids
+            if crop_type_id not in existing
+        ]
+        removed = sorted(existing.difference(crop_type_ids))
+        return _change_crop_types(farm, added=added, removed=removed), removed
+
+
+def _lock_crop_types(farm):
+    # Serializes concurrent changes to the crops of the same farm, so the set
+    # read here stays current until the transaction ends.
+    list(Farm.objects.select_for_update().filter(pk=farm.pk).values_list("pk"))
+    return set(Crop.objects.filter(farm=farm).values_list("crop_type_id", flat=True))
+
+
+def _change_crop_types(farm, added=(), removed=()):
+    # One statement each way, without the per-row signals: both return the
+    # crop types they actually changed, so a concurrent POST or DELETE on
+    # /crops/, which does not lock the farm, is not counted twice.
+    removed = _delete_crops(farm, removed) if removed else []
+    added = _insert_crops(farm, added) if added else []
+    if added or removed:
+        record_crops(added=added, removed=removed)
+        bump_data_version_on_commit()
+    return added
+
+
+def _get_crops_table(database, *names):
+    quote = database.ops.quote_name
+    columns = [quote(Crop._meta.get_field(name).column) for name in names]
+    return quote(Crop._meta.db_table), columns
+
+
+def _delete_crops(farm, crop_type_ids):
+    database = connections[DEFAULT_DB_ALIAS]
+    table, (farm_column, crop_type_column) = _get_crops_table(
+        database, "farm", "crop_type"
+    )
+    farm_id = Crop._meta.get_field("farm").get_db_prep_value(farm.pk, database)
+    placeholders = ", ".join(["%s"] * len(crop_type_ids))
+    with database.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {farm_column} = %s "
+            f"AND {crop_type_column} IN ({placeholders}) "
+            f"RETURNING {crop_type_column}",
+            [farm_id, *crop_type_ids],
+        )
+        return [crop_type_id for crop_type_id, in cursor.fetchall()]
+
+
+def _insert_crops(farm, crop_type_ids):
+    database = connections[DEFAULT_DB_ALIAS]
+    table, columns = _get_crops_table(database, *CROP_COLUMNS)
+    fields = [Crop._meta.get_field(name) for name in CROP_COLUMNS]
+    now = timezone.now()
+    params = [
+        field.get_db_prep_value(value, database)
+        for crop_type_id in crop_type_ids
+        for field, value in zip(fields, (uuid.uuid4(), farm.pk, crop_type_id, now, now))
+    ]
+    row = f"({', '.join(['%s'] * len(columns))})"
+    with database.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES {', '.join([row] * len(crop_type_ids))} "
+            f"ON CONFLICT DO NOTHING RETURNING {columns[2]}",
+            params,
+        )
+        return [crop_type_id for crop_type_id, in cursor.fetchall()]
@@ -1,29 +1,90 @@
-from django.db.models import Count, Sum
+from collections import Counter, defaultdict
+from decimal import Decimal
 
-from agro.models import Crop, Farm
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Case, Count, F, Sum, Value, When
 
+from agro.business.crop_types import aget_crop_types, get_crop_types
+from agro.cache import aget_data_version, get_cache, get_data_version
+from agro.models import Crop, DashboardSummary, Farm
 
+AREA_FIELDS = (
+    "total_area_hectares",
+    "arable_area_hectares",
+    "vegetation_area_hectares",
+)
+
+
+# The crop type names are cached with the totals, under the data version, so
+# their version is checked right away instead of after CROP_TYPES_TIMEOUT.
 def get_dashboard_data():
-    farm_count = Farm.objects.count()
-    total_area = Farm.objects.aggregate(total=Sum("total_area_hectares"))["total"] or 0
-    count_per_state = (
-        Farm.objects.values("state").annotate(total=Count("state")).order_by("state")
-    )
-    count_per_crop = (
-        Crop.objects.values("crop_type__name")
-        .annotate(total=Count("farm", distinct=True))
-        .order_by("crop_type__name")
-    )
-    count_per_crop = [
-        {"crop_type_name": item["crop_type__name"], "total": item["total"]}
-        for item in count_per_crop
+    return _summarize(list(_get_summary()), get_crop_types(refresh=True))
+
+
+async def aget_dashboard_data():
+    return _summarize(
+        [row async for row in _get_summary()], await aget_crop_types(refresh=True)
+    )
+
+
+def get_cached_dashboard_data(version=None):
+    cache = get_cache()
+    key = f"agro:dashboard:{version or get_data_version()}"
+    dashboard_data = cache.get(key)
+    if dashboard_data is None:
+        dashboard_data = get_dashboard_data()
+        cache.set(key, dashboard_data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return dashboard_data
+
+
+async def aget_cached_dashboard_data(version=None):
+    cache = get_cache()
+    key = f"agro:dashboard:{version or await aget_data_version()}"
+    dashboard_data = await cache.aget(key)
+    if dashboard_data is None:
+        dashboard_data = await aget_dashboard_data()
+        await cache.aset(key, dashboard_data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return dashboard_data
+
+
+def calculate_dashboard_data():
+    totals = _aggregate_farms(Farm.objects.all())
+    count_per_state = [
+        {"state": item["state"], "total": item["farm_count"]}
+        for item in _aggregate_farms_by_state()
     ]
-    total_arable = (
-        Farm.objects.aggregate(total=Sum("arable_area_hectares"))["total"] or 0
+    crop_types = get_crop_types(refresh=True)
+    count_per_crop = sorted(
+        (
+            {
+                "crop_type_name": crop_types.names[item["crop_type"]],
+                "total": item["total"],
+            }
+            for item in Crop.objects.values("crop_type")
+            .annotate(total=Count("farm", distinct=True))
+            .order_by()
+        ),
+        key=lambda item: item["crop_type_name"],
     )
-    total_vegetation = (
-        Farm.objects.aggregate(total=Sum("vegetation_area_hectares"))["total"] or 0
+    return _build_dashboard_data(
+        farm_count=totals["farm_count"],
+        total_area=totals["total_area_hectares"] or 0,
+        total_arable=totals["arable_area_hectares"] or 0,
+        total_vegetation=totals["vegetation_area_hectares"] or 0,
+        count_per_state=count_per_state,
+        count_per_crop=count_per_crop,
     )
+
+
+def _build_dashboard_data(
+    farm_count,
+    total_area,
+    total_arable,
+    total_vegetation,
+    count_per_state,
+    count_per_crop,
+):
     dashboard_data = {
         "farm_count": farm_count,
         "total_area_hectares": total_area,
@@ -35,3 +96,178 @@ def get_dashboard_data():
         "count_by_state": count_per_state,
     }
     return dashboard_data
+
+
+def _get_summary():
+    # Read from the primary: the payload is cached under the data version, and
+    # a lagging replica would keep the old totals under the new version.
+    return DashboardSummary.objects.using(DEFAULT_DB_ALIAS).filter(farm_count__gt=0)
+
+
+def _summarize(summary, crop_types):
+    totals = None
+    count_per_state = []
+    count_per_crop = []
+    for row in summary:
+        if row.dimension == DashboardSummary.TOTAL:
+            totals = row
+        elif row.dimension == DashboardSummary.STATE:
+            count_per_state.append({"state": row.key, "total": row.farm_count})
+        elif row.crop_type_id in crop_types:
+            count_per_crop.append(
+                {
+                    "crop_type_name": crop_types.names[row.crop_type_id],
+                    "total": row.farm_count,
+                }
+            )
+    count_per_state.sort(key=lambda item: item["state"])
+    count_per_crop.sort(key=lambda item: item["crop_type_name"])
+    return _build_dashboard_data(
+        farm_count=totals.farm_count if totals else 0,
+        total_area=totals.total_area_hectares if totals else 0,
+        total_arable=totals.arable_area_hectares if totals else 0,
+        total_vegetation=totals.vegetation_area_hectares if totals else 0,
+        count_per_state=count_per_state,
+        count_per_crop=count_per_crop,
+    )
+
+
+def _aggregate_farms(queryset):
+    return queryset.aggregate(
+        farm_count=Count("id"), **{field: Sum(field) for field in AREA_FIELDS}
+    )
+
+
+def _aggregate_farms_by_state():
+    return (
+        Farm.objects.values("state")
+        .annotate(
+            farm_count=Count("id"), **{field: Sum(field) for field in AREA_FIELDS}
+        )
+        .order_by("state")
+    )
+
+
+def rebuild_dashboard_summary():
+    totals = _aggregate_farms(Farm.objects.all())
+    rows = [
+        DashboardSummary(
+            dimension=DashboardSummary.TOTAL,
+            key="",
+            farm_count=totals["farm_count"],
+            **{field: totals[field] or 0 for field in AREA_FIELDS},
+        )
+    ]
+    rows.extend(
+        DashboardSummary(
+            dimension=DashboardSummary.STATE,
+            key=item["state"],
+            farm_count=item["farm_count"],
+            **{field: item[field] for field in AREA_FIELDS},
+        )
+        for item in _aggregate_farms_by_state()
+    )
+    rows.extend(
+        DashboardSummary(
+            dimension=DashboardSummary.CROP_TYPE,
+            key=str(item["crop_type"]),
+            crop_type_id=item["crop_type"],
+            farm_count=item["farm_count"],
+        )
+        for item in Crop.objects.values("crop_type")
+        .annotate(farm_count=Count("farm", distinct=True))
+        .order_by("crop_type")
+    )
+    with transaction.atomic():
+        DashboardSummary.objects.all().delete()
+        DashboardSummary.objects.bulk_create(rows)
+    return rows
+
+
+def record_farms(added=(), removed=()):
+    deltas = defaultdict(lambda: [0, Decimal(0), Decimal(0), Decimal(0)])
+    for farms, sign in ((added, 1), (removed, -1)):
+        for farm in farms:
+            state, *areas = _get_farm_values(farm)
+            for key in ((DashboardSummary.TOTAL, ""), (DashboardSummary.STATE, state)):
+                delta = deltas[key]
+                delta[0] += sign
+                for index, area in enumerate(areas, start=1):
+                    delta[index] += sign * Decimal(area)
+    for (dimension, key), delta in deltas.items():
+        _update_summary(dimension, key, *delta)
+
+
+def record_crops(added=(), removed=()):
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Every crop type in a single UPDATE; the rows it did not find go through
+    # _update_summary, which creates them.
+    summaries = DashboardSummary.objects.filter(
+        dimension=DashboardSummary.CROP_TYPE, key__in=[str(key) for key in deltas]
+    )
+    updated = summaries.update(
+        farm_count=F("farm_count")
+        + Case(
+            *(When(key=str(key), then=Value(delta)) for key, delta in deltas.items()),
+            default=Value(0),
+        )
+    )
+    if updated == len(deltas):
+        return
+    found = set(summaries.values_list("key", flat=True))
+    for crop_type_id, farm_count in deltas.items():
+        if str(crop_type_id) in found:
+            continue
+        _update_summary(
+            DashboardSummary.CROP_TYPE,
+            str(crop_type_id),
+            farm_count,
+            crop_type_id=crop_type_id,
+        )
+
+
+def _get_farm_values(farm):
+    if isinstance(farm, dict):
+        return tuple(farm[field] for field in ("state",) + AREA_FIELDS)
+    return tuple(getattr(farm, field) for field in ("state",) + AREA_FIELDS)
+
+
+def _update_summary(
+    dimension,
+    key,
+    farm_count,
+    total_area=0,
+    arable_area=0,
+    vegetation_area=0,
+    crop_type_id=None,
+):
+    if not any((farm_count, total_area, arable_area, vegetation_area)):
+        return
+    summary = DashboardSummary.objects.filter(dimension=dimension, key=key)
+    changes = {
+        "farm_count": F("farm_count") + farm_count,
+        "total_area_hectares": F("total_area_hectares") + total_area,
+        "arable_area_hectares": F("arable_area_hectares") + arable_area,
+        "vegetation_area_hectares": F("vegetation_area_hectares") + vegetation_area,
+    }
+    # A missing row can only be started by an insert; removals against a
+    # missing row (e.g. a crop type deleted in the same cascade) are ignored.
+    if summary.update(**changes) or farm_count <= 0:
+        return
+    try:
+        with transaction.atomic():
+            DashboardSummary.objects.create(
+                dimension=dimension,
+                key=key,
+                crop_type_id=crop_type_id,
+                farm_count=farm_count,
+                total_area_hectares=total_area,
+                arable_area_hectares=arable_area,
+                vegetation_area_hectares=vegetation_area,
+            )
+    except IntegrityError:
+        summary.update(**changes)
@@ -0,0 +1,108 @@
+CPF_LENGTH = 11
+CNPJ_LENGTH = 14
+CPF_WEIGHTS = (tuple(range(10, 1, -1)), tuple(range(11, 1, -1)))
+CNPJ_WEIGHTS = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+ASCII_DIGITS = frozenset("0123456789")
+ASCII_NON_DIGITS = str.maketrans(
+    "", "", "".join(chr(code) for code in range(128) if chr(code) not in ASCII_DIGITS)
+)
+# Below this size the numpy setup costs more than it saves
+VECTORIZE_THRESHOLD = 256
+
+
+def only_digits(value):
+    if value.isascii():
+        return value.translate(ASCII_NON_DIGITS)
+    return "".join(filter(str.isdigit, value))
+
+
+def clean_cpf_cnpj(value):
+    if not value:
+        return None
+    cpf_cnpj = only_digits(value)
+    return cpf_cnpj if _validate_digits(cpf_cnpj) else None
+
+
+def validate_cpf_cnpj_batch(values):
+    values = list(values)
+    if len(values) < VECTORIZE_THRESHOLD:
+        return [clean_cpf_cnpj(value) is not None for value in values]
+    results = [False] * len(values)
+    groups = {CPF_LENGTH: ([], []), CNPJ_LENGTH: ([], [])}
+    for index, value in enumerate(values):
+        if not value:
+            continue
+        cpf_cnpj = only_digits(value)
+        if len(cpf_cnpj) in groups and ASCII_DIGITS.issuperset(cpf_cnpj):
+            indexes, documents = groups[len(cpf_cnpj)]
+            indexes.append(index)
+            documents.append(cpf_cnpj)
+        else:
+            results[index] = _validate_digits(cpf_cnpj)
+    for length, (indexes, documents) in groups.items():
+        if documents:
+            for index, valid in zip(indexes, _validate_vectorized(documents, length)):
+                results[index] = valid
+    return results
+
+
+def calculate_cpf_check_digit(numbers, weights):
+    remainder = sum(number * weight for number, weight in zip(numbers, weights))
+    remainder = remainder * 10 % 11
+    return 0 if remainder == 10 else remainder
+
+
+def calculate_cnpj_check_digit(numbers, weights):
+    remainder = sum(number * weight for number, weight in zip(numbers, weights)) % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def _validate_digits(cpf_cnpj):
+    # Mirrors validate_docbr: the check digits are compared as characters
+    if len(cpf_cnpj) == CPF_LENGTH:
+        calculate, weights = calculate_cpf_check_digit, CPF_WEIGHTS
+    elif len(cpf_cnpj) == CNPJ_LENGTH:
+        calculate, weights = calculate_cnpj_check_digit, CNPJ_WEIGHTS
+    else:
+        return False
+    if len(set(cpf_cnpj)) == 1:
+        return False
+    try:
+        numbers = [int(digit) for digit in cpf_cnpj]
+    except ValueError:
+        return False
+    first_digit = calculate(numbers, weights[0])
+    if str(first_digit) != cpf_cnpj[-2]:
+        return False
+    return str(calculate(numbers, weights[1])) == cpf_cnpj[-1]
+
+
+def _validate_vectorized(documents, length):
+    import numpy as np
+
+    digits = np.frombuffer("".join(documents).encode("ascii"), dtype=np.uint8)
+    digits = digits.reshape(len(documents), length).astype(np.int64) - ord("0")
+    if length == CPF_LENGTH:
+        weights = CPF_WEIGHTS
+    else:
+        weights = CNPJ_WEIGHTS
+    check_digits = []
+    for position_weights in weights:
+        size = len(position_weights)
+        remainder = digits[:, :size] @ np.array(position_weights)
+        if length == CPF_LENGTH:
+            remainder = remainder * 10 % 11
+            check_digits.append(np.where(remainder == 10, 0, remainder))
+        else:
+            remainder = remainder % 11
+            check_digits.append(np.where(remainder < 2, 0, 11 - remainder))
+    repeated = (digits == digits[:, :1]).all(axis=1)
+    valid = (
+        ~repeated
+        & (check_digits[0] == digits[:, -2])
+        & (check_digits[1] == digits[:, -1])
+    )
+    return valid.tolist()
@@ -0,0 +1,70 @@
+import csv
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _format_datetime(value):
+    # Both formats write it like the API: full precision, "Z" for UTC
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class _ExportEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime):
+            return _format_datetime(o)
+        return super().default(o)
+
+
+def _format_csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return _format_datetime(value)
+    return value
+
+
+def iter_csv(rows, fields, chunk_size):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    lines = []
+    for row in rows:
+        lines.append(
+            writer.writerow([_format_csv_value(row[field]) for field in fields])
+        )
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def iter_ndjson(rows, fields, chunk_size):
+    encoder = _ExportEncoder(ensure_ascii=False, separators=(",", ":"))
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode({field: row[field] for field in fields}) + "\n")
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+EXPORT_WRITERS = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+}
@@ -0,0 +1,315 @@
+import csv
+import io
+import json
+import uuid
+from abc import ABC, abstractmethod
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from agro.business.dashboard import AREA_FIELDS, record_crops, record_farms
+from agro.business.documents import clean_cpf_cnpj, only_digits
+from agro.business.validators import validate_total_area
+from agro.constants import STATE_CHOICES
+from agro.models import Crop, CropType, Farm, Farmer
+from agro.transactions import bump_data_version_on_commit
+
+STATES = dict(STATE_CHOICES)
+
+
+class RowError(Exception):
+    pass
+
+
+def read_rows(file, file_format):
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line
+
+
+def _get_text(row, field, required=True):
+    value = row.get(field)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f"{field}: This field is required.")
+    return value
+
+
+def _get_uuid(row, field, required=True):
+    value = _get_text(row, field, required)
+    if not value:
+        return None
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise RowError(f"{field}: Must be a valid UUID.")
+
+
+def _get_area(row, field):
+    try:
+        return Decimal(_get_text(row, field)).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise RowError(f"{field}: A valid number is required.")
+
+
+def _get_existing_ids(model, rows):
+    return set(
+        model.objects.filter(id__in=[row["id"] for row in rows]).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def copy_rows(model, columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in (row[column] for column in columns)
+            ]
+        )
+    buffer.seek(0)
+    quoted_columns = ", ".join(
+        connection.ops.quote_name(model._meta.get_field(column).column)
+        for column in columns
+    )
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({quoted_columns}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+
+
+class Loader(ABC):
+    model = None
+    columns = ()
+
+    def __init__(self, run_id, use_copy=None):
+        if use_copy is None:
+            use_copy = connection.vendor == "postgresql"
+        self.use_copy = use_copy
+        # Ids derived from the run and the line: a row loaded again by a
+        # resumed run gets the id it already has, another run gets new ones.
+        self.namespace = run_id
+
+    @abstractmethod
+    def clean(self, row):
+        pass
+
+    def resolve(self, rows):
+        return rows, {}
+
+    def after_insert(self, rows):
+        pass
+
+    def load(self, rows, lines):
+        now = timezone.now()
+        for row, line in zip(rows, lines):
+            row.setdefault("id", uuid.uuid5(self.namespace, str(line)))
+            row["created_at"] = row["updated_at"] = now
+        with transaction.atomic():
+            accepted, rejected = self.resolve(rows)
+            if accepted:
+                if self.use_copy:
+                    copy_rows(self.model, self.columns, accepted)
+                else:
+                    self.model.objects.bulk_create(
+                        [self.model(**row) for row in accepted]
+                    )
+                self.after_insert(accepted)
+                bump_data_version_on_commit()
+        return len(accepted), rejected
+
+
+class FarmerLoader(Loader):
+    model = Farmer
+    columns = ("id", "cpf_cnpj", "name", "created_at", "updated_at")
+
+    def clean(self, row):
+        cpf_cnpj = clean_cpf_cnpj(_get_text(row, "cpf_cnpj"))
+        if cpf_cnpj is None:
+            raise RowError("cpf_cnpj: Enter a valid CPF or CNPJ.")
+        cleaned = {
+            "cpf_cnpj": cpf_cnpj,
+            "name": _get_text(row, "name"),
+        }
+        farmer_id = _get_uuid(row, "id", required=False)
+        if farmer_id:
+            cleaned["id"] = farmer_id
+        return cleaned
+
+    def resolve(self, rows):
+        existing = set(
+            Farmer.objects.filter(
+                cpf_cnpj__in=[row["cpf_cnpj"] for row in rows]
+            ).values_list("cpf_cnpj", flat=True)
+        )
+        existing_ids = _get_existing_ids(Farmer, rows)
+        accepted, rejected = [], {}
+        for position, row in enumerate(rows):
+            if row["id"] in existing_ids:
+                rejected[position] = "id: A farmer with this id already exists."
+                continue
+            if row["cpf_cnpj"] in existing:
+                rejected[position] = (
+                    "cpf_cnpj: A farmer with this CPF or CNPJ already exists."
+                )
+                continue
+            existing.add(row["cpf_cnpj"])
+            existing_ids.add(row["id"])
+            accepted.append(row)
+        return accepted, rejected
+
+
+class FarmLoader(Loader):
+    model = Farm
+    columns = (
+        "id",
+        "farmer_id",
+        "name",
+        "city",
+        "state",
+        "total_area_hectares",
+        "arable_area_hectares",
+        "vegetation_area_hectares",
+        "created_at",
+        "updated_at",
+    )
+
+    def clean(self, row):
+        cleaned = {field: _get_area(row, field) for field in AREA_FIELDS}
+        if cleaned["total_area_hectares"] <= 0:
+            raise RowError(
+                "total_area_hectares: The total area cannot be negative or zero."
+            )
+        if cleaned["arable_area_hectares"] < 0:
+            raise RowError("arable_area_hectares: The arable area cannot be negative.")
+        if cleaned["vegetation_area_hectares"] < 0:
+            raise RowError(
+                "vegetation_area_hectares: The vegetation area cannot be negative."
+            )
+        if not validate_total_area(cleaned):
+            raise RowError(
+                "The sum of the arable area and vegetation cannot exceed the total area of the farm."
+            )
+        state = _get_text(row, "state").upper()
+        if state not in STATES:
+            raise RowError(
+                "state: Invalid value for the state. Please set a valid state, e.g.: SP"
+            )
+        cleaned.update(
+            state=state, name=_get_text(row, "name"), city=_get_text(row, "city")
+        )
+        farm_id = _get_uuid(row, "id", required=False)
+        if farm_id:
+            cleaned["id"] = farm_id
+        farmer_id = _get_uuid(row, "farmer_id", required=False)
+        if farmer_id:
+            cleaned["farmer_id"] = farmer_id
+        else:
+            farmer_cpf_cnpj = _get_text(row, "farmer_cpf_cnpj")
+            cleaned["farmer_cpf_cnpj"] = only_digits(farmer_cpf_cnpj)
+        return cleaned
+
+    def resolve(self, rows):
+        farmer_ids = {
+            cpf_cnpj: farmer_id
+            for farmer_id, cpf_cnpj in Farmer.objects.filter(
+                cpf_cnpj__in=[
+                    row["farmer_cpf_cnpj"] for row in rows if "farmer_cpf_cnpj" in row
+                ]
+            ).values_list("id", "cpf_cnpj")
+        }
+        farmer_ids.update(
+            (farmer_id, farmer_id)
+            for farmer_id in Farmer.objects.filter(
+                id__in=[row["farmer_id"] for row in rows if "farmer_id" in row]
+            ).values_list("id", flat=True)
+        )
+        existing = _get_existing_ids(Farm, rows)
+        accepted, rejected = [], {}
+        for position, row in enumerate(rows):
+            farmer_id = farmer_ids.get(
+                row.pop("farmer_cpf_cnpj", None) or row.get("farmer_id")
+            )
+            if farmer_id is None:
+                rejected[position] = "farmer: Farmer not found."
+            elif row["id"] in existing:
+                rejected[position] = "id: A farm with this id already exists."
+            else:
+                existing.add(row["id"])
+                row["farmer_id"] = farmer_id
+                accepted.append(row)
+        return accepted, rejected
+
+    def after_insert(self, rows):
+        record_farms(added=rows)
+
+
+class CropLoader(Loader):
+    model = Crop
+    columns = ("id", "farm_id", "crop_type_id", "created_at", "updated_at")
+
+    def __init__(self, run_id, use_copy=None):
+        super().__init__(run_id, use_copy)
+        self.crop_types = {}
+        for crop_type_id, name in CropType.objects.values_list("id", "name"):
+            self.crop_types[str(crop_type_id)] = crop_type_id
+            self.crop_types[name.casefold()] = crop_type_id
+
+    def clean(self, row):
+        crop_type = _get_text(row, "crop_type_id", required=False) or _get_text(
+            row, "crop_type_name"
+        )
+        crop_type_id = self.crop_types.get(crop_type.casefold())
+        if crop_type_id is None:
+            raise RowError("crop_type: Crop type not found.")
+        return {"farm_id": _get_uuid(row, "farm_id"), "crop_type_id": crop_type_id}
+
+    def resolve(self, rows):
+        farm_ids = {row["farm_id"] for row in rows}
+        existing_farms = set(
+            Farm.objects.filter(id__in=farm_ids).values_list("id", flat=True)
+        )
+        existing = set(
+            Crop.objects.filter(farm_id__in=existing_farms).values_list(
+                "farm_id", "crop_type_id"
+            )
+        )
+        existing_ids = _get_existing_ids(Crop, rows)
+        accepted, rejected = [], {}
+        for position, row in enumerate(rows):
+            key = (row["farm_id"], row["crop_type_id"])
+            if row["farm_id"] not in existing_farms:
+                rejected[position] = "farm_id: Farm not found."
+            elif row["id"] in existing_ids:
+                rejected[position] = "id: A crop with this id already exists."
+            elif key in existing:
+                rejected[position] = (
+                    "A crop with this farm and type of crop already exists."
+                )
+            else:
+                existing.add(key)
+                existing_ids.add(row["id"])
+                accepted.append(row)
+        return accepted, rejected
+
+    def after_insert(self, rows):
+        record_crops(added=[row["crop_type_id"] for row in rows])
+
+
+LOADERS = {
+    "farmers": FarmerLoader,
+    "farms": FarmLoader,
+    "crops": CropLoader,
+}
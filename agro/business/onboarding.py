@@ -0,0 +1,73 @@
+from django.db import IntegrityError, transaction
+
+from agro.business.dashboard import AREA_FIELDS, record_crops, record_farms
+from agro.models import Crop, Farm, Farmer
+from agro.transactions import bump_data_version_on_commit
+
+FARM_FIELDS = ("name", "city", "state") + AREA_FIELDS
+DUPLICATED_CPF_CNPJ_MESSAGE = "A farmer with the CPF or CNPJ {cpf_cnpj} already exists."
+
+
+def onboard_farmers(farmers_data):
+    errors = {}
+    _check_cpf_cnpjs(farmers_data, errors)
+    while True:
+        farmers, farms, crops = _build_rows(farmers_data, errors)
+        try:
+            with transaction.atomic():
+                Farmer.objects.bulk_create(farmers)
+                Farm.objects.bulk_create(farms)
+                Crop.objects.bulk_create(crops)
+                record_farms(added=farms)
+                record_crops(added=[crop.crop_type_id for crop in crops])
+                bump_data_version_on_commit()
+        except IntegrityError:
+            # A concurrent request created a farmer with one of the documents
+            # after they were checked: they are checked again, and the rest
+            # of the batch is retried.
+            if not _check_cpf_cnpjs(farmers_data, errors):
+                raise
+            continue
+        created = {"farmers": len(farmers), "farms": len(farms), "crops": len(crops)}
+        return created, errors
+
+
+def _check_cpf_cnpjs(farmers_data, errors):
+    pending = [
+        (position, farmer_data["cpf_cnpj"])
+        for position, farmer_data in enumerate(farmers_data)
+        if position not in errors
+    ]
+    existing = set(
+        Farmer.objects.filter(
+            cpf_cnpj__in=[cpf_cnpj for _, cpf_cnpj in pending]
+        ).values_list("cpf_cnpj", flat=True)
+    )
+    found = 0
+    for position, cpf_cnpj in pending:
+        if cpf_cnpj in existing:
+            message = DUPLICATED_CPF_CNPJ_MESSAGE.format(cpf_cnpj=cpf_cnpj)
+            errors[position] = {"cpf_cnpj": [message]}
+            found += 1
+        # Repeated within the batch, only the first one is created
+        existing.add(cpf_cnpj)
+    return found
+
+
+def _build_rows(farmers_data, errors):
+    farmers, farms, crops = [], [], []
+    for position, farmer_data in enumerate(farmers_data):
+        if position in errors:
+            continue
+        farmer = Farmer(cpf_cnpj=farmer_data["cpf_cnpj"], name=farmer_data["name"])
+        farmers.append(farmer)
+        for farm_data in farmer_data.get("farms", []):
+            farm = Farm(
+                farmer=farmer, **{field: farm_data[field] for field in FARM_FIELDS}
+            )
+            farms.append(farm)
+            crops.extend(
+                Crop(farm=farm, crop_type_id=crop_type_id)
+                for crop_type_id in farm_data.get("crop_type_ids", [])
+            )
+    return farmers, farms, crops
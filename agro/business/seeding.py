@@ -0,0 +1,346 @@
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.utils import timezone
+
+from agro.business.dashboard import rebuild_dashboard_summary
+from agro.business.documents import (
+    CNPJ_WEIGHTS,
+    CPF_WEIGHTS,
+    calculate_cnpj_check_digit,
+    calculate_cpf_check_digit,
+)
+from agro.business.importer import copy_rows
+from agro.cache import bump_data_version
+from agro.constants import STATE_CHOICES
+from agro.models import Counter, Crop, CropType, Farm, Farmer
+
+# The next farmer number to hand out, kept across runs
+NEXT_NUMBER_KEY = "agro:seed-next-number"
+CROP_TYPE_NAMES = ("Soja", "Milho", "Algodão", "Café", "Cana de Açúcar", "Trigo")
+FIRST_NAMES = (
+    "Ana",
+    "Antônio",
+    "Carlos",
+    "Fernanda",
+    "Francisco",
+    "João",
+    "José",
+    "Juliana",
+    "Lucas",
+    "Luiz",
+    "Márcia",
+    "Maria",
+    "Patrícia",
+    "Paulo",
+    "Pedro",
+    "Rafael",
+)
+LAST_NAMES = (
+    "Almeida",
+    "Alves",
+    "Barbosa",
+    "Carvalho",
+    "Costa",
+    "Ferreira",
+    "Gomes",
+    "Lima",
+    "Oliveira",
+    "Pereira",
+    "Ribeiro",
+    "Rodrigues",
+    "Santos",
+    "Silva",
+    "Souza",
+    "Vieira",
+)
+FARM_NAMES = (
+    "Água Limpa",
+    "Bela Vista",
+    "Boa Esperança",
+    "Boa Vista",
+    "Primavera",
+    "Santa Maria",
+    "Santo Antônio",
+    "São José",
+    "Três Irmãos",
+    "Vale Verde",
+)
+CAPITALS = {
+    "AC": "Rio Branco",
+    "AL": "Maceió",
+    "AP": "Macapá",
+    "AM": "Manaus",
+    "BA": "Salvador",
+    "CE": "Fortaleza",
+    "DF": "Brasília",
+    "ES": "Vitória",
+    "GO": "Goiânia",
+    "MA": "São Luís",
+    "MT": "Cuiabá",
+    "MS": "Campo Grande",
+    "MG": "Belo Horizonte",
+    "PA": "Belém",
+    "PB": "João Pessoa",
+    "PR": "Curitiba",
+    "PE": "Recife",
+    "PI": "Teresina",
+    "RJ": "Rio de Janeiro",
+    "RN": "Natal",
+    "RS": "Porto Alegre",
+    "RO": "Porto Velho",
+    "RR": "Boa Vista",
+    "SC": "Florianópolis",
+    "SP": "São Paulo",
+    "SE": "Aracaju",
+    "TO": "Palmas",
+}
+STATES = [state for state, _ in STATE_CHOICES]
+# Share of farmers that are companies, with a CNPJ
+CNPJ_SHARE = 0.2
+# Multipliers coprime to 10**9 and 10**8: documents look random, and the
+# farmer number alone keeps them unique across runs.
+CPF_MULTIPLIER = 387420489
+CNPJ_MULTIPLIER = 43046721
+FARMER_COLUMNS = ("id", "cpf_cnpj", "name", "created_at", "updated_at")
+FARM_COLUMNS = (
+    "id",
+    "farmer_id",
+    "name",
+    "city",
+    "state",
+    "total_area_hectares",
+    "arable_area_hectares",
+    "vegetation_area_hectares",
+    "created_at",
+    "updated_at",
+)
+CROP_COLUMNS = ("id", "farm_id", "crop_type_id", "created_at", "updated_at")
+CENT = Decimal("0.01")
+SQLITE_CACHE_KIB = 512 * 1024
+# Farm.total_area_hectares has 10 digits, 2 of them decimal
+MAX_AREA_CENTS = 10**10 - 1
+
+
+def make_cpf(number):
+    numbers = [int(digit) for digit in f"{number % 10**9:09d}"]
+    numbers.append(calculate_cpf_check_digit(numbers, CPF_WEIGHTS[0]))
+    numbers.append(calculate_cpf_check_digit(numbers, CPF_WEIGHTS[1]))
+    return "".join(map(str, numbers))
+
+
+def make_cnpj(number):
+    # Root, then the "0001" of the head office
+    numbers = [int(digit) for digit in f"{number % 10**8:08d}0001"]
+    numbers.append(calculate_cnpj_check_digit(numbers, CNPJ_WEIGHTS[0]))
+    numbers.append(calculate_cnpj_check_digit(numbers, CNPJ_WEIGHTS[1]))
+    return "".join(map(str, numbers))
+
+
+def make_document(number, company):
+    cpf = make_cpf(number * CPF_MULTIPLIER)
+    # A CPF of repeated digits is invalid, its farmer becomes a company
+    if company or len(set(cpf)) == 1:
+        return make_cnpj(number * CNPJ_MULTIPLIER)
+    return cpf
+
+
+class Seeder:
+    def __init__(
+        self,
+        farms,
+        farms_per_farmer=2,
+        max_crops_per_farm=3,
+        days=365,
+        seed=42,
+        batch_size=5000,
+        use_copy=None,
+    ):
+        if use_copy is None:
+            use_copy = connection.vendor == "postgresql"
+        self.farms = farms
+        self.farms_per_farmer = farms_per_farmer
+        self.max_crops_per_farm = max_crops_per_farm
+        self.days = days
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.random_seed = seed
+        self.randomizer = random.Random(seed)
+        self.now = timezone.now()
+
+    def seed(self, progress=None):
+        if connection.vendor == "sqlite":
+            # Random ids land all over the indexes: with the default 2 MiB page
+            # cache, most inserts read their pages back from disk.
+            with connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_KIB}")
+        crop_type_ids = [
+            CropType.objects.get_or_create(name=name)[0].id for name in CROP_TYPE_NAMES
+        ]
+        # Numbers already handed out by a previous run are skipped, and the
+        # random ids change with them; an empty database gets the same data.
+        self.next_number = get_next_number()
+        self.randomizer.seed(self.random_seed + (self.next_number << 32))
+        farmer_count = -(-self.farms // self.farms_per_farmer)
+        created = {"farmers": 0, "farms": 0, "crops": 0}
+        for start in range(0, farmer_count, self.batch_size):
+            stop = min(start + self.batch_size, farmer_count)
+            farmers, farms, crops = [], [], []
+            for index in range(start, stop):
+                farmer = self.make_farmer(self.take_number())
+                farmers.append(farmer)
+                first_farm = index * self.farms_per_farmer
+                for _ in range(
+                    first_farm, min(first_farm + self.farms_per_farmer, self.farms)
+                ):
+                    farm = self.make_farm(farmer)
+                    farms.append(farm)
+                    crops.extend(self.make_crops(farm, crop_type_ids))
+            self.skip_existing_documents(farmers)
+            with transaction.atomic():
+                Counter.objects.update_or_create(
+                    key=NEXT_NUMBER_KEY, defaults={"value": self.next_number}
+                )
+                self.insert(Farmer, FARMER_COLUMNS, farmers)
+                self.insert(Farm, FARM_COLUMNS, farms)
+                self.insert(Crop, CROP_COLUMNS, crops)
+            created["farmers"] += len(farmers)
+            created["farms"] += len(farms)
+            created["crops"] += len(crops)
+            if progress is not None:
+                progress(created)
+        rebuild_dashboard_summary()
+        bump_data_version()
+        return created
+
+    def take_number(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def skip_existing_documents(self, farmers):
+        # Farmers created by hand may hold a generated document: theirs are
+        # replaced with the ones of the next numbers.
+        pending = farmers
+        while pending:
+            existing = set(
+                Farmer.objects.filter(
+                    cpf_cnpj__in=[farmer["cpf_cnpj"] for farmer in pending]
+                ).values_list("cpf_cnpj", flat=True)
+            )
+            pending = [farmer for farmer in pending if farmer["cpf_cnpj"] in existing]
+            for farmer in pending:
+                company = len(farmer["cpf_cnpj"]) == 14
+                farmer["cpf_cnpj"] = make_document(self.take_number(), company)
+
+    def make_farmer(self, number):
+        randomizer = self.randomizer
+        company = randomizer.random() < CNPJ_SHARE
+        last_name = randomizer.choice(LAST_NAMES)
+        if company:
+            name = f"Agropecuária {last_name} Ltda"
+        else:
+            name = f"{randomizer.choice(FIRST_NAMES)} {last_name}"
+        created_at = self.now - timedelta(
+            seconds=randomizer.random() * self.days * 86400
+        )
+        return {
+            "id": uuid.UUID(int=randomizer.getrandbits(128), version=4),
+            "cpf_cnpj": make_document(number, company),
+            "name": name,
+            "created_at": created_at,
+            "updated_at": self.make_updated_at(created_at),
+        }
+
+    def make_farm(self, farmer):
+        randomizer = self.randomizer
+        state = randomizer.choice(STATES)
+        # Skewed like real holdings: many small farms, a few very large ones
+        total = min(int(randomizer.lognormvariate(5, 1.5) * 100) + 100, MAX_AREA_CENTS)
+        arable = randomizer.randint(0, total)
+        vegetation = randomizer.randint(0, total - arable)
+        created_at = self.make_updated_at(farmer["created_at"])
+        return {
+            "id": uuid.UUID(int=randomizer.getrandbits(128), version=4),
+            "farmer_id": farmer["id"],
+            "name": f"Fazenda {randomizer.choice(FARM_NAMES)}",
+            "city": CAPITALS[state],
+            "state": state,
+            "total_area_hectares": Decimal(total) * CENT,
+            "arable_area_hectares": Decimal(arable) * CENT,
+            "vegetation_area_hectares": Decimal(vegetation) * CENT,
+            "created_at": created_at,
+            "updated_at": self.make_updated_at(created_at),
+        }
+
+    def make_crops(self, farm, crop_type_ids):
+        randomizer = self.randomizer
+        crops = []
+        count = randomizer.randint(0, min(self.max_crops_per_farm, len(crop_type_ids)))
+        for crop_type_id in randomizer.sample(crop_type_ids, count):
+            created_at = self.make_updated_at(farm["created_at"])
+            crops.append(
+                {
+                    "id": uuid.UUID(int=randomizer.getrandbits(128), version=4),
+                    "farm_id": farm["id"],
+                    "crop_type_id": crop_type_id,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+        return crops
+
+    def make_updated_at(self, created_at):
+        return created_at + (self.now - created_at) * self.randomizer.random()
+
+    def insert(self, model, columns, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            copy_rows(model, columns, rows)
+            return
+        # Plain INSERTs: bulk_create would stamp every row with the current
+        # time through auto_now_add and auto_now.
+        database = connections[DEFAULT_DB_ALIAS]
+        fields = [model._meta.get_field(column) for column in columns]
+        # Text goes as is, only the other values need the backend format
+        prepare = [
+            None if field.get_internal_type() == "CharField" else field
+            for field in fields
+        ]
+        quoted_columns = ", ".join(
+            database.ops.quote_name(field.column) for field in fields
+        )
+        placeholders = ", ".join(["%s"] * len(fields))
+        table = database.ops.quote_name(model._meta.db_table)
+        with database.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} ({quoted_columns}) VALUES ({placeholders})",
+                [
+                    [
+                        (
+                            row[column]
+                            if field is None
+                            else field.get_db_prep_save(row[column], database)
+                        )
+                        for field, column in zip(prepare, columns)
+                    ]
+                    for row in rows
+                ],
+            )
+
+
+def get_next_number():
+    return (
+        Counter.objects.filter(key=NEXT_NUMBER_KEY)
+        .values_list("value", flat=True)
+        .first()
+        or 0
+    )
+
+
+def seed(farms, **options):
+    return Seeder(farms, **options).seed()
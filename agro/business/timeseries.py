@@ -0,0 +1,165 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, DateField, DecimalField, IntegerField, Sum, Value
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from agro.cache import aget_data_version, get_cache, get_data_version
+from agro.models import Farm, Farmer
+
+from .dashboard import AREA_FIELDS
+
+INTERVALS = ("day", "week", "month")
+DEFAULT_PERIODS = {"day": 30, "week": 12, "month": 12}
+MAX_PERIODS = 1000
+SERIES_FIELDS = ("farmer_count", "farm_count") + AREA_FIELDS
+
+
+def get_period_range(interval, start=None, end=None):
+    end = _truncate(interval, end or timezone.localdate())
+    # The rows are read up to the start of the period after the end
+    if not _can_shift(interval, end, 1):
+        raise ValueError("The end must be before the last period of the calendar.")
+    if start is None:
+        if not _can_shift(interval, end, 1 - DEFAULT_PERIODS[interval]):
+            raise ValueError("The start must be after the first day of the calendar.")
+        start = _shift(interval, end, 1 - DEFAULT_PERIODS[interval])
+    start = _truncate(interval, start)
+    if start > end:
+        raise ValueError("The start must not be after the end.")
+    if _period_count(interval, start, end) > MAX_PERIODS:
+        raise ValueError(f"The range must not have more than {MAX_PERIODS} periods.")
+    return start, end
+
+
+def get_timeseries(interval, start, end, state=None):
+    return _fill(interval, start, end, state, _get_rows(interval, start, end, state))
+
+
+async def aget_timeseries(interval, start, end, state=None):
+    rows = [row async for row in _get_rows(interval, start, end, state)]
+    return _fill(interval, start, end, state, rows)
+
+
+def get_cached_timeseries(interval, start, end, state=None, version=None):
+    cache = get_cache()
+    version = version or get_data_version()
+    key = _get_cache_key(version, interval, start, end, state)
+    timeseries = cache.get(key)
+    if timeseries is None:
+        timeseries = get_timeseries(interval, start, end, state)
+        cache.set(key, timeseries, settings.DASHBOARD_CACHE_TIMEOUT)
+    return timeseries
+
+
+async def aget_cached_timeseries(interval, start, end, state=None, version=None):
+    cache = get_cache()
+    version = version or await aget_data_version()
+    key = _get_cache_key(version, interval, start, end, state)
+    timeseries = await cache.aget(key)
+    if timeseries is None:
+        timeseries = await aget_timeseries(interval, start, end, state)
+        await cache.aset(key, timeseries, settings.DASHBOARD_CACHE_TIMEOUT)
+    return timeseries
+
+
+def _get_cache_key(version, interval, start, end, state):
+    return f"agro:timeseries:{version}:{interval}:{start}:{end}:{state or ''}"
+
+
+def _get_rows(interval, start, end, state):
+    # Buckets are local calendar dates, so the range is bounded by local
+    # midnights and both tables are scanned through their created_at index.
+    tzinfo = timezone.get_current_timezone()
+    created_at = {
+        "created_at__gte": datetime.combine(start, time.min, tzinfo),
+        "created_at__lt": datetime.combine(_shift(interval, end, 1), time.min, tzinfo),
+    }
+    period = Trunc("created_at", interval, output_field=DateField())
+    zero_area = Value(Decimal(0), output_field=DecimalField())
+    # From the primary, like the dashboard summary: the series is cached
+    # under the data version.
+    farms = Farm.objects.using(DEFAULT_DB_ALIAS).filter(**created_at)
+    farmers = Farmer.objects.using(DEFAULT_DB_ALIAS).filter(**created_at)
+    if state:
+        farms = farms.filter(state=state)
+        farmers = farmers.filter(farms__state=state)
+    # Farms and farmers are bucketed side by side in a single grouped query;
+    # each half fills the other's columns with zeros.
+    farm_rows = (
+        farms.annotate(period=period)
+        .values("period")
+        .annotate(
+            farmer_count=Value(0, output_field=IntegerField()),
+            farm_count=Count("id"),
+            **{field: Sum(field) for field in AREA_FIELDS},
+        )
+        .order_by()
+    )
+    farmer_rows = (
+        farmers.annotate(period=period)
+        .values("period")
+        .annotate(
+            farmer_count=Count("id", distinct=True),
+            farm_count=Value(0, output_field=IntegerField()),
+            **{field: zero_area for field in AREA_FIELDS},
+        )
+        .order_by()
+    )
+    return farm_rows.union(farmer_rows, all=True)
+
+
+def _fill(interval, start, end, state, rows):
+    series = {}
+    period = start
+    while period <= end:
+        series[period] = {"period": period, "farmer_count": 0, "farm_count": 0}
+        series[period].update({field: Decimal(0) for field in AREA_FIELDS})
+        period = _shift(interval, period, 1)
+    for row in rows:
+        point = series[row["period"]]
+        for field in SERIES_FIELDS:
+            point[field] += row[field] or 0
+    return {
+        "interval": interval,
+        "start": start,
+        "end": end,
+        "state": state,
+        "series": list(series.values()),
+    }
+
+
+def _truncate(interval, date):
+    if interval == "week":
+        return date - timedelta(days=date.weekday())
+    if interval == "month":
+        return date.replace(day=1)
+    return date
+
+
+def _shift(interval, date, periods):
+    if interval == "week":
+        return date + timedelta(weeks=periods)
+    if interval == "month":
+        month = date.year * 12 + date.month - 1 + periods
+        return date.replace(year=month // 12, month=month % 12 + 1)
+    return date + timedelta(days=periods)
+
+
+def _can_shift(interval, date, periods):
+    try:
+        _shift(interval, date, periods)
+    except (OverflowError, ValueError):
+        return False
+    return True
+
+
+def _period_count(interval, start, end):
+    if interval == "week":
+        return (end - start).days // 7 + 1
+    if interval == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from agro.models import Counter
+
+DATA_VERSION_KEY = "agro:data-version"
+
+
+def get_cache():
+    return caches[settings.AGRO_CACHE_ALIAS]
+
+
+# The versions are counters in the primary database, not in the cache: a
+# process-local cache would give every worker its own version, and they are
+# read from the primary because a lagging replica would still have the
+# version from before a write.
+def _get_counters(key):
+    return Counter.objects.using(DEFAULT_DB_ALIAS).filter(key=key)
+
+
+def _get_defaults():
+    # Seeded from the clock, so a counter lost with its rows never comes
+    # back with a value that was already handed out.
+    return {"value": time.time_ns()}
+
+
+def get_data_version(key=DATA_VERSION_KEY):
+    version = _get_counters(key).values_list("value", flat=True).first()
+    if version is None:
+        counter, _ = Counter.objects.using(DEFAULT_DB_ALIAS).get_or_create(
+            key=key, defaults=_get_defaults()
+        )
+        version = counter.value
+    return version
+
+
+async def aget_data_version(key=DATA_VERSION_KEY):
+    version = await _get_counters(key).values_list("value", flat=True).afirst()
+    if version is None:
+        counter, _ = await Counter.objects.using(DEFAULT_DB_ALIAS).aget_or_create(
+            key=key, defaults=_get_defaults()
+        )
+        version = counter.value
+    return version
+
+
+def bump_data_version(key=DATA_VERSION_KEY):
+    counters = _get_counters(key)
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        if counters.update(value=F("value") + 1):
+            return counters.values_list("value", flat=True).get()
+    return get_data_version(key)
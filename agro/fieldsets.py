@@ -0,0 +1,70 @@
+from rest_framework.exceptions import ValidationError
+
+
+def parse_paths(value):
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in filter(None, path.strip().split(".")):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def find_unknown_paths(tree, names, prefix=""):
+    unknown = []
+    for name, node in tree.items():
+        if name not in names:
+            unknown.append(prefix + name)
+        else:
+            unknown.extend(find_unknown_paths(node, names[name], f"{prefix}{name}."))
+    return unknown
+
+
+class Fieldset:
+    query_params = ("fields", "omit", "expand")
+
+    def __init__(self, fields=None, omit=None, expand=None):
+        # An empty or missing `fields` node keeps every field, a missing
+        # `expand` keeps every relation nested.
+        self.fields = fields or None
+        self.omit = omit or {}
+        self.expand = expand
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        if not any(param in query_params for param in cls.query_params):
+            return None
+        return cls(
+            *(parse_paths(query_params.get(param)) for param in cls.query_params)
+        )
+
+    def validate(self, names):
+        # `names` maps each readable field to the names of its nested fields
+        errors = {}
+        for param in self.query_params:
+            unknown = find_unknown_paths(getattr(self, param) or {}, names)
+            if unknown:
+                errors[param] = [f"Unknown fields: {', '.join(unknown)}."]
+        if errors:
+            raise ValidationError(errors)
+
+    def includes(self, name):
+        if self.omit.get(name) == {}:
+            return False
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        return (
+            self.expand is None
+            or name in self.expand
+            or bool(self.fields and self.fields.get(name))
+        )
+
+    def nested(self, name):
+        return Fieldset(
+            fields=(self.fields or {}).get(name),
+            omit=self.omit.get(name),
+            expand=None if self.expand is None else self.expand.get(name, {}),
+        )
@@ -0,0 +1,96 @@
+import uuid
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .business.documents import clean_cpf_cnpj
+from .business.timeseries import INTERVALS
+from .constants import STATE_CHOICES
+
+STATES = dict(STATE_CHOICES)
+# Beyond a signed 64-bit integer, SQLite fails on the value
+MAX_INTEGER = 2**63 - 1
+
+
+def clean_text(value):
+    value = value.strip()
+    if not value:
+        raise ValueError("This field may not be blank.")
+    return value
+
+
+def clean_state(value):
+    state = value.strip().upper()
+    if state not in STATES:
+        raise ValueError(
+            "Invalid value for the state. Please set a valid state, e.g.: SP"
+        )
+    return state
+
+
+def clean_uuid(value):
+    try:
+        return uuid.UUID(value.strip())
+    except ValueError:
+        raise ValueError("Must be a valid UUID.")
+
+
+def clean_integer(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError("A valid integer is required.")
+    if not -MAX_INTEGER - 1 <= number <= MAX_INTEGER:
+        raise ValueError("A valid integer is required.")
+    return number
+
+
+def clean_area(value):
+    try:
+        area = Decimal(value.strip())
+    except InvalidOperation:
+        raise ValueError("A valid number is required.")
+    if not area.is_finite():
+        raise ValueError("A valid number is required.")
+    return area
+
+
+def clean_date(value):
+    try:
+        return date.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError("Date has wrong format. Use this format: YYYY-MM-DD.")
+
+
+def clean_interval(value):
+    interval = value.strip().lower()
+    if interval not in INTERVALS:
+        raise ValueError(f"Must be one of: {', '.join(INTERVALS)}.")
+    return interval
+
+
+def clean_document(value):
+    cpf_cnpj = clean_cpf_cnpj(value)
+    if cpf_cnpj is None:
+        raise ValueError("Enter a valid CPF or CNPJ.")
+    return cpf_cnpj
+
+
+class QueryFilterBackend(BaseFilterBackend):
+    # Each view maps a query param to the lookup it filters on and the
+    # function that cleans its value, see `query_filters` in agro.views.
+    def filter_queryset(self, request, queryset, view):
+        lookups, errors = {}, {}
+        for param, (lookup, clean) in getattr(view, "query_filters", {}).items():
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                lookups[lookup] = clean(value)
+            except ValueError as exc:
+                errors[param] = [str(exc)]
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**lookups)
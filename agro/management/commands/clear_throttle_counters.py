@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from agro.throttling import delete_expired_counters
+
+
+class Command(BaseCommand):
+    help = "Delete the throttle counters of windows that are over (THROTTLE_DATABASE)."
+
+    def handle(self, *args, **options):
+        deleted = delete_expired_counters(time.time())
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired throttle counters.")
+        )
@@ -0,0 +1,135 @@
+import json
+import os
+import time
+import uuid
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agro.business.importer import LOADERS, RowError, read_rows
+
+FILE_FORMATS = ("csv", "ndjson")
+
+
+class Command(BaseCommand):
+    help = "Import farmers, farms or crops from a CSV or NDJSON file, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(LOADERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FILE_FORMATS, dest="file_format")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--rejects",
+            help="File that receives the rejected rows, as NDJSON.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File that tracks the committed rows (default: <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the rows already committed by a previous run.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_false",
+            dest="use_copy",
+            default=None,
+            help="Use bulk_create even when the database is Postgres.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or os.path.splitext(path)[1].lstrip(".")
+        if file_format not in FILE_FORMATS:
+            raise CommandError("Unable to detect the file format, use --format.")
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive number.")
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+        skip, run_id = 0, None
+        if options["resume"]:
+            skip, run_id = self.read_checkpoint(checkpoint, path)
+        run_id = run_id or uuid.uuid4()
+        loader = LOADERS[options["kind"]](run_id, use_copy=options["use_copy"])
+        # Written before the first batch: a run stopped after its first
+        # commit resumes with the same run id, so with the same row ids.
+        self.write_checkpoint(checkpoint, path, run_id, skip)
+        # A resumed import adds to the rejects of the previous run
+        rejects_mode = "a" if options["resume"] else "w"
+        rejects = open(options["rejects"], rejects_mode) if options["rejects"] else None
+        processed, loaded, rejected = skip, 0, 0
+        started_at = time.perf_counter()
+        try:
+            with open(path, newline="") as file:
+                rows = islice(read_rows(file, file_format), skip, None)
+                while batch := list(islice(rows, batch_size)):
+                    cleaned, errors = [], []
+                    for line, row in enumerate(batch, start=processed + 1):
+                        try:
+                            if not isinstance(row, dict):
+                                raise RowError("Invalid row.")
+                            cleaned.append((line, row, loader.clean(row)))
+                        except RowError as error:
+                            errors.append((line, row, str(error)))
+                    batch_loaded, batch_rejected = loader.load(
+                        [row for _, _, row in cleaned],
+                        [line for line, _, _ in cleaned],
+                    )
+                    errors.extend(
+                        (cleaned[position][0], cleaned[position][1], error)
+                        for position, error in batch_rejected.items()
+                    )
+                    processed += len(batch)
+                    loaded += batch_loaded
+                    rejected += len(errors)
+                    self.write_rejects(rejects, errors)
+                    self.write_checkpoint(checkpoint, path, run_id, processed)
+                    elapsed = time.perf_counter() - started_at
+                    self.stdout.write(
+                        f"{processed} rows processed, {loaded} loaded, "
+                        f"{rejected} rejected ({(processed - skip) / elapsed:.0f} rows/s)"
+                    )
+        finally:
+            if rejects:
+                rejects.close()
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {loaded} {options['kind']} in {elapsed:.1f}s, "
+                f"{rejected} rejected ({(processed - skip) / elapsed:.0f} rows/s)."
+            )
+        )
+
+    def read_checkpoint(self, checkpoint, path):
+        if not os.path.exists(checkpoint):
+            return 0, None
+        with open(checkpoint) as file:
+            data = json.load(file)
+        if os.path.abspath(data["path"]) != os.path.abspath(path):
+            raise CommandError(
+                f"The checkpoint {checkpoint} belongs to {data['path']}, not {path}."
+            )
+        run_id = data.get("run")
+        return data["rows"], run_id and uuid.UUID(run_id)
+
+    def write_checkpoint(self, checkpoint, path, run_id, rows):
+        with open(f"{checkpoint}.tmp", "w") as file:
+            json.dump(
+                {"path": os.path.abspath(path), "run": str(run_id), "rows": rows}, file
+            )
+        os.replace(f"{checkpoint}.tmp", checkpoint)
+
+    def write_rejects(self, rejects, errors):
+        if rejects is None:
+            return
+        for line, row, error in errors:
+            rejects.write(
+                json.dumps({"line": line, "row": row, "error": error}, default=str)
+                + "\n"
+            )
+        rejects.flush()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from agro.business.dashboard import rebuild_dashboard_summary
+
+
+class Command(BaseCommand):
+    help = "Rebuild the dashboard summary table from the farms and crops."
+
+    def handle(self, *args, **options):
+        rows = rebuild_dashboard_summary()
+        self.stdout.write(
+            self.style.SUCCESS(f"Dashboard summary rebuilt with {len(rows)} rows.")
+        )
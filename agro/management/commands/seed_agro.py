@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agro.business.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate farmers, farms and crops with valid documents and areas, "
+        "reproducible through the random seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("farms", type=int)
+        parser.add_argument("--farms-per-farmer", type=int, default=2)
+        parser.add_argument("--max-crops-per-farm", type=int, default=3)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread the creation dates over this many past days.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--no-copy",
+            action="store_false",
+            dest="use_copy",
+            default=None,
+            help="Use INSERTs even when the database is Postgres.",
+        )
+
+    def handle(self, *args, **options):
+        for option in ("farms", "farms_per_farmer", "batch_size", "days"):
+            if options[option] < 1:
+                raise CommandError(
+                    f"--{option.replace('_', '-')} must be a positive number."
+                )
+        if options["max_crops_per_farm"] < 0:
+            raise CommandError("--max-crops-per-farm cannot be negative.")
+        seeder = Seeder(
+            options["farms"],
+            farms_per_farmer=options["farms_per_farmer"],
+            max_crops_per_farm=options["max_crops_per_farm"],
+            days=options["days"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            use_copy=options["use_copy"],
+        )
+        started_at = time.perf_counter()
+
+        def progress(created):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{created['farms']} farms...")
+
+        created = seeder.seed(progress=progress)
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {created['farmers']} farmers, {created['farms']} farms and "
+                f"{created['crops']} crops in {elapsed:.1f}s."
+            )
+        )
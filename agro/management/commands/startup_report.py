@@ -0,0 +1,106 @@
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, as a worker that boots and serves one request
+PROBE = """
+import json, sys, time
+started_at = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+timings = {"django_setup": time.perf_counter() - started_at}
+if sys.argv[2] == "warm":
+    from agro import warmup
+    for step in (warmup.load_urls, warmup.load_serializers, warmup.connect_databases):
+        step_started_at = time.perf_counter()
+        step()
+        timings[step.__name__] = time.perf_counter() - step_started_at
+from django.test import Client
+client = Client(HTTP_HOST="localhost", HTTP_ACCEPT="application/json")
+step_started_at = time.perf_counter()
+status = client.get(sys.argv[1]).status_code
+timings["first_request"] = time.perf_counter() - step_started_at
+print(json.dumps({"status": status, "timings": timings}))
+"""
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| +(\S+)$")
+
+
+def parse_import_times(stderr):
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us)))
+    return imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a cold start in a fresh interpreter: the imports per module, the "
+        "warm-up steps and the first request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/farms/")
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--no-warm-up",
+            action="store_false",
+            dest="warm_up",
+            help="Serve the first request without the warm-up steps.",
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            help="Fail when the first response takes longer than this.",
+        )
+
+    def handle(self, *args, **options):
+        started_at = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, options["path"]]
+            + ["warm" if options["warm_up"] else "cold"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        if result.returncode != 0:
+            raise CommandError(f"The startup probe failed:\n{result.stderr[-2000:]}")
+        probe = json.loads(result.stdout.splitlines()[-1])
+        imports = parse_import_times(result.stderr)
+        self.stdout.write(
+            f"First response in {elapsed_ms:.0f} ms (HTTP {probe['status']} "
+            f"for {options['path']}), from the interpreter start:"
+        )
+        for step, seconds in probe["timings"].items():
+            self.stdout.write(f"  {step:<20} {seconds * 1000:8.1f} ms")
+        packages = Counter()
+        for module, self_us, _ in imports:
+            packages[module.split(".")[0]] += self_us
+        self.stdout.write(
+            f"Import time per package ({len(imports)} modules, "
+            f"{sum(packages.values()) / 1000:.0f} ms):"
+        )
+        for package, self_us in packages.most_common(options["top"]):
+            self.stdout.write(f"  {package:<32} {self_us / 1000:8.1f} ms")
+        self.stdout.write("Slowest modules, with what they import:")
+        slowest = sorted(imports, key=lambda item: item[2], reverse=True)
+        for module, self_us, cumulative_us in slowest[: options["top"]]:
+            self.stdout.write(
+                f"  {module:<48} {cumulative_us / 1000:8.1f} ms "
+                f"({self_us / 1000:.1f} ms itself)"
+            )
+        budget_ms = options["budget_ms"]
+        if budget_ms is not None and elapsed_ms > budget_ms:
+            raise CommandError(
+                f"The first response took {elapsed_ms:.0f} ms, over the budget of "
+                f"{budget_ms:.0f} ms."
+            )
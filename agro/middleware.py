@@ -0,0 +1,111 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .timing import RequestTimings, install_execute_wrapper, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    # WhiteNoise is sync only, and a single sync middleware makes Django run
+    # the whole chain, async views included, in a thread under ASGI.
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        # The files are indexed at startup, unless autorefresh is on
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.query_budget = settings.SERVER_TIMING["QUERY_BUDGET"]
+        self.latency_budget = settings.SERVER_TIMING["LATENCY_BUDGET_MS"] / 1000
+        # Connections are per thread, and opened by the threads that run the
+        # ORM: each gets the wrapper as it connects.
+        connection_created.connect(
+            install_execute_wrapper, dispatch_uid="agro.server_timing"
+        )
+        for connection in connections.all(initialized_only=True):
+            install_execute_wrapper(connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = request.server_timing = RequestTimings()
+        with track_queries(timings):
+            response = self.get_response(request)
+        return self.add_header(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = request.server_timing = RequestTimings()
+        with track_queries(timings):
+            response = await self.get_response(request)
+        return self.add_header(request, response, timings)
+
+    def add_header(self, request, response, timings):
+        total = timings.total
+        response["Server-Timing"] = self.get_header(timings, total)
+        if timings.queries > self.query_budget or total > self.latency_budget:
+            logger.warning(
+                f"Request over budget: {request.method} {request.get_full_path()} "
+                f"took {total * 1000:.1f}ms with {timings.queries} queries "
+                f"({timings.durations['db'] * 1000:.1f}ms in SQL)"
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook
+        timings = request.server_timing
+        started_at = time.perf_counter()
+
+        def rendered(response):
+            timings.durations["render"] += time.perf_counter() - started_at
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def get_header(self, timings, total):
+        metrics = [
+            f'db;dur={timings.durations["db"] * 1000:.2f};desc="{timings.queries} queries"'
+        ]
+        metrics.extend(
+            f"{name};dur={timings.durations[name] * 1000:.2f}"
+            for name in ("serialize", "render")
+            if name in timings.durations
+        )
+        metrics.extend(
+            f'throttle;desc="{scope} {count}/{limit}"'
+            for scope, count, limit in timings.throttles
+        )
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
@@ -0,0 +1,113 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+AREA_FIELDS = (
+    "total_area_hectares",
+    "arable_area_hectares",
+    "vegetation_area_hectares",
+)
+
+
+def populate_dashboard_summary(apps, schema_editor):
+    Crop = apps.get_model("agro", "Crop")
+    Farm = apps.get_model("agro", "Farm")
+    DashboardSummary = apps.get_model("agro", "DashboardSummary")
+    db = schema_editor.connection.alias
+    sums = {field: Sum(field) for field in AREA_FIELDS}
+    totals = Farm.objects.using(db).aggregate(farm_count=Count("id"), **sums)
+    rows = [
+        DashboardSummary(
+            dimension="total",
+            key="",
+            farm_count=totals["farm_count"],
+            **{field: totals[field] or 0 for field in AREA_FIELDS},
+        )
+    ]
+    states = Farm.objects.using(db).values("state")
+    for item in states.annotate(farm_count=Count("id"), **sums):
+        rows.append(
+            DashboardSummary(
+                dimension="state",
+                key=item["state"],
+                farm_count=item["farm_count"],
+                **{field: item[field] for field in AREA_FIELDS},
+            )
+        )
+    crop_types = Crop.objects.using(db).values("crop_type")
+    for item in crop_types.annotate(farm_count=Count("farm")):
+        rows.append(
+            DashboardSummary(
+                dimension="crop_type",
+                key=str(item["crop_type"]),
+                crop_type_id=item["crop_type"],
+                farm_count=item["farm_count"],
+            )
+        )
+    DashboardSummary.objects.using(db).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agro", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("total", "Total"),
+                            ("state", "State"),
+                            ("crop_type", "Crop type"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("key", models.CharField(blank=True, max_length=100)),
+                ("farm_count", models.BigIntegerField(default=0)),
+                (
+                    "total_area_hectares",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "arable_area_hectares",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "vegetation_area_hectares",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "crop_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="agro.croptype",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("dimension", "key")},
+            },
+        ),
+        migrations.RunPython(populate_dashboard_summary, migrations.RunPython.noop),
+    ]
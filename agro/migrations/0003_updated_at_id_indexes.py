@@ -0,0 +1,31 @@
+# Generated by Django 5.0.4 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agro", "0002_dashboardsummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="crop",
+            index=models.Index(
+                fields=["updated_at", "id"], name="agro_crop_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(
+                fields=["updated_at", "id"], name="agro_farm_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farmer",
+            index=models.Index(
+                fields=["updated_at", "id"], name="agro_farmer_updated_id_idx"
+            ),
+        ),
+    ]
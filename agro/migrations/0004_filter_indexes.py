@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-18 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agro", "0003_updated_at_id_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="crop",
+            index=models.Index(
+                fields=["crop_type", "farm"], name="agro_crop_type_farm_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(
+                fields=["state", "city"], name="agro_farm_state_city_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(fields=["city"], name="agro_farm_city_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(
+                fields=["state", "total_area_hectares"],
+                name="agro_farm_state_total_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(
+                fields=["total_area_hectares"], name="agro_farm_total_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(
+                fields=["arable_area_hectares"], name="agro_farm_arable_idx"
+            ),
+        ),
+    ]
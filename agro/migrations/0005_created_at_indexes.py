@@ -0,0 +1,27 @@
+# Generated by Django 5.0.4 on 2026-10-18 14:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agro", "0004_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(fields=["created_at"], name="agro_farm_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farm",
+            index=models.Index(
+                fields=["state", "created_at"], name="agro_farm_state_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="farmer",
+            index=models.Index(fields=["created_at"], name="agro_farmer_created_idx"),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agro", "0005_created_at_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("value", models.BigIntegerField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.4 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agro", "0006_counter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ThrottleCounter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("expires_at", models.BigIntegerField(db_index=True)),
+                ("requests", models.PositiveIntegerField()),
+            ],
+        ),
+    ]
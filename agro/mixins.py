@@ -0,0 +1,322 @@
+import hashlib
+import math
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.functional import classproperty
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .business.exports import EXPORT_CONTENT_TYPES, EXPORT_WRITERS
+from .fieldsets import Fieldset
+from .pagination import StandardResultsSetPagination
+from .routers import get_read_database, has_replica, read_from
+from .timing import get_request_timings, server_timing
+
+
+async def aiterate(iterator):
+    # Each chunk is produced in the thread of the request, where the database
+    # cursor of the export lives.
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await next_chunk(iterator, None)) is not None:
+        yield chunk
+
+
+class ExportMixin:
+    export_fields = ()
+    export_expressions = {}
+    export_query_param = "output"
+
+    def get_export_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = [
+            field
+            for field in self.export_fields
+            if field not in self.export_expressions
+        ]
+        return queryset.values(*fields, **self.export_expressions)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        output = request.query_params.get(self.export_query_param, "csv")
+        if output not in EXPORT_WRITERS:
+            return Response(
+                {
+                    "error": f"Invalid output, choose one of: {', '.join(EXPORT_WRITERS)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        queryset = self.get_export_queryset()
+        # Pinned now, as the rows are read after the view has returned
+        queryset = queryset.using(queryset.db)
+        rows = queryset.iterator(chunk_size=chunk_size)
+        content = EXPORT_WRITERS[output](rows, self.export_fields, chunk_size)
+        if isinstance(request._request, ASGIRequest):
+            # An ASGI server loads a sync iterator whole before sending it
+            content = aiterate(content)
+        response = StreamingHttpResponse(
+            content, content_type=EXPORT_CONTENT_TYPES[output]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}.{output}"'
+        )
+        return response
+
+
+class ReplicaReadMixin:
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        with read_from(get_read_database(request)):
+            response = super().dispatch(request, *args, **kwargs)
+        return self.set_sticky_cookie(request, response)
+
+    async def adispatch(self, request, *args, **kwargs):
+        with read_from(get_read_database(request)):
+            response = await super().dispatch(request, *args, **kwargs)
+        return self.set_sticky_cookie(request, response)
+
+    def set_sticky_cookie(self, request, response):
+        if request.method not in SAFE_METHODS and has_replica():
+            response.set_cookie(
+                settings.READ_REPLICA["STICKY_COOKIE"],
+                "1",
+                max_age=settings.READ_REPLICA["STICKY_SECONDS"],
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ServerTimingMixin:
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        timings = get_request_timings(self.request)
+        if timings is not None:
+            serializer.to_representation = timings.timed(
+                "serialize", serializer.to_representation
+            )
+        return serializer
+
+
+class SparseFieldsetMixin:
+    fieldset_actions = ("list", "retrieve")
+
+    def get_fieldset(self):
+        if self.action not in self.fieldset_actions:
+            return None
+        return Fieldset.from_query_params(self.request.query_params)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            fieldset.validate(self.get_fieldset_names())
+        serializer = self.get_fieldset_serializer()
+        if serializer is None:
+            return queryset
+        return self.apply_fieldset(queryset, serializer)
+
+    def get_fieldset_names(self):
+        return self.get_serializer().get_fieldset_names()
+
+    def get_fieldset_serializer(self):
+        if self.get_fieldset() is None:
+            return None
+        return self.get_serializer()
+
+    def apply_fieldset(self, queryset, serializer):
+        only, related = serializer.get_query_plan()
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
+
+class ValuesListMixin:
+    # Lists are read from values() rows, see SparseFieldsetSerializer.get_row_mapper
+    list_from_values = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.list_from_values:
+            return super().list(request, *args, **kwargs)
+        rows, map_row = self.get_values_rows()
+        return self.get_values_response(rows, map_row, self.paginate_queryset(rows))
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.list_from_values:
+            return await super().alist(request, *args, **kwargs)
+        rows, map_row = self.get_values_rows()
+        page = await self.apaginate_queryset(rows)
+        if page is None:
+            rows = [row async for row in rows]
+        return self.get_values_response(rows, map_row, page)
+
+    def get_values_rows(self):
+        lookups, map_row = self.get_serializer().get_row_mapper()
+        queryset = self.filter_queryset(self.get_queryset())
+        # The cursor of the keyset pagination is built from these two keys
+        return queryset.values(*lookups, "pk", "updated_at"), map_row
+
+    def get_values_response(self, rows, map_row, page):
+        with server_timing(self.request, "serialize"):
+            data = [map_row(row) for row in (rows if page is None else page)]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class AsyncReadMixin:
+    # With settings.ASYNC_VIEWS, set under ASGI only, these handlers are
+    # swapped for their a-prefixed variants on the async ORM and the other
+    # actions run in a thread, see adrf.views.APIView.async_dispatch. Under
+    # WSGI every handler stays sync.
+    async_handlers = ("list", "retrieve")
+
+    @classproperty
+    def view_is_async(cls):
+        return settings.ASYNC_VIEWS
+
+    def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        # Bound by as_view() under the sync name, HEAD to the GET handler
+        name = getattr(getattr(self, method, None), "__name__", None)
+        if self.view_is_async and name in self.async_handlers:
+            setattr(self, method, getattr(self, f"a{name}"))
+        return super().dispatch(request, *args, **kwargs)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+
+class ConditionalMixin:
+    conditional_actions = ("list", "retrieve")
+    # Every updated_at the payload is built from, nested relations included
+    conditional_lookups = ("updated_at",)
+    # Rows of the paginated list, handed over to the paginator
+    conditional_page_count = Count("pk")
+    page_count = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag, self.last_modified = self.get_conditional_metadata()
+        if self.etag is None:
+            return
+        response = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=self.last_modified,
+        )
+        if response is not None:
+            # Dispatch looks the handler up after initial(), so the page is
+            # never fetched nor serialized.
+            setattr(self, request.method.lower(), lambda *args, **kwargs: response)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "etag", None) and response.status_code in (200, 304):
+            response.headers.setdefault("ETag", self.etag)
+            if self.last_modified is not None:
+                response.headers.setdefault(
+                    "Last-Modified", http_date(self.last_modified)
+                )
+        return response
+
+    def get_conditional_queryset(self):
+        # The fieldset only narrows the columns, so the metadata is read from
+        # the plain queryset.
+        queryset = self.filter_queryset(self.queryset.all())
+        if self.detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def uses_keyset(self):
+        return isinstance(
+            self.paginator, StandardResultsSetPagination
+        ) and self.paginator.uses_keyset(self.request)
+
+    def get_conditional_lookups(self):
+        return self.conditional_lookups
+
+    def get_registry_updated_at(self):
+        # Latest updates of the rows rendered from an in-process registry
+        # instead of a join, e.g. the crop type names
+        return []
+
+    def get_conditional_metadata(self):
+        if self.action not in self.conditional_actions or self.request.method not in (
+            "GET",
+            "HEAD",
+        ):
+            return None, None
+        if not self.detail and self.uses_keyset():
+            # Cursor pages never count the whole filter
+            return None, None
+        aggregates = {lookup: Max(lookup) for lookup in self.get_conditional_lookups()}
+        try:
+            metadata = (
+                self.get_conditional_queryset()
+                .order_by()
+                .aggregate(
+                    conditional_count=Count("pk"),
+                    conditional_page_count=self.conditional_page_count,
+                    **aggregates,
+                )
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Invalid lookup value, the handler answers with a 404
+            return None, None
+        count = metadata.pop("conditional_count")
+        page_count = metadata.pop("conditional_page_count")
+        if self.detail and not count:
+            return None, None
+        if not self.detail:
+            self.page_count = page_count
+        values = [*metadata.values(), *self.get_registry_updated_at()]
+        key = "|".join(
+            [
+                self.request.get_full_path(),
+                self.request.accepted_media_type,
+                str(count),
+                str(page_count),
+                *(str(value) for value in values),
+            ]
+        )
+        etag = quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+        updated_at = [value for value in values if value is not None]
+        if not self.detail or not updated_at:
+            # A delete leaves the latest update of a list as it was, only the
+            # count in the ETag changes.
+            return etag, None
+        # Whole seconds, rounded up and only once that second is over: an
+        # update later in the same second would not be newer otherwise.
+        last_modified = math.ceil(max(updated_at).timestamp())
+        if last_modified > time.time():
+            return etag, None
+        return etag, last_modified
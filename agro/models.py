@@ -1,6 +1,6 @@
 import uuid
 
-from django.db import models
+from django.db import models, router, transaction
 
 from .constants import STATE_CHOICES
 
@@ -12,6 +12,14 @@ class Farmer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["updated_at", "id"], name="agro_farmer_updated_id_idx"
+            ),
+            models.Index(fields=["created_at"], name="agro_farmer_created_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -28,9 +36,31 @@ class Farm(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="agro_farm_updated_id_idx"),
+            models.Index(fields=["state", "city"], name="agro_farm_state_city_idx"),
+            models.Index(fields=["city"], name="agro_farm_city_idx"),
+            models.Index(
+                fields=["state", "total_area_hectares"],
+                name="agro_farm_state_total_idx",
+            ),
+            models.Index(fields=["total_area_hectares"], name="agro_farm_total_idx"),
+            models.Index(fields=["arable_area_hectares"], name="agro_farm_arable_idx"),
+            models.Index(fields=["created_at"], name="agro_farm_created_idx"),
+            models.Index(
+                fields=["state", "created_at"], name="agro_farm_state_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(Farm, instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
 
 class CropType(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -55,6 +85,71 @@ class Crop(models.Model):
             "farm",
             "crop_type",
         )
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="agro_crop_updated_id_idx"),
+            models.Index(fields=["crop_type", "farm"], name="agro_crop_type_farm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.crop_type.name} in {self.farm.name}"
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(Crop, instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class DashboardSummary(models.Model):
+    TOTAL = "total"
+    STATE = "state"
+    CROP_TYPE = "crop_type"
+    DIMENSION_CHOICES = [
+        (TOTAL, "Total"),
+        (STATE, "State"),
+        (CROP_TYPE, "Crop type"),
+    ]
+
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100, blank=True)
+    crop_type = models.ForeignKey(
+        CropType, null=True, blank=True, on_delete=models.CASCADE, related_name="+"
+    )
+    farm_count = models.BigIntegerField(default=0)
+    total_area_hectares = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    arable_area_hectares = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    vegetation_area_hectares = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (
+            "dimension",
+            "key",
+        )
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key}"
+
+
+class Counter(models.Model):
+    # Named counters shared by every worker and host, e.g. the data versions
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+
+class ThrottleCounter(models.Model):
+    # The requests of a client in its current throttle window
+    key = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.BigIntegerField(db_index=True)
+    requests = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.key}={self.requests}"
@@ -1,8 +1,183 @@
+import base64
+import json
+from datetime import datetime
+from functools import partial
+
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    ordering = ("-updated_at", "-id")
+    cursor_query_param = settings.REST_FRAMEWORK_PAGINATION["CURSOR_QUERY_PARAM"]
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size, page_query_param):
+        self.page_size = page_size
+        self.page_query_param = page_query_param
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_results(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_results([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor["reverse"])
+        queryset = queryset.order_by(*self.ordering)
+        if self.cursor:
+            updated_at, pk = self.cursor["updated_at"], self.cursor["id"]
+            # The first condition is an index range on (updated_at, id); the
+            # second one only discards the rows that tie on updated_at.
+            if self.reverse:
+                queryset = queryset.filter(
+                    Q(updated_at__gte=updated_at)
+                    & (Q(updated_at__gt=updated_at) | Q(pk__gt=pk))
+                ).reverse()
+            else:
+                queryset = queryset.filter(
+                    Q(updated_at__lte=updated_at)
+                    & (Q(updated_at__lt=updated_at) | Q(pk__lt=pk))
+                )
+        return queryset[: self.page_size + 1]
+
+    def set_results(self, results):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.results = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.results:
+            return None
+        return self.encode_cursor(self.results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.results:
+            return None
+        return self.encode_cursor(self.results[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        if isinstance(instance, dict):
+            updated_at, pk = instance["updated_at"], instance["pk"]
+        else:
+            updated_at, pk = instance.updated_at, instance.pk
+        token = json.dumps(
+            {
+                "updated_at": updated_at.isoformat(),
+                "id": str(pk),
+                "reverse": reverse,
+            }
+        )
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(token.encode()).decode(),
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+            cursor["updated_at"] = datetime.fromisoformat(cursor["updated_at"])
+            cursor["reverse"] = bool(cursor.get("reverse"))
+            cursor["id"] = str(cursor["id"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+
+class CountedPaginator(Paginator):
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            # Replaces the cached property, so the rows are not counted again
+            self.count = count
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = settings.REST_FRAMEWORK_PAGINATION["DEFAULT_PAGE_SIZE"]
     page_query_param = settings.REST_FRAMEWORK_PAGINATION["DEFAULT_PAGE_QUERY_PARAM"]
+    page_size_query_param = settings.REST_FRAMEWORK_PAGINATION["PAGE_SIZE_QUERY_PARAM"]
     max_page_size = settings.REST_FRAMEWORK_PAGINATION["MAX_PAGE_SIZE"]
+    mode_query_param = settings.REST_FRAMEWORK_PAGINATION["MODE_QUERY_PARAM"]
+
+    def uses_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.uses_keyset(request):
+            self.keyset = KeysetPagination(
+                self.get_page_size(request), self.page_query_param
+            )
+            return self.keyset.paginate_queryset(queryset, request, view)
+        # Counted by the view already, see ConditionalMixin
+        self.django_paginator_class = partial(
+            CountedPaginator, count=getattr(view, "page_count", None)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.uses_keyset(request):
+            self.keyset = KeysetPagination(
+                self.get_page_size(request), self.page_query_param
+            )
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        count = getattr(view, "page_count", None)
+        if count is None:
+            count = await queryset.acount()
+        paginator = CountedPaginator(queryset, page_size, count=count)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.page.object_list = [item async for item in self.page.object_list]
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
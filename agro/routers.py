@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+_read_database = ContextVar("agro_read_database", default=None)
+
+
+@contextmanager
+def read_from(alias):
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+def has_replica():
+    return settings.READ_REPLICA["ALIAS"] in settings.DATABASES
+
+
+def get_read_database(request):
+    # A client that wrote recently keeps reading from the primary, so it
+    # never sees the replica lag behind its own writes.
+    if not has_replica() or request.method not in SAFE_METHODS:
+        return None
+    if settings.READ_REPLICA["STICKY_COOKIE"] in request.COOKIES:
+        return None
+    return settings.READ_REPLICA["ALIAS"]
+
+
+class ReplicaRouter:
+    # Reads use the replica only inside `read_from`, which the agro views
+    # enter for safe-method requests; everything else uses the primary.
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        # Never None: Django would then write an instance back to the
+        # database it was read from, the replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
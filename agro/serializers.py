@@ -1,26 +1,131 @@
+from django.conf import settings
 from django.db import IntegrityError
 from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject, RelatedField
 
+from .business.crop_types import get_crop_types_with
+from .business.documents import clean_cpf_cnpj
 from .business.validators import validate_total_area
 from .constants import STATE_CHOICES
 from .models import Crop, CropType, Farm, Farmer
-from .utils import validate_cpf_cnpj
 
 
-class FarmerSerializer(serializers.ModelSerializer):
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, fieldset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fieldset = fieldset
+
+    def get_fieldset(self):
+        if self.fieldset is not None:
+            return self.fieldset
+        return self.context.get("fieldset")
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return fields
+        for name, field in list(fields.items()):
+            if field.write_only:
+                continue
+            if not fieldset.includes(name):
+                del fields[name]
+            elif isinstance(field, SparseFieldsetSerializer):
+                if fieldset.expands(name):
+                    field.fieldset = fieldset.nested(name)
+                else:
+                    fields[name] = serializers.PrimaryKeyRelatedField(
+                        read_only=True, source=field.source
+                    )
+        return fields
+
+    def get_fieldset_names(self):
+        # Every readable field, before the fieldset drops any of them
+        return {
+            name: (
+                field.get_fieldset_names()
+                if isinstance(field, SparseFieldsetSerializer)
+                else {}
+            )
+            for name, field in super().get_fields().items()
+            if not field.write_only
+        }
+
+    def get_query_plan(self, prefix=""):
+        only, related = [], []
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            source = prefix + field.source.replace(".", "__")
+            only.append(source)
+            if isinstance(field, SparseFieldsetSerializer):
+                related.append(source)
+                nested_only, nested_related = field.get_query_plan(f"{source}__")
+                only.extend(nested_only)
+                related.extend(nested_related)
+        return only, related
+
+    def get_row_mapper(self, prefix=""):
+        # Builds the same representation as to_representation() from a
+        # values() row, without model instances or per-row field lookups.
+        lookups, mappers = [], []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            lookup = prefix + field.source.replace(".", "__")
+            if isinstance(field, SparseFieldsetSerializer):
+                nested_lookups, map_nested = field.get_row_mapper(f"{lookup}__")
+                lookups.extend(nested_lookups)
+                mappers.append((name, None, map_nested))
+                continue
+            lookups.append(lookup)
+            if isinstance(field, RelatedField):
+                mappers.append((name, lookup, _related_to_representation(field)))
+            else:
+                mappers.append((name, lookup, field.to_representation))
+
+        def map_row(row):
+            data = {}
+            for name, lookup, to_representation in mappers:
+                if lookup is None:
+                    data[name] = to_representation(row)
+                    continue
+                value = row[lookup]
+                data[name] = None if value is None else to_representation(value)
+            return data
+
+        return lookups, map_row
+
+
+def _related_to_representation(field):
+    def to_representation(value):
+        return field.to_representation(PKOnlyObject(pk=value))
+
+    return to_representation
+
+
+class FarmerSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Farmer
         fields = ["id", "cpf_cnpj", "name"]
         read_only_fields = ("id",)
 
     def validate_cpf_cnpj(self, value):
-        if not validate_cpf_cnpj(value):
+        cpf_cnpj = clean_cpf_cnpj(value)
+        if cpf_cnpj is None:
             raise serializers.ValidationError("Enter a valid CPF or CNPJ.")
-        cpf_cnpj_only_numbers = "".join(filter(str.isdigit, value))
-        return cpf_cnpj_only_numbers
+        return cpf_cnpj
+
+
+class DocumentValidationSerializer(serializers.Serializer):
+    documents = serializers.ListField(
+        child=serializers.CharField(allow_blank=True, trim_whitespace=False),
+        allow_empty=False,
+        max_length=settings.DOCUMENT_VALIDATION_MAX_DOCUMENTS,
+    )
 
 
-class FarmSerializer(serializers.ModelSerializer):
+class FarmSerializer(SparseFieldsetSerializer):
     farmer = FarmerSerializer(read_only=True)
     farmer_id = serializers.PrimaryKeyRelatedField(
         queryset=Farmer.objects.all(), write_only=True, source="farmer"
@@ -77,15 +182,87 @@ class FarmSerializer(serializers.ModelSerializer):
         return data
 
 
-class CropTypeSerializer(serializers.ModelSerializer):
+class BulkFarmSerializer(FarmSerializer):
+    farmer = None
+    farmer_id = None
+    crop_type_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+    class Meta(FarmSerializer.Meta):
+        fields = [
+            "name",
+            "city",
+            "state",
+            "total_area_hectares",
+            "arable_area_hectares",
+            "vegetation_area_hectares",
+            "crop_type_ids",
+        ]
+
+    def validate_crop_type_ids(self, value):
+        invalid_ids = set(value) - self.context["crop_type_ids"]
+        if invalid_ids:
+            raise serializers.ValidationError(
+                f"Invalid crop type ids: {sorted(invalid_ids)}."
+            )
+        return list(dict.fromkeys(value))
+
+
+class BulkFarmerSerializer(FarmerSerializer):
+    farms = BulkFarmSerializer(many=True, required=False, default=list)
+
+    class Meta(FarmerSerializer.Meta):
+        fields = ["cpf_cnpj", "name", "farms"]
+        # Uniqueness is checked once per batch instead of once per farmer
+        extra_kwargs = {"cpf_cnpj": {"validators": []}}
+
+
+class FarmCropTypesSerializer(serializers.Serializer):
+    crop_type_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+    def validate_crop_type_ids(self, value):
+        value = list(dict.fromkeys(value))
+        crop_types = get_crop_types_with(value)
+        invalid_ids = {
+            crop_type_id for crop_type_id in value if crop_type_id not in crop_types
+        }
+        if invalid_ids:
+            raise serializers.ValidationError(
+                f"Invalid crop type ids: {sorted(invalid_ids)}."
+            )
+        return value
+
+
+class FarmCropTypeSetSerializer(FarmCropTypesSerializer):
+    # The complete set of the farm, so an empty list removes every crop
+    crop_type_ids = serializers.ListField(child=serializers.IntegerField())
+
+
+class CropTypeField(serializers.PrimaryKeyRelatedField):
+    # Resolved from the crop type registry instead of a query per value
+    def to_internal_value(self, data):
+        try:
+            crop_type_id = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        crop_type = get_crop_types_with([crop_type_id]).get(crop_type_id)
+        if crop_type is None:
+            self.fail("does_not_exist", pk_value=data)
+        return crop_type
+
+
+class CropTypeSerializer(SparseFieldsetSerializer):
     class Meta:
         model = CropType
         fields = ["id", "name"]
 
 
-class CropSerializer(serializers.ModelSerializer):
+class CropSerializer(SparseFieldsetSerializer):
     crop_type = CropTypeSerializer(read_only=True)
-    crop_type_id = serializers.PrimaryKeyRelatedField(
+    crop_type_id = CropTypeField(
         queryset=CropType.objects.all(), source="crop_type", write_only=True
     )
     farm = FarmSerializer(read_only=True)
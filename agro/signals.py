@@ -0,0 +1,77 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .business.crop_types import CROP_TYPES_VERSION_KEY, forget_crop_types
+from .business.dashboard import AREA_FIELDS, record_crops, record_farms
+from .models import Crop, CropType, Farm, Farmer
+from .transactions import bump_data_version_on_commit, pending_changes
+
+
+def _get_previous_values(sender, instance, raw, using, fields):
+    if instance._state.adding and not raw:
+        return None
+    return sender.objects.using(using).filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=Farm)
+def store_previous_farm(sender, instance, raw, using, **kwargs):
+    instance._previous_values = _get_previous_values(
+        sender, instance, raw, using, ("state",) + AREA_FIELDS
+    )
+
+
+@receiver(post_save, sender=Farm)
+def update_farm_summary(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    record_farms(added=[instance], removed=[previous] if previous else [])
+
+
+# A cascade deletes its farms and crops one by one: they leave the summary
+# in one pass, when the transaction commits.
+@receiver(post_delete, sender=Farm)
+def remove_farm_summary(sender, instance, using, **kwargs):
+    with pending_changes(using) as changes:
+        changes.removed_farms.append(instance)
+
+
+@receiver(pre_save, sender=Crop)
+def store_previous_crop(sender, instance, raw, using, **kwargs):
+    instance._previous_values = _get_previous_values(
+        sender, instance, raw, using, ("crop_type_id",)
+    )
+
+
+@receiver(post_save, sender=Crop)
+def update_crop_summary(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    record_crops(
+        added=[instance.crop_type_id],
+        removed=[previous["crop_type_id"]] if previous else [],
+    )
+
+
+@receiver(post_delete, sender=Crop)
+def remove_crop_summary(sender, instance, using, **kwargs):
+    with pending_changes(using) as changes:
+        changes.removed_crops.append(instance.crop_type_id)
+
+
+@receiver(post_save, sender=Farmer)
+@receiver(post_save, sender=Farm)
+@receiver(post_save, sender=Crop)
+@receiver(post_save, sender=CropType)
+@receiver(post_delete, sender=Farmer)
+@receiver(post_delete, sender=Farm)
+@receiver(post_delete, sender=Crop)
+@receiver(post_delete, sender=CropType)
+def invalidate_data_version(sender, using, **kwargs):
+    # Once per transaction, however many rows a cascade deletes
+    bump_data_version_on_commit(using=using)
+
+
+@receiver(post_save, sender=CropType)
+@receiver(post_delete, sender=CropType)
+def invalidate_crop_types(sender, using, **kwargs):
+    # Reloaded right away in this process, and by the others once committed
+    forget_crop_types()
+    bump_data_version_on_commit(CROP_TYPES_VERSION_KEY, using=using)
@@ -0,0 +1,31 @@
+import json
+import sys
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(base, head):
+    lines = [
+        f"{base['commit']} -> {head['commit']} "
+        f"({head['farms']} farms on {head['database']})"
+    ]
+    for name, result in head["results"].items():
+        if name not in base["results"]:
+            lines.append(f"{name}: {result['median'] * 1000:.2f}ms (new)")
+            continue
+        before = base["results"][name]["median"]
+        after = result["median"]
+        lines.append(
+            f"{name}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms "
+            f"({(after - before) / before:+.1%})"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m agro.tests.benchmarks.compare BASE.json HEAD.json")
+    print(compare(load(sys.argv[1]), load(sys.argv[2])))
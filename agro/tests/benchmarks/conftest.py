@@ -0,0 +1,109 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from agro.business.seeding import seed
+
+VOLUME_SUFFIXES = {"k": 1000, "m": 1000000}
+
+
+def parse_volume(value):
+    value = value.strip().lower()
+    if value and value[-1] in VOLUME_SUFFIXES:
+        return int(float(value[:-1]) * VOLUME_SUFFIXES[value[-1]])
+    return int(value)
+
+
+BENCHMARK_FARMS = parse_volume(os.environ.get("BENCHMARK_FARMS", "1k"))
+BENCHMARK_ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", 5))
+BENCHMARK_RESULTS = os.environ.get(
+    "BENCHMARK_RESULTS", settings.BASE_DIR / "benchmark-results.json"
+)
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkResults:
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, function, rounds=BENCHMARK_ROUNDS, setup=None):
+        # One untimed call warms up imports, caches and the query planner
+        if setup:
+            setup()
+        result = function()
+        timings = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            started_at = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started_at)
+        self.results[name] = {
+            "rounds": rounds,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "max": max(timings),
+        }
+        return result
+
+    def write(self, path):
+        report = {
+            "commit": get_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "farms": BENCHMARK_FARMS,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "results": dict(sorted(self.results.items())),
+        }
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    results = BenchmarkResults()
+    yield results
+    if results.results:
+        results.write(BENCHMARK_RESULTS)
+
+
+@pytest.fixture(scope="session")
+def seeded_db(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        seed(BENCHMARK_FARMS)
+    yield BENCHMARK_FARMS
+    with django_db_blocker.unblock():
+        call_command("flush", interactive=False, verbosity=0)
+
+
+@pytest.fixture
+def api_client(seeded_db, db, monkeypatch):
+    # Measure the views, not the anonymous rate limit of production settings
+    monkeypatch.setattr(APIView, "throttle_classes", ())
+    return APIClient()
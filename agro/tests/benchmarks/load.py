@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVERS = {
+    "wsgi": ["--worker-class", "sync", "brain_ag_teste.wsgi"],
+    "asgi": ["--worker-class", "uvicorn.workers.UvicornWorker", "brain_ag_teste.asgi"],
+}
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, workers, env=None):
+    return subprocess.Popen(
+        ["gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+        + SERVERS[mode],
+        cwd=BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def stop_server(server):
+    os.killpg(server.pid, signal.SIGTERM)
+    server.wait(timeout=30)
+
+
+def get_rss_mb(pid):
+    # The gunicorn master and its workers, from /proc (Linux only)
+    pids = [pid]
+    children = Path(f"/proc/{pid}/task/{pid}/children")
+    if children.exists():
+        pids += [int(child) for child in children.read_text().split()]
+    rss_kb = 0
+    for process in pids:
+        for line in Path(f"/proc/{process}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss_kb += int(line.split()[1])
+    return rss_kb / 1024
+
+
+async def request(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+        "Accept: application/json\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(response.split(b" ", 2)[1])
+
+
+async def wait_until_ready(port, path, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if await request(port, path) == 200:
+                return
+        except (OSError, IndexError, ValueError):
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not answer {path}")
+
+
+async def run_load(port, paths, concurrency, duration):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+
+    async def user(index):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started_at = time.perf_counter()
+            try:
+                status = await request(port, path)
+            except OSError:
+                status = None
+            if status == 200:
+                latencies.append(time.perf_counter() - started_at)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(user(index) for index in range(concurrency)))
+    return latencies, errors
+
+
+def measure(mode, paths, workers, concurrency, duration, env=None):
+    port = get_free_port()
+    server = start_server(mode, port, workers, env)
+    try:
+        asyncio.run(wait_until_ready(port, paths[0]))
+        # Warm up every worker before measuring
+        asyncio.run(run_load(port, paths, concurrency, 1))
+        latencies, errors = asyncio.run(run_load(port, paths, concurrency, duration))
+        if server.poll() is not None:
+            raise RuntimeError(f"The {mode} server exited during the load test")
+        rss_mb = get_rss_mb(server.pid)
+    finally:
+        stop_server(server)
+    quantiles = statistics.quantiles(latencies, n=100) if latencies else [0] * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "rss_mb": round(rss_mb, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare the throughput of the sync and async workers"
+    )
+    parser.add_argument(
+        "--paths", nargs="+", default=["/dashboard/", "/farms/", "/crops/"]
+    )
+    parser.add_argument("--modes", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--output", default=BASE_DIR / "load-results.json")
+    args = parser.parse_args(argv)
+    results = {
+        mode: measure(mode, args.paths, args.workers, args.concurrency, args.duration)
+        for mode in args.modes
+    }
+    for mode, result in results.items():
+        print(
+            f"{mode}: {result['requests_per_second']} req/s, "
+            f"p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, "
+            f"p99 {result['p99_ms']}ms, {result['errors']} errors, "
+            f"{result['rss_mb']}MB RSS ({args.workers} workers)"
+        )
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "paths": args.paths,
+                "workers": args.workers,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import json
+import os
+import sys
+
+from .load import BASE_DIR, SERVERS, measure
+
+VARIANTS = {
+    "per-request": {"DATABASE_POOL": "False", "DATABASE_CONN_MAX_AGE": "0"},
+    "persistent": {"DATABASE_POOL": "False", "DATABASE_CONN_MAX_AGE": "60"},
+    "pool": {"DATABASE_POOL": "True", "DATABASE_CONN_MAX_AGE": "0"},
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare the latency with and without database connection reuse"
+    )
+    parser.add_argument("--paths", nargs="+", default=["/farms/"])
+    parser.add_argument(
+        "--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS)
+    )
+    parser.add_argument("--mode", choices=SERVERS, default="wsgi")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--output", default=BASE_DIR / "pool-results.json")
+    args = parser.parse_args(argv)
+    if not os.environ.get("DATABASE_URL", "").startswith("postgres"):
+        parser.error("set DATABASE_URL to a Postgres database")
+    results = {
+        variant: measure(
+            args.mode,
+            args.paths,
+            args.workers,
+            args.concurrency,
+            args.duration,
+            env={**os.environ, **VARIANTS[variant]},
+        )
+        for variant in args.variants
+    }
+    for variant, result in results.items():
+        print(
+            f"{variant}: p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms, "
+            f"{result['requests_per_second']} req/s, {result['errors']} errors"
+        )
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "paths": args.paths,
+                "mode": args.mode,
+                "workers": args.workers,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
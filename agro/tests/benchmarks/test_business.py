@@ -0,0 +1,89 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from agro.business.crops import get_farms_with_crops
+from agro.business.dashboard import (
+    calculate_dashboard_data,
+    get_dashboard_data,
+    rebuild_dashboard_summary,
+)
+from agro.models import Crop, Farm, Farmer
+from agro.serializers import CropSerializer, FarmerSerializer, FarmSerializer
+from agro.views import CropTypeViewSet, FarmerViewSet, FarmViewSet
+
+PAGE_SIZE = 100
+
+
+@pytest.mark.benchmark
+def test_dashboard_business_benchmark(seeded_db, db, benchmark_results):
+    summary = benchmark_results.measure("get_dashboard_data", get_dashboard_data)
+    live = benchmark_results.measure(
+        "calculate_dashboard_data", calculate_dashboard_data
+    )
+    assert summary["farm_count"] == live["farm_count"]
+    benchmark_results.measure(
+        "rebuild_dashboard_summary", rebuild_dashboard_summary, rounds=1
+    )
+
+
+@pytest.mark.benchmark
+def test_farms_with_crops_benchmark(seeded_db, db, benchmark_results):
+    farms = benchmark_results.measure(
+        "get_farms_with_crops (page)",
+        lambda: list(get_farms_with_crops()[:PAGE_SIZE]),
+    )
+    assert len(farms) <= PAGE_SIZE
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "serializer_class, queryset",
+    [
+        (FarmerSerializer, Farmer.objects.order_by("-updated_at")),
+        (FarmSerializer, Farm.objects.select_related("farmer").order_by("-updated_at")),
+        (
+            CropSerializer,
+            Crop.objects.select_related("farm__farmer", "crop_type").order_by(
+                "-updated_at"
+            ),
+        ),
+    ],
+)
+def test_serializer_benchmark(
+    seeded_db, db, benchmark_results, serializer_class, queryset
+):
+    instances = list(queryset[:PAGE_SIZE])
+    data = benchmark_results.measure(
+        f"{serializer_class.__name__}(many=True).data",
+        lambda: serializer_class(instances, many=True).data,
+    )
+    assert len(data) == len(instances)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "viewset, timed",
+    [(FarmerViewSet, True), (FarmViewSet, True), (CropTypeViewSet, False)],
+    ids=["FarmerViewSet", "FarmViewSet", "CropTypeViewSet"],
+)
+def test_values_list_benchmark(seeded_db, db, benchmark_results, viewset, timed):
+    serializer_class = viewset.serializer_class
+    queryset = viewset.queryset
+    lookups, map_row = serializer_class().get_row_mapper()
+    instances = benchmark_results.measure(
+        f"{serializer_class.__name__} instances (1k rows)",
+        lambda: serializer_class(queryset[:1000], many=True).data,
+    )
+    rows = benchmark_results.measure(
+        f"{serializer_class.__name__} values() rows (1k rows)",
+        lambda: [map_row(row) for row in queryset.values(*lookups)[:1000]],
+    )
+    assert JSONRenderer().render(rows) == JSONRenderer().render(instances)
+    if not timed:
+        # A handful of seeded crop types take microseconds either way
+        return
+    results = benchmark_results.results
+    assert (
+        results[f"{serializer_class.__name__} values() rows (1k rows)"]["median"]
+        < results[f"{serializer_class.__name__} instances (1k rows)"]["median"]
+    )
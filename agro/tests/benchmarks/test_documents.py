@@ -0,0 +1,32 @@
+import pytest
+
+from agro.business.documents import clean_cpf_cnpj, validate_cpf_cnpj_batch
+
+from ..test_business.test_documents import random_documents, validate_with_docbr
+
+
+@pytest.mark.benchmark
+def test_document_validation_benchmark(benchmark_results):
+    documents = random_documents(30000)
+    expected = benchmark_results.measure(
+        "validate_docbr (90k documents)",
+        lambda: [validate_with_docbr(value) for value in documents],
+        rounds=1,
+    )
+    single = benchmark_results.measure(
+        "clean_cpf_cnpj (90k documents)",
+        lambda: [clean_cpf_cnpj(value) is not None for value in documents],
+        rounds=1,
+    )
+    batch = benchmark_results.measure(
+        "validate_cpf_cnpj_batch (90k documents)",
+        lambda: validate_cpf_cnpj_batch(documents),
+        rounds=1,
+    )
+    assert single == expected
+    assert batch == expected
+    results = benchmark_results.results
+    assert (
+        results["validate_cpf_cnpj_batch (90k documents)"]["min"]
+        < results["validate_docbr (90k documents)"]["min"]
+    )
@@ -0,0 +1,54 @@
+import pytest
+from django.urls import reverse
+
+from agro.cache import bump_data_version
+from agro.models import Farm
+from agro.urls import router
+
+ENDPOINTS = [
+    (basename, viewset.queryset.model) for _, viewset, basename in router.registry
+]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("basename, model", ENDPOINTS)
+def test_list_benchmark(api_client, benchmark_results, basename, model):
+    url = reverse(f"{basename}-list")
+    response = benchmark_results.measure(f"GET {url}", lambda: api_client.get(url))
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("basename, model", ENDPOINTS)
+def test_list_cursor_benchmark(api_client, benchmark_results, basename, model):
+    url = reverse(f"{basename}-list")
+    response = benchmark_results.measure(
+        f"GET {url}?pagination=cursor&page_size=100",
+        lambda: api_client.get(url, {"pagination": "cursor", "page_size": 100}),
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("basename, model", ENDPOINTS)
+def test_detail_benchmark(api_client, benchmark_results, basename, model):
+    instance = model.objects.order_by("pk").first()
+    url = reverse(f"{basename}-detail", args=[instance.pk])
+    response = benchmark_results.measure(
+        f"GET {reverse(f'{basename}-list')}{{id}}/", lambda: api_client.get(url)
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark
+def test_dashboard_benchmark(api_client, benchmark_results):
+    url = reverse("dashboard")
+    response = benchmark_results.measure(
+        f"GET {url} (cold)", lambda: api_client.get(url), setup=bump_data_version
+    )
+    assert response.status_code == 200
+    response = benchmark_results.measure(
+        f"GET {url} (cached)", lambda: api_client.get(url)
+    )
+    assert response.status_code == 200
+    assert response.data["farm_count"] == Farm.objects.count()
@@ -0,0 +1,31 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from agro.business.dashboard import get_dashboard_data
+from agro.renderers import MessagePackRenderer, ORJSONRenderer
+from agro.serializers import FarmSerializer
+from agro.views import FarmViewSet
+
+RENDERERS = [JSONRenderer, ORJSONRenderer, MessagePackRenderer]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("payload", ["farms (1k rows)", "dashboard"])
+def test_renderer_benchmark(seeded_db, db, benchmark_results, payload):
+    if payload == "dashboard":
+        data = get_dashboard_data()
+    else:
+        data = FarmSerializer(FarmViewSet.queryset[:1000], many=True).data
+    rendered = {}
+    for renderer_class in RENDERERS:
+        name = f"{renderer_class.__name__} {payload}"
+        rendered[renderer_class] = benchmark_results.measure(
+            name, lambda: renderer_class().render(data)
+        )
+        benchmark_results.results[name]["bytes"] = len(rendered[renderer_class])
+    assert rendered[ORJSONRenderer] == rendered[JSONRenderer]
+    results = benchmark_results.results
+    assert (
+        results[f"ORJSONRenderer {payload}"]["median"]
+        < results[f"JSONRenderer {payload}"]["median"]
+    )
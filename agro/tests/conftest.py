@@ -1,4 +1,9 @@
+from contextlib import contextmanager
+
 import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
 
 from agro.models import CropType, Farm, Farmer
 
@@ -47,6 +52,29 @@ def create_crop_types(db):
     return crop_types
 
 
+@pytest.fixture
+def run_on_commit(django_capture_on_commit_callbacks):
+    # The block gets a savepoint of its own: the writes made before it in the
+    # test transaction registered a callback that is reused, and never runs.
+    @contextmanager
+    def run_on_commit():
+        with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+            yield
+
+    return run_on_commit
+
+
 @pytest.fixture
 def fake_id():
     return "01234567-8901-2345-6789-012345678901-XYZ"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    caches[settings.AGRO_CACHE_ALIAS].clear()
+
+
+@pytest.fixture(autouse=True)
+def read_from_primary(settings):
+    # The suite runs on the test primary, even with a replica configured
+    settings.READ_REPLICA = {**settings.READ_REPLICA, "ALIAS": None}
@@ -0,0 +1,87 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from agro.business.crop_types import (
+    aget_crop_types,
+    bump_crop_types_version,
+    get_crop_types,
+    get_crop_types_with,
+)
+from agro.models import CropType
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_get_crop_types(django_assert_num_queries, create_crop_types):
+    soja, milho = create_crop_types
+    bump_crop_types_version()
+    # The version, then the rows
+    with django_assert_num_queries(2):
+        crop_types = get_crop_types()
+        assert get_crop_types() is crop_types
+    assert crop_types.names == {soja.id: "Soja", milho.id: "Milho"}
+    assert crop_types.updated_at == max(soja.updated_at, milho.updated_at)
+    assert crop_types.get_data([milho.id, soja.id]) == [
+        {"id": soja.id, "name": "Soja"},
+        {"id": milho.id, "name": "Milho"},
+    ]
+    crop_type = crop_types.get(soja.id)
+    assert crop_type == soja
+    assert crop_type.name == "Soja"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_aget_crop_types(create_crop_types):
+    crop_types = async_to_sync(aget_crop_types)()
+    assert set(crop_types.names.values()) == {"Soja", "Milho"}
+    assert async_to_sync(aget_crop_types)() is crop_types
+
+
+@pytest.mark.django_db
+def test_crop_types_follow_writes(create_crop_types):
+    soja, milho = create_crop_types
+    get_crop_types()
+    # Written in this process
+    algodao = CropType.objects.create(name="Algodão")
+    milho.delete()
+    assert set(get_crop_types().names.values()) == {"Soja", "Algodão"}
+    # Written by another process, which only bumps the shared version
+    CropType.objects.filter(pk=soja.pk).update(name="Soja orgânica")
+    bump_crop_types_version()
+    assert get_crop_types().names[soja.id] == "Soja"
+    assert get_crop_types(refresh=True).names == {
+        soja.id: "Soja orgânica",
+        algodao.id: "Algodão",
+    }
+
+
+@pytest.mark.django_db
+def test_crop_types_checked_after_timeout(settings, create_crop_types):
+    soja, _ = create_crop_types
+    get_crop_types()
+    CropType.objects.filter(pk=soja.pk).update(name="Soja orgânica")
+    bump_crop_types_version()
+    settings.CROP_TYPES_TIMEOUT = 0
+    assert get_crop_types().names[soja.id] == "Soja orgânica"
+
+
+@pytest.mark.django_db
+def test_get_crop_types_with_unknown_id(django_assert_num_queries, create_crop_types):
+    soja, _ = create_crop_types
+    crop_types = get_crop_types()
+    with django_assert_num_queries(0):
+        assert get_crop_types_with([soja.id]) is crop_types
+    # Created by another process
+    CropType.objects.bulk_create([CropType(name="Algodão")])
+    algodao = CropType.objects.get(name="Algodão")
+    bump_crop_types_version()
+    assert algodao.id in get_crop_types_with([soja.id, algodao.id])
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_unknown_crop_type(create_crop_types):
+    crop_types = get_crop_types()
+    assert crop_types.get(0) is None
+    assert 0 not in crop_types
+    assert crop_types.get_data([0]) == []
@@ -0,0 +1,101 @@
+import pytest
+
+from agro.business import crops
+from agro.business.crop_types import get_crop_types
+from agro.business.crops import (
+    add_crop_types,
+    get_crop_types_data,
+    get_farms_with_crops,
+    set_crop_types,
+)
+from agro.business.dashboard import calculate_dashboard_data, get_dashboard_data
+from agro.models import Crop, CropType
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_get_farms_with_crops(create_farms, create_crop_types):
+    farm1, farm2 = create_farms
+    crop_type1, crop_type2 = create_crop_types
+    Crop.objects.create(farm=farm1, crop_type=crop_type1)
+    crop = Crop.objects.create(farm=farm1, crop_type=crop_type2)
+    farms = list(get_farms_with_crops())
+    assert farms == [farm1]
+    assert farms[0].crop_id == crop.id
+    assert get_crop_types_data(farms[0], get_crop_types()) == [
+        {"id": crop_type1.id, "name": crop_type1.name},
+        {"id": crop_type2.id, "name": crop_type2.name},
+    ]
+
+
+@pytest.mark.django_db
+def test_get_farms_with_crops_filtered_by_crops(create_farms, create_crop_types):
+    farm1, farm2 = create_farms
+    crop_type1, crop_type2 = create_crop_types
+    Crop.objects.create(farm=farm1, crop_type=crop_type1)
+    crop = Crop.objects.create(farm=farm2, crop_type=crop_type2)
+    Crop.objects.create(farm=farm2, crop_type=crop_type1)
+    farms = list(get_farms_with_crops(Crop.objects.filter(crop_type=crop_type2)))
+    assert farms == [farm2]
+    # Only the crops of the filter
+    assert farms[0].crop_id == crop.id
+    assert farms[0].crop_type_ids == [crop_type2.id]
+
+
+@pytest.mark.django_db
+def test_set_crop_types(create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop_type1, crop_type2 = create_crop_types
+    Crop.objects.create(farm=farm, crop_type=crop_type1)
+    assert set_crop_types(farm, [crop_type2.id]) == ([crop_type2.id], [crop_type1.id])
+    assert list(farm.crops.values_list("crop_type_id", flat=True)) == [crop_type2.id]
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_set_crop_types_replace_query_count(
+    django_assert_num_queries, django_capture_on_commit_callbacks, create_farms
+):
+    farm1, farm2 = create_farms
+    crop_types = [CropType.objects.create(name=f"Tipo {index}") for index in range(10)]
+    for crop_type in crop_types[:5]:
+        Crop.objects.create(farm=farm1, crop_type=crop_type)
+    for crop_type in crop_types[5:]:
+        Crop.objects.create(farm=farm2, crop_type=crop_type)
+    new_ids = [crop_type.id for crop_type in crop_types[5:]]
+    # The savepoint, the farm lock and its crop types, the DELETE, the INSERT,
+    # a single summary UPDATE and the release of the savepoint
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_num_queries(7):
+            added, removed = set_crop_types(farm1, new_ids)
+    assert added == new_ids
+    assert removed == sorted(crop_type.id for crop_type in crop_types[:5])
+    assert len(callbacks) == 1
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+# Edge/corner/boundary cases
+@pytest.mark.django_db
+def test_add_crop_types_concurrent_insert(monkeypatch, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop_type1, crop_type2 = create_crop_types
+    Crop.objects.create(farm=farm, crop_type=crop_type1)
+    # As if a POST /crops/ inserted it after the crop types were read
+    monkeypatch.setattr(crops, "_lock_crop_types", lambda farm: set())
+    added = add_crop_types(farm, [crop_type1.id, crop_type2.id])
+    assert added == [crop_type2.id]
+    assert farm.crops.count() == 2
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_get_farms_with_crops_query_count(
+    django_assert_num_queries, create_farms, create_crop_types
+):
+    for farm in create_farms:
+        for crop_type in create_crop_types:
+            Crop.objects.create(farm=farm, crop_type=crop_type)
+    with django_assert_num_queries(1):
+        farms = list(get_farms_with_crops())
+    assert len(farms) == len(create_farms)
+    assert all(len(get_crop_types_data(farm, get_crop_types())) == 2 for farm in farms)
@@ -1,8 +1,17 @@
 import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 
-from agro.business.dashboard import get_dashboard_data
+from agro.business.crop_types import get_crop_types
+from agro.business.dashboard import (
+    calculate_dashboard_data,
+    get_cached_dashboard_data,
+    get_dashboard_data,
+    rebuild_dashboard_summary,
+)
+from agro.cache import bump_data_version, get_data_version
 from agro.constants import STATE_CHOICES
-from agro.models import Crop, Farm
+from agro.models import Crop, DashboardSummary, Farm
 
 
 # Positive cases
@@ -102,3 +111,96 @@ def test_get_dashboard_data_with_farms_in_all_states(create_farmers):
         assert any(
             farm["state"] == state[0] for farm in dashboard_data["count_by_state"]
         )
+
+
+@pytest.mark.django_db
+def test_get_dashboard_data_single_query(
+    django_assert_num_queries, create_farms, create_crop_types
+):
+    Crop.objects.create(farm=create_farms[0], crop_type=create_crop_types[0])
+    # The crop type names come from the registry, loaded once per process;
+    # only their version is checked again.
+    get_crop_types()
+    with django_assert_num_queries(2):
+        get_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_dashboard_summary_follows_updates_and_deletes(
+    run_on_commit, create_farms, create_crop_types
+):
+    farm1, farm2 = create_farms
+    crop_type1, crop_type2 = create_crop_types
+    crop = Crop.objects.create(farm=farm1, crop_type=crop_type1)
+    Crop.objects.create(farm=farm2, crop_type=crop_type1)
+    farm1.state = "SP"
+    farm1.total_area_hectares = 500
+    farm1.save()
+    crop.crop_type = crop_type2
+    crop.save()
+    assert get_dashboard_data() == calculate_dashboard_data()
+    # Deletes leave the summary when their transaction commits
+    with run_on_commit():
+        farm2.farmer.delete()
+        crop_type2.delete()
+    dashboard_data = get_dashboard_data()
+    assert dashboard_data == calculate_dashboard_data()
+    assert dashboard_data["farm_count"] == 1
+    assert dashboard_data["count_by_state"] == [{"state": "SP", "total": 1}]
+    assert dashboard_data["farm_count_by_crop"] == []
+
+
+@pytest.mark.django_db
+def test_dashboard_summary_cascading_delete(
+    django_capture_on_commit_callbacks, create_farms, create_crop_types
+):
+    farmer = create_farms[0].farmer
+    for state in ("SP", "SP", "GO"):
+        Farm.objects.create(
+            name="Fazenda Nova",
+            farmer=farmer,
+            city="Cidade",
+            state=state,
+            total_area_hectares=300,
+            arable_area_hectares=200,
+            vegetation_area_hectares=100,
+        )
+    for farm in farmer.farms.all():
+        for crop_type in create_crop_types:
+            Crop.objects.create(farm=farm, crop_type=crop_type)
+    with django_capture_on_commit_callbacks() as callbacks:
+        with CaptureQueriesContext(connection) as deleted:
+            with transaction.atomic():
+                farmer.delete()
+    with CaptureQueriesContext(connection) as committed:
+        for callback in callbacks:
+            callback()
+    summary_table = DashboardSummary._meta.db_table
+    assert not any(summary_table in query["sql"] for query in deleted)
+    # The total, the states BA, SP and GO, then every crop type at once
+    assert [
+        query["sql"].startswith("UPDATE")
+        for query in committed
+        if summary_table in query["sql"]
+    ] == [True] * 5
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_rebuild_dashboard_summary(create_farms, create_crop_types):
+    Crop.objects.create(farm=create_farms[0], crop_type=create_crop_types[0])
+    expected = calculate_dashboard_data()
+    DashboardSummary.objects.all().delete()
+    assert get_dashboard_data()["farm_count"] == 0
+    rebuild_dashboard_summary()
+    assert get_dashboard_data() == expected
+
+
+@pytest.mark.django_db
+def test_get_cached_dashboard_data_keyed_on_data_version(run_on_commit, create_farms):
+    version = get_data_version()
+    assert get_cached_dashboard_data()["farm_count"] == 2
+    with run_on_commit():
+        create_farms[0].delete()
+    assert get_cached_dashboard_data(version)["farm_count"] == 2
+    assert get_cached_dashboard_data(bump_data_version())["farm_count"] == 1
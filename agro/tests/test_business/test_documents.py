@@ -0,0 +1,72 @@
+import random
+
+import pytest
+from validate_docbr import CNPJ, CPF
+
+from agro.business.documents import (
+    VECTORIZE_THRESHOLD,
+    clean_cpf_cnpj,
+    validate_cpf_cnpj_batch,
+)
+
+
+def validate_with_docbr(value):
+    if value:
+        cpf_cnpj = "".join(filter(str.isdigit, value))
+        if len(cpf_cnpj) == 11:
+            return CPF().validate(cpf_cnpj)
+        elif len(cpf_cnpj) == 14:
+            return CNPJ().validate(cpf_cnpj)
+    return False
+
+
+def random_documents(size, seed=42):
+    randomizer = random.Random(seed)
+    documents = []
+    for _ in range(size):
+        documents.append(CPF().generate(mask=randomizer.random() < 0.5))
+        documents.append(CNPJ().generate(mask=randomizer.random() < 0.5))
+        length = randomizer.choice([11, 14])
+        documents.append("".join(randomizer.choices("0123456789", k=length)))
+    return documents + ["11111111111", "22222222222222", "", "abc", "1" * 12]
+
+
+# Positive cases
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("951.810.400-04", "95181040004"),
+        ("77.759.188/0001-80", "77759188000180"),
+    ],
+)
+def test_clean_cpf_cnpj(value, expected):
+    assert clean_cpf_cnpj(value) == expected
+
+
+def test_validation_matches_validate_docbr():
+    documents = random_documents(2000)
+    expected = [validate_with_docbr(document) for document in documents]
+    assert any(expected) and not all(expected)
+    assert [clean_cpf_cnpj(document) is not None for document in documents] == expected
+    assert validate_cpf_cnpj_batch(documents) == expected
+
+
+# Negative cases
+@pytest.mark.parametrize("value", [None, "", "951.810.400-99", "12345678901234"])
+def test_clean_cpf_cnpj_with_invalid_values(value):
+    assert clean_cpf_cnpj(value) is None
+
+
+# Edge/corner/boundary cases
+def test_validate_cpf_cnpj_batch_small_and_large_batches():
+    documents = ["95181040004", "95181040099", "77759188000180", None]
+    assert validate_cpf_cnpj_batch(documents) == [True, False, True, False]
+    large = documents * VECTORIZE_THRESHOLD
+    assert validate_cpf_cnpj_batch(large) == [True, False, True, False] * (
+        VECTORIZE_THRESHOLD
+    )
+
+
+def test_validate_cpf_cnpj_batch_with_non_ascii_digits():
+    documents = ["٩٥١٨١٠٤٠٠٠٤", "9518104000²"] * VECTORIZE_THRESHOLD
+    assert validate_cpf_cnpj_batch(documents) == [False, False] * VECTORIZE_THRESHOLD
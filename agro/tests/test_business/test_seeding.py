@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from validate_docbr import CNPJ, CPF
+
+from agro.business.seeding import (
+    CPF_MULTIPLIER,
+    NEXT_NUMBER_KEY,
+    Seeder,
+    make_cnpj,
+    make_cpf,
+    make_document,
+    seed,
+)
+from agro.business.validators import validate_total_area
+from agro.constants import STATE_CHOICES
+from agro.models import Counter, Crop, DashboardSummary, Farm, Farmer
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_seed(create_farmers):
+    created = seed(21, days=30)
+    assert created["farmers"] == Farmer.objects.count() - 2 == 11
+    assert created["farms"] == Farm.objects.count() == 21
+    assert created["crops"] == Crop.objects.count()
+    for document in Farmer.objects.values_list("cpf_cnpj", flat=True):
+        assert CPF().validate(document) or CNPJ().validate(document)
+    states = {state for state, _ in STATE_CHOICES}
+    since = timezone.now() - timedelta(days=30)
+    for farm in Farm.objects.select_related("farmer"):
+        assert validate_total_area(farm.__dict__)
+        assert farm.state in states
+        assert since <= farm.farmer.created_at <= farm.created_at <= farm.updated_at
+    total = DashboardSummary.objects.get(dimension=DashboardSummary.TOTAL)
+    assert total.farm_count == 21
+
+
+@pytest.mark.django_db
+def test_seed_again():
+    seed(10)
+    seed(10)
+    assert Farm.objects.count() == 20
+    assert Farmer.objects.values("cpf_cnpj").distinct().count() == 10
+
+
+@pytest.mark.django_db
+def test_seed_again_after_deletes():
+    seed(10)
+    Farmer.objects.filter(pk__in=Farmer.objects.values("pk")[:3]).delete()
+    seed(10)
+    assert Farmer.objects.count() == 7
+    assert Counter.objects.get(key=NEXT_NUMBER_KEY).value == 10
+
+
+@pytest.mark.django_db
+def test_seed_skips_existing_documents():
+    seed(4, batch_size=1)
+    # The documents of the next two numbers, either kind
+    for number in (2, 3):
+        for company in (False, True):
+            Farmer.objects.create(
+                name="Ana", cpf_cnpj=make_document(number, company=company)
+            )
+    created = seed(4, batch_size=1)
+    assert created["farmers"] == 2
+    assert Farmer.objects.values("cpf_cnpj").distinct().count() == 8
+    assert Counter.objects.get(key=NEXT_NUMBER_KEY).value == 6
+
+
+def test_seed_is_reproducible():
+    farmers = [Seeder(10, seed=7).make_farmer(number) for number in (0, 0)]
+    assert farmers[0]["id"] == farmers[1]["id"]
+    assert farmers[0]["cpf_cnpj"] == farmers[1]["cpf_cnpj"]
+    assert farmers[0]["name"] == farmers[1]["name"]
+    assert Seeder(10, seed=8).make_farmer(0)["id"] != farmers[0]["id"]
+
+
+def test_make_documents():
+    assert CPF().validate(make_cpf(123456789))
+    assert CNPJ().validate(make_cnpj(12345678))
+    assert make_cpf(123456789) == "12345678909"
+
+
+# Edge/corner/boundary cases
+def test_make_document_repeated_digits():
+    # The number whose CPF would be 111.111.111-11
+    number = 111111111 * pow(CPF_MULTIPLIER, -1, 10**9) % 10**9
+    assert make_cpf(number * CPF_MULTIPLIER) == "11111111111"
+    assert CNPJ().validate(make_document(number, company=False))
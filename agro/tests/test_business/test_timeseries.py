@@ -0,0 +1,139 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from agro.business.timeseries import (
+    MAX_PERIODS,
+    _get_rows,
+    get_period_range,
+    get_timeseries,
+)
+from agro.models import Farm, Farmer
+from agro.tests.test_filters import explain
+
+
+@pytest.fixture
+def dated_farms(create_farms):
+    farm1, farm2 = create_farms
+    # 02:00 UTC on March 1st is still February 29th in São Paulo
+    Farm.objects.filter(pk=farm1.pk).update(
+        created_at=datetime(2024, 3, 1, 2, tzinfo=timezone.utc)
+    )
+    Farm.objects.filter(pk=farm2.pk).update(
+        created_at=datetime(2024, 4, 10, 15, tzinfo=timezone.utc)
+    )
+    Farmer.objects.update(created_at=datetime(2024, 2, 20, 15, tzinfo=timezone.utc))
+    return create_farms
+
+
+def get_points(timeseries, field):
+    return [point[field] for point in timeseries["series"]]
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_get_timeseries_by_month(dated_farms, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        timeseries = get_timeseries("month", date(2024, 1, 1), date(2024, 5, 1))
+    assert get_points(timeseries, "period") == [
+        date(2024, month, 1) for month in range(1, 6)
+    ]
+    assert get_points(timeseries, "farmer_count") == [0, 2, 0, 0, 0]
+    assert get_points(timeseries, "farm_count") == [0, 1, 0, 1, 0]
+    assert get_points(timeseries, "total_area_hectares") == [0, 100, 0, 200, 0]
+    assert timeseries["series"][0]["arable_area_hectares"] == Decimal(0)
+
+
+@pytest.mark.django_db
+def test_get_timeseries_by_week_and_day(dated_farms):
+    timeseries = get_timeseries("week", date(2024, 2, 19), date(2024, 3, 4))
+    assert get_points(timeseries, "period") == [
+        date(2024, 2, 19),
+        date(2024, 2, 26),
+        date(2024, 3, 4),
+    ]
+    assert get_points(timeseries, "farmer_count") == [2, 0, 0]
+    assert get_points(timeseries, "farm_count") == [0, 1, 0]
+    timeseries = get_timeseries("day", date(2024, 2, 29), date(2024, 3, 1))
+    assert get_points(timeseries, "farm_count") == [1, 0]
+
+
+@pytest.mark.django_db
+def test_get_timeseries_by_state(dated_farms):
+    timeseries = get_timeseries("month", date(2024, 2, 1), date(2024, 4, 1), "MG")
+    assert timeseries["state"] == "MG"
+    assert get_points(timeseries, "farmer_count") == [1, 0, 0]
+    assert get_points(timeseries, "farm_count") == [0, 0, 1]
+    assert get_points(timeseries, "vegetation_area_hectares") == [0, 0, 50]
+
+
+@pytest.mark.django_db
+def test_get_timeseries_empty(db):
+    timeseries = get_timeseries("day", date(2024, 1, 1), date(2024, 1, 3))
+    assert get_points(timeseries, "farm_count") == [0, 0, 0]
+
+
+@pytest.mark.parametrize(
+    "interval, start, end, expected",
+    [
+        (
+            "day",
+            date(2024, 1, 2),
+            date(2024, 1, 3),
+            (date(2024, 1, 2), date(2024, 1, 3)),
+        ),
+        (
+            "week",
+            date(2024, 1, 3),
+            date(2024, 1, 3),
+            (date(2024, 1, 1), date(2024, 1, 1)),
+        ),
+        (
+            "month",
+            date(2023, 11, 15),
+            date(2024, 2, 29),
+            (date(2023, 11, 1), date(2024, 2, 1)),
+        ),
+        ("month", None, date(2024, 3, 31), (date(2023, 4, 1), date(2024, 3, 1))),
+        ("day", None, date(2024, 3, 1), (date(2024, 2, 1), date(2024, 3, 1))),
+    ],
+)
+def test_get_period_range(interval, start, end, expected):
+    assert get_period_range(interval, start, end) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "state, indexes",
+    [
+        (None, ("agro_farm_created_idx", "agro_farmer_created_idx")),
+        ("BA", ("agro_farm_state_created_idx",)),
+    ],
+)
+def test_timeseries_query_plan(state, indexes):
+    query_plan = explain(_get_rows("day", date(2024, 1, 1), date(2024, 1, 31), state))
+    assert all(index in query_plan for index in indexes), query_plan
+
+
+# Negative cases
+@pytest.mark.parametrize(
+    "interval, start, end",
+    [
+        ("day", date(2024, 1, 2), date(2024, 1, 1)),
+        ("month", date(2024, 2, 1), date(2024, 1, 31)),
+        ("day", date(2020, 1, 1), date(2024, 1, 1)),
+        ("day", None, date(9999, 12, 31)),
+        ("week", None, date(9999, 12, 27)),
+        ("month", None, date(9999, 12, 1)),
+        ("day", None, date(1, 1, 5)),
+    ],
+)
+def test_get_period_range_invalid(interval, start, end):
+    with pytest.raises(ValueError):
+        get_period_range(interval, start, end)
+
+
+def test_max_periods():
+    start, end = get_period_range("month", date(1950, 1, 1), date(2024, 1, 1))
+    assert (end.year - start.year) * 12 + 1 <= MAX_PERIODS
@@ -0,0 +1,33 @@
+import pytest
+
+from agro.cache import (
+    DATA_VERSION_KEY,
+    bump_data_version,
+    get_cache,
+    get_data_version,
+)
+from agro.models import Counter
+
+
+@pytest.mark.django_db
+def test_data_version_is_stable_until_bumped():
+    version = get_data_version()
+    assert get_data_version() == version
+    assert bump_data_version() == version + 1
+    assert get_data_version() == version + 1
+
+
+@pytest.mark.django_db
+def test_data_version_is_shared_through_the_database():
+    version = bump_data_version()
+    # Another worker has its own cache, but reads the same counter
+    get_cache().clear()
+    assert get_data_version() == version
+    assert Counter.objects.get(key=DATA_VERSION_KEY).value == version
+
+
+@pytest.mark.django_db
+def test_data_version_survives_a_lost_counter():
+    version = get_data_version()
+    Counter.objects.filter(key=DATA_VERSION_KEY).delete()
+    assert bump_data_version() > version
@@ -0,0 +1,257 @@
+import json
+import os
+import time
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from agro.business.dashboard import calculate_dashboard_data, get_dashboard_data
+from agro.models import Crop, DashboardSummary, Farm, Farmer, ThrottleCounter
+
+
+@pytest.mark.django_db
+def test_rebuild_dashboard_summary_command(create_farms):
+    DashboardSummary.objects.all().delete()
+    out = StringIO()
+    call_command("rebuild_dashboard_summary", stdout=out)
+    assert "Dashboard summary rebuilt" in out.getvalue()
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.mark.django_db
+def test_import_agro_farmers_csv(tmp_path):
+    path = write_lines(
+        tmp_path / "farmers.csv",
+        [
+            "cpf_cnpj,name",
+            "951.810.400-04,Ana",
+            "12345678901,Inválido",
+            "77759188000180,Cooperativa",
+            "95181040004,Ana de novo",
+        ],
+    )
+    rejects = tmp_path / "rejects.ndjson"
+    out = StringIO()
+    call_command(
+        "import_agro", "farmers", path, rejects=str(rejects), batch_size=2, stdout=out
+    )
+    assert set(Farmer.objects.values_list("cpf_cnpj", flat=True)) == {
+        "95181040004",
+        "77759188000180",
+    }
+    errors = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [error["line"] for error in errors] == [2, 4]
+    assert "rows/s" in out.getvalue()
+    assert "Imported 2 farmers" in out.getvalue()
+    assert not os.path.exists(f"{path}.checkpoint")
+
+
+@pytest.mark.django_db
+def test_import_agro_farms_and_crops_ndjson(
+    tmp_path, create_farmers, create_crop_types
+):
+    farmer = create_farmers[0]
+    farm_id = "6f4f1a36-3d0a-4a7e-9d8b-0c0a3f1a2b3c"
+    farms_path = write_lines(
+        tmp_path / "farms.ndjson",
+        [
+            json.dumps(
+                {
+                    "id": farm_id,
+                    "farmer_cpf_cnpj": farmer.cpf_cnpj,
+                    "name": "Fazenda Goiás",
+                    "city": "Rio Verde",
+                    "state": "go",
+                    "total_area_hectares": "300",
+                    "arable_area_hectares": "200",
+                    "vegetation_area_hectares": "100",
+                }
+            ),
+            json.dumps(
+                {
+                    "farmer_id": str(farmer.id),
+                    "name": "Fazenda Grande",
+                    "city": "Rio Verde",
+                    "state": "GO",
+                    "total_area_hectares": "100",
+                    "arable_area_hectares": "90",
+                    "vegetation_area_hectares": "20",
+                }
+            ),
+            "not json",
+        ],
+    )
+    call_command("import_agro", "farms", farms_path, stdout=StringIO())
+    assert list(Farm.objects.values_list("state", flat=True)) == ["GO"]
+    crops_path = write_lines(
+        tmp_path / "crops.csv",
+        [
+            "farm_id,crop_type_name",
+            f"{farm_id},soja",
+            f"{farm_id},Soja",
+            f"{farm_id},Café",
+        ],
+    )
+    call_command("import_agro", "crops", crops_path, stdout=StringIO())
+    assert list(Crop.objects.values_list("crop_type__name", flat=True)) == ["Soja"]
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_import_agro_resume(tmp_path):
+    path = write_lines(
+        tmp_path / "farmers.csv",
+        ["cpf_cnpj,name", "95181040004,Ana", "77759188000180,Cooperativa"],
+    )
+    checkpoint = tmp_path / "farmers.checkpoint"
+    checkpoint.write_text(json.dumps({"path": path, "rows": 1}))
+    call_command(
+        "import_agro",
+        "farmers",
+        path,
+        checkpoint=str(checkpoint),
+        resume=True,
+        stdout=StringIO(),
+    )
+    assert list(Farmer.objects.values_list("cpf_cnpj", flat=True)) == ["77759188000180"]
+    assert not checkpoint.exists()
+
+
+@pytest.mark.django_db
+def test_import_agro_resume_is_idempotent(tmp_path, create_farmers):
+    farm = {
+        "farmer_cpf_cnpj": create_farmers[0].cpf_cnpj,
+        "name": "Fazenda Goiás",
+        "city": "Rio Verde",
+        "state": "GO",
+        "total_area_hectares": "300",
+        "arable_area_hectares": "200",
+        "vegetation_area_hectares": "100",
+    }
+    path = write_lines(tmp_path / "farms.ndjson", [json.dumps(farm)] * 2)
+    checkpoint = tmp_path / "farms.checkpoint"
+    started = {"path": path, "run": str(uuid.uuid4()), "rows": 0}
+    checkpoint.write_text(json.dumps(started))
+    call_command(
+        "import_agro",
+        "farms",
+        path,
+        checkpoint=str(checkpoint),
+        resume=True,
+        stdout=StringIO(),
+    )
+    # Killed after the commit, before the checkpoint was written
+    checkpoint.write_text(json.dumps(started))
+    rejects = tmp_path / "rejects.ndjson"
+    call_command(
+        "import_agro",
+        "farms",
+        path,
+        checkpoint=str(checkpoint),
+        rejects=str(rejects),
+        resume=True,
+        stdout=StringIO(),
+    )
+    assert Farm.objects.count() == 2
+    errors = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [error["error"] for error in errors] == [
+        "id: A farm with this id already exists."
+    ] * 2
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_import_agro_new_file_at_same_path(tmp_path):
+    path = tmp_path / "farmers.csv"
+    write_lines(path, ["cpf_cnpj,name", "95181040004,Ana"])
+    call_command("import_agro", "farmers", str(path), stdout=StringIO())
+    write_lines(path, ["cpf_cnpj,name", "77759188000180,Cooperativa"])
+    call_command("import_agro", "farmers", str(path), stdout=StringIO())
+    assert set(Farmer.objects.values_list("cpf_cnpj", flat=True)) == {
+        "95181040004",
+        "77759188000180",
+    }
+
+
+@pytest.mark.django_db
+def test_import_agro_overwrites_rejects(tmp_path):
+    path = write_lines(tmp_path / "farmers.csv", ["cpf_cnpj,name", "123,Inválido"])
+    rejects = tmp_path / "rejects.ndjson"
+    rejects.write_text('{"line": 9}\n')
+    call_command(
+        "import_agro", "farmers", path, rejects=str(rejects), stdout=StringIO()
+    )
+    errors = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [error["line"] for error in errors] == [1]
+
+
+def test_import_agro_checkpoint_of_another_file(tmp_path):
+    path = write_lines(tmp_path / "farmers.csv", ["cpf_cnpj,name"])
+    checkpoint = tmp_path / "farmers.checkpoint"
+    other_path = str(tmp_path / "other.csv")
+    checkpoint.write_text(json.dumps({"path": other_path, "rows": 1}))
+    with pytest.raises(CommandError, match="belongs to"):
+        call_command(
+            "import_agro", "farmers", path, checkpoint=str(checkpoint), resume=True
+        )
+
+
+@pytest.mark.django_db
+def test_clear_throttle_counters():
+    now = int(time.time())
+    ThrottleCounter.objects.create(key="anon:1", expires_at=now - 60, requests=3)
+    ThrottleCounter.objects.create(key="anon:2", expires_at=now + 60, requests=1)
+    out = StringIO()
+    call_command("clear_throttle_counters", stdout=out)
+    assert "Deleted 1 expired throttle counters." in out.getvalue()
+    assert list(ThrottleCounter.objects.values_list("key", flat=True)) == ["anon:2"]
+
+
+def test_import_agro_unknown_format(tmp_path):
+    path = write_lines(tmp_path / "farmers.txt", ["cpf_cnpj,name"])
+    with pytest.raises(CommandError):
+        call_command("import_agro", "farmers", path)
+
+
+# Time to the first response of a fresh worker, generous for slow machines
+STARTUP_BUDGET_MS = 10000
+
+
+def test_startup_report(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    out = StringIO()
+    call_command("startup_report", path="/", budget_ms=STARTUP_BUDGET_MS, stdout=out)
+    report = out.getvalue()
+    assert "First response in" in report
+    assert "HTTP 200" in report
+    for step in ("django_setup", "load_urls", "load_serializers", "first_request"):
+        assert step in report
+    assert "django " in report
+
+
+def test_startup_report_over_budget(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    with pytest.raises(CommandError, match="over the budget"):
+        call_command(
+            "startup_report", path="/", warm_up=False, budget_ms=1, stdout=StringIO()
+        )
+
+
+@pytest.mark.django_db
+def test_seed_agro():
+    out = StringIO()
+    call_command("seed_agro", 10, "--farms-per-farmer", "5", stdout=out)
+    assert "Seeded 2 farmers, 10 farms and" in out.getvalue()
+    assert Farm.objects.count() == 10
+
+
+def test_seed_agro_invalid_farms():
+    with pytest.raises(CommandError):
+        call_command("seed_agro", 0)
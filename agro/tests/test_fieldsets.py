@@ -0,0 +1,53 @@
+from django.http import QueryDict
+
+from agro.fieldsets import Fieldset, parse_paths
+from agro.serializers import CropSerializer, FarmSerializer
+
+
+def test_parse_paths():
+    assert parse_paths("id, farm.name,farm.farmer.name,") == {
+        "id": {},
+        "farm": {"name": {}, "farmer": {"name": {}}},
+    }
+    assert parse_paths("") == {}
+    assert parse_paths(None) is None
+
+
+def test_fieldset_from_query_params():
+    assert Fieldset.from_query_params(QueryDict("page=2")) is None
+    fieldset = Fieldset.from_query_params(QueryDict("omit=farmer&expand="))
+    assert fieldset.includes("name")
+    assert not fieldset.includes("farmer")
+    assert not fieldset.expands("farmer")
+
+
+def test_fieldset_nested():
+    fieldset = Fieldset(
+        fields=parse_paths("farm.farmer.name"), omit=None, expand=parse_paths("")
+    )
+    assert fieldset.includes("farm")
+    assert not fieldset.includes("id")
+    assert fieldset.expands("farm")
+    nested = fieldset.nested("farm")
+    assert nested.includes("farmer")
+    assert not nested.includes("name")
+    assert nested.nested("farmer").includes("name")
+
+
+def test_query_plan():
+    serializer = FarmSerializer(fieldset=Fieldset(fields=parse_paths("name,farmer")))
+    assert serializer.get_query_plan() == (
+        ["farmer", "farmer__id", "farmer__cpf_cnpj", "farmer__name", "name"],
+        ["farmer"],
+    )
+    serializer = CropSerializer(
+        fieldset=Fieldset(fields=parse_paths("farm.name"), expand=parse_paths(""))
+    )
+    assert serializer.get_query_plan() == (["farm", "farm__name"], ["farm"])
+
+
+def test_query_plan_collapsed():
+    serializer = FarmSerializer(fieldset=Fieldset(expand=parse_paths("")))
+    only, related = serializer.get_query_plan()
+    assert "farmer" in only
+    assert related == []
@@ -0,0 +1,162 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.test import APIRequestFactory
+
+from agro.business.crops import get_farms_with_crops
+from agro.models import Crop
+from agro.views import CropViewSet, FarmerViewSet, FarmViewSet
+
+CPF_CNPJ_INDEXES = ("sqlite_autoindex_agro_farmer_2", "agro_farmer_cpf_cnpj")
+
+
+def get_filtered_queryset(viewset, params):
+    request = Request(APIRequestFactory().get("/", params))
+    view = viewset(request=request, action="list", format_kwarg=None, kwargs={})
+    queryset = view.filter_queryset(view.get_queryset())
+    if viewset is CropViewSet:
+        return get_farms_with_crops(queryset)
+    return queryset
+
+
+def explain(queryset):
+    if connection.vendor == "postgresql":
+        # The test tables are tiny, so make the planner show the index it
+        # would pick for a real table instead of a sequential scan.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset.explain()
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_farm_filters(client, create_farms):
+    farm1, farm2 = create_farms
+    url = reverse("farm-list")
+    cases = [
+        ({"state": "ba"}, [farm1]),
+        ({"city": "Salinas"}, [farm2]),
+        ({"farmer": str(farm1.farmer_id)}, [farm1]),
+        ({"total_area_hectares_min": "150"}, [farm2]),
+        ({"total_area_hectares_max": "150.50"}, [farm1]),
+        ({"arable_area_hectares_min": "50", "arable_area_hectares_max": "99"}, [farm1]),
+        ({"state": "MG", "total_area_hectares_min": "300"}, []),
+    ]
+    for params, expected in cases:
+        response = client.get(url, params)
+        assert response.status_code == HTTP_200_OK
+        assert [farm["id"] for farm in response.data["results"]] == [
+            str(farm.id) for farm in expected
+        ]
+
+
+@pytest.mark.django_db
+def test_farmer_document_filter(client, create_farmers):
+    response = client.get(reverse("farmer-list"), {"document": "424.427.560-64"})
+    assert response.status_code == HTTP_200_OK
+    assert [farmer["id"] for farmer in response.data["results"]] == [
+        str(create_farmers[0].id)
+    ]
+
+
+@pytest.mark.django_db
+def test_crop_filters(client, create_farms, create_crop_types):
+    farm1, farm2 = create_farms
+    crop_type1, crop_type2 = create_crop_types
+    Crop.objects.create(farm=farm1, crop_type=crop_type1)
+    Crop.objects.create(farm=farm2, crop_type=crop_type1)
+    crop = Crop.objects.create(farm=farm2, crop_type=crop_type2)
+    url = reverse("crop-list")
+    response = client.get(url, {"crop_type": crop_type2.id})
+    assert response.status_code == HTTP_200_OK
+    assert [crop["farm"]["id"] for crop in response.data["results"]] == [str(farm2.id)]
+    # Only the crops of the filter, like its export
+    assert response.data["results"][0]["id"] == crop.id
+    assert response.data["results"][0]["crops"] == [
+        {"id": crop_type2.id, "name": crop_type2.name}
+    ]
+    response = client.get(url, {"state": "BA"})
+    assert [crop["farm"]["id"] for crop in response.data["results"]] == [str(farm1.id)]
+    assert len(response.data["results"][0]["crops"]) == 1
+
+
+@pytest.mark.django_db
+def test_filtered_export(client, create_farms):
+    response = client.get(reverse("farm-export"), {"state": "MG"})
+    assert response.status_code == HTTP_200_OK
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert len(lines) == 2
+    assert "Fazenda Minas" in lines[1]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "viewset, params, indexes",
+    [
+        (FarmViewSet, {"state": "BA"}, ("agro_farm_state",)),
+        (FarmViewSet, {"state": "BA", "city": "Juazeiro"}, ("agro_farm_state_city",)),
+        (FarmViewSet, {"city": "Juazeiro"}, ("agro_farm_city_idx",)),
+        (
+            FarmViewSet,
+            {"farmer": "01234567-8901-2345-6789-012345678901"},
+            ("agro_farm_farmer_id",),
+        ),
+        (FarmViewSet, {"total_area_hectares_min": "10"}, ("agro_farm_total_idx",)),
+        (
+            FarmViewSet,
+            {"state": "BA", "total_area_hectares_max": "10"},
+            ("agro_farm_state_total_idx",),
+        ),
+        (FarmViewSet, {"arable_area_hectares_max": "10"}, ("agro_farm_arable_idx",)),
+        (FarmerViewSet, {"document": "424.427.560-64"}, CPF_CNPJ_INDEXES),
+        (CropViewSet, {"crop_type": "1"}, ("agro_crop_type_farm_idx",)),
+        (CropViewSet, {"state": "BA"}, ("agro_farm_state",)),
+    ],
+)
+def test_filter_query_plan(viewset, params, indexes):
+    # The count of a filtered list has no ORDER BY to walk, so the filter
+    # alone decides the index.
+    query_plan = explain(get_filtered_queryset(viewset, params).order_by())
+    assert any(index in query_plan for index in indexes), query_plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "viewset, params, indexes",
+    [
+        (FarmViewSet, {"state": "BA", "city": "Juazeiro"}, ("agro_farm_state_city",)),
+        (FarmViewSet, {"city": "Juazeiro"}, ("agro_farm_city_idx",)),
+        (FarmerViewSet, {"document": "424.427.560-64"}, CPF_CNPJ_INDEXES),
+        (CropViewSet, {"crop_type": "1"}, ("agro_crop_type_farm_idx",)),
+    ],
+)
+def test_filter_page_query_plan(viewset, params, indexes):
+    query_plan = explain(get_filtered_queryset(viewset, params))
+    assert any(index in query_plan for index in indexes), query_plan
+
+
+# Negative cases
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name, params, errors",
+    [
+        ("farm-list", {"state": "XX"}, ["state"]),
+        ("farm-list", {"farmer": "123"}, ["farmer"]),
+        ("farm-list", {"city": " "}, ["city"]),
+        (
+            "farm-list",
+            {"total_area_hectares_min": "abc", "arable_area_hectares_max": "NaN"},
+            ["total_area_hectares_min", "arable_area_hectares_max"],
+        ),
+        ("farmer-list", {"document": "123"}, ["document"]),
+        ("crop-list", {"crop_type": "soja"}, ["crop_type"]),
+        ("crop-list", {"crop_type": "99999999999999999999999"}, ["crop_type"]),
+        ("crop-list", {"crop_type": str(-(2**63) - 1)}, ["crop_type"]),
+    ],
+)
+def test_invalid_filters(client, url_name, params, errors):
+    response = client.get(reverse(url_name), params)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert sorted(response.data) == sorted(errors)
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from rest_framework.status import HTTP_200_OK
+
+from agro.models import Crop, Farmer
+from agro.timing import RequestTimings, install_execute_wrapper, track_queries
+
+
+@pytest.fixture
+def server_timing(settings):
+    settings.SERVER_TIMING = {
+        "ENABLED": True,
+        "QUERY_BUDGET": 50,
+        "LATENCY_BUDGET_MS": 10000,
+    }
+    return settings.SERVER_TIMING
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_server_timing_header(client, server_timing, create_farmers):
+    response = client.get(reverse("farmer-list"))
+    assert response.status_code == HTTP_200_OK
+    metrics = parse_server_timing(response["Server-Timing"])
+    # The anonymous throttle, on when DEBUG is off, reports its own metric
+    assert set(metrics) - {"throttle"} == {"db", "serialize", "render", "total"}
+    assert re.fullmatch(r'"\d+ queries"', metrics["db"]["desc"])
+    assert int(metrics["db"]["desc"].strip('"').split()[0]) == 2
+    assert float(metrics["total"]["dur"]) >= float(metrics["db"]["dur"])
+
+
+@pytest.mark.django_db
+def test_server_timing_crop_list(
+    client, server_timing, create_farms, create_crop_types
+):
+    Crop.objects.create(farm=create_farms[0], crop_type=create_crop_types[0])
+    response = client.get(reverse("crop-list"))
+    assert response.status_code == HTTP_200_OK
+    assert "serialize" in parse_server_timing(response["Server-Timing"])
+
+
+@pytest.mark.django_db
+def test_server_timing_logs_over_budget(client, server_timing, caplog):
+    server_timing["QUERY_BUDGET"] = 0
+    with caplog.at_level(logging.WARNING, logger="agro.middleware"):
+        response = client.get(reverse("dashboard"))
+    assert response.status_code == HTTP_200_OK
+    assert "Request over budget: GET /dashboard/" in caplog.text
+
+
+@pytest.mark.django_db
+def test_server_timing_within_budget(client, server_timing, caplog):
+    with caplog.at_level(logging.WARNING, logger="agro.middleware"):
+        client.get(reverse("dashboard"))
+    assert "Request over budget" not in caplog.text
+
+
+def test_nested_measure_counted_once():
+    timings = RequestTimings()
+    with timings.measure("serialize"):
+        with timings.measure("serialize"):
+            pass
+    assert list(timings.durations) == ["serialize"]
+    assert timings.durations["serialize"] > 0
+
+
+@pytest.mark.django_db
+def test_server_timing_header_async(async_client, server_timing, create_farmers):
+    response = async_to_sync(async_client.get)(reverse("farmer-list"))
+    assert response.status_code == HTTP_200_OK
+    metrics = parse_server_timing(response["Server-Timing"])
+    assert int(metrics["db"]["desc"].strip('"').split()[0]) == 2
+
+
+@pytest.mark.django_db
+def test_concurrent_requests_count_their_own_queries():
+    install_execute_wrapper(connection)
+
+    async def handle(timings, queries):
+        with track_queries(timings):
+            for _ in range(queries):
+                await Farmer.objects.acount()
+                # Lets the other request run its queries in between
+                await asyncio.sleep(0)
+
+    async def handle_both(first, second):
+        await asyncio.gather(handle(first, 1), handle(second, 3))
+
+    first, second = RequestTimings(), RequestTimings()
+    async_to_sync(handle_both)(first, second)
+    assert (first.queries, second.queries) == (1, 3)
+
+
+def test_middleware_is_async_capable(settings):
+    # A single sync middleware would run the async views in a thread
+    assert all(
+        getattr(import_string(path), "async_capable", False)
+        for path in settings.MIDDLEWARE
+    )
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_server_timing_disabled(client, create_farmers):
+    response = client.get(reverse("farmer-list"))
+    assert response.status_code == HTTP_200_OK
+    assert "Server-Timing" not in response
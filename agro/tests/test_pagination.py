@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+
+from agro.models import Farmer
+
+CPF_CNPJS = [
+    "42442756064",
+    "55678926000122",
+    "95181040004",
+    "53545781089",
+    "90196790077",
+    "77759188000180",
+]
+
+
+@pytest.fixture
+def many_farmers(db):
+    farmers = [
+        Farmer.objects.create(name=f"Produtor {index}", cpf_cnpj=cpf_cnpj)
+        for index, cpf_cnpj in enumerate(CPF_CNPJS)
+    ]
+    # Ties on updated_at must be broken by the id
+    Farmer.objects.filter(pk__in=[farmer.pk for farmer in farmers[:3]]).update(
+        updated_at=timezone.now()
+    )
+    return list(Farmer.objects.order_by("-updated_at", "-id"))
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_cursor_pagination_walks_every_row_once(client, many_farmers):
+    url = reverse("farmer-list")
+    response = client.get(url, {"pagination": "cursor", "page_size": 4})
+    assert response.status_code == HTTP_200_OK
+    assert "count" not in response.data
+    assert response.data["previous"] is None
+    first_page = [farmer["id"] for farmer in response.data["results"]]
+    response = client.get(response.data["next"])
+    second_page = [farmer["id"] for farmer in response.data["results"]]
+    assert response.data["next"] is None
+    assert first_page + second_page == [str(farmer.id) for farmer in many_farmers]
+    response = client.get(response.data["previous"])
+    assert [farmer["id"] for farmer in response.data["results"]] == first_page
+    assert response.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_skips_count_query(client, many_farmers):
+    url = reverse("farm-list")
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, {"pagination": "cursor"})
+    assert response.status_code == HTTP_200_OK
+    assert not any("COUNT(" in query["sql"] for query in context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_on_crop_list(client, create_farms, create_crop_types):
+    for farm in create_farms:
+        farm.crops.create(crop_type=create_crop_types[0])
+    url = reverse("crop-list")
+    response = client.get(url, {"pagination": "cursor", "page_size": 1})
+    first = response.data["results"][0]["farm"]["id"]
+    response = client.get(response.data["next"])
+    assert response.data["results"][0]["farm"]["id"] != first
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_is_the_default(client, many_farmers):
+    url = reverse("farmer-list")
+    response = client.get(url)
+    assert response.data["count"] == len(many_farmers)
+
+
+# Negative cases
+@pytest.mark.parametrize("cursor", ["invalid", "eyJpZCI6IDF9"])
+@pytest.mark.django_db
+def test_cursor_pagination_with_invalid_cursor(client, cursor):
+    url = reverse("farmer-list")
+    response = client.get(url, {"cursor": cursor})
+    assert response.status_code == HTTP_404_NOT_FOUND
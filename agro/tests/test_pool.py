@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from agro.backends.postgresql.pool import ConnectionPool, PoolTimeout, get_pool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def is_open(connection):
+    return not connection.closed
+
+
+# Positive cases
+def test_pool_reuses_connections():
+    pool = ConnectionPool(max_size=2)
+    connection = pool.getconn(FakeConnection)
+    pool.putconn(connection)
+    assert pool.getconn(FakeConnection) is connection
+    assert pool.getconn(FakeConnection) is not connection
+    assert pool.size == 2
+
+
+def test_pool_waits_for_a_connection():
+    pool = ConnectionPool(max_size=1, timeout=5)
+    connection = pool.getconn(FakeConnection)
+    timer = threading.Timer(0.05, pool.putconn, [connection])
+    timer.start()
+    assert pool.getconn(FakeConnection) is connection
+    timer.join()
+
+
+def test_pool_discards_unhealthy_connections():
+    pool = ConnectionPool(max_size=1, check=is_open)
+    connection = pool.getconn(FakeConnection)
+    pool.putconn(connection)
+    connection.close()
+    assert pool.getconn(FakeConnection) is not connection
+    assert pool.size == 1
+
+
+def test_pool_discards_connections_that_cannot_be_reset():
+    pool = ConnectionPool(max_size=1, reset=lambda connection: False)
+    connection = pool.getconn(FakeConnection)
+    pool.putconn(connection)
+    assert connection.closed
+    assert pool.size == 0
+
+
+def test_pool_closes_idle_connections():
+    pool = ConnectionPool(max_size=2, max_idle=0.01)
+    connections = [pool.getconn(FakeConnection) for _ in range(2)]
+    for connection in connections:
+        pool.putconn(connection)
+    time.sleep(0.02)
+    new_connection = pool.getconn(FakeConnection)
+    assert new_connection not in connections
+    assert all(connection.closed for connection in connections)
+    assert pool.size == 1
+
+
+def test_get_pool_per_database():
+    pool = get_pool(("default", "agro", "", "", ""), max_size=1)
+    assert get_pool(("default", "agro", "", "", "")) is pool
+    assert get_pool(("default", "test_agro", "", "", "")) is not pool
+
+
+# Negative cases
+def test_pool_timeout():
+    pool = ConnectionPool(max_size=1, timeout=0.01)
+    pool.getconn(FakeConnection)
+    with pytest.raises(PoolTimeout):
+        pool.getconn(FakeConnection)
+
+
+def test_pool_connect_error_frees_the_slot():
+    def connect():
+        raise OSError("Connection refused")
+
+    pool = ConnectionPool(max_size=1)
+    with pytest.raises(OSError):
+        pool.getconn(connect)
+    assert pool.size == 0
+    assert pool.getconn(FakeConnection)
@@ -0,0 +1,114 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+import msgpack
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+
+from agro.models import Farmer
+from agro.parsers import MessagePackParser, ORJSONParser
+from agro.renderers import MessagePackRenderer, ORJSONRenderer
+
+PAYLOAD = {
+    "id": uuid.UUID("01234567-8901-2345-6789-012345678901"),
+    "total_area_hectares": Decimal("1234.50"),
+    "created_at": datetime.datetime(
+        2024, 4, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "date": datetime.date(2024, 4, 1),
+    "name": "Fazenda São João  ",
+    "error": ErrorDetail("Enter a valid CPF or CNPJ.", code="invalid"),
+    "lazy": gettext_lazy("This field is required."),
+    "by_state": {1: "BA", "MG": [1, 2.5, None, True]},
+}
+
+
+# Positive cases
+def test_orjson_renderer_matches_json_renderer():
+    assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_orjson_renderer_indent():
+    rendered = ORJSONRenderer().render(
+        PAYLOAD, "application/json; indent=4", {"indent": None}
+    )
+    assert rendered == JSONRenderer().render(PAYLOAD, "application/json; indent=4")
+
+
+def test_orjson_parser():
+    stream = io.BytesIO('{"name": "João", "total": 1.5}'.encode())
+    assert ORJSONParser().parse(stream) == {"name": "João", "total": 1.5}
+
+
+def test_message_pack_round_trip():
+    rendered = MessagePackRenderer().render(PAYLOAD)
+    parsed = msgpack.unpackb(rendered, strict_map_key=False)
+    assert parsed["id"] == str(PAYLOAD["id"])
+    assert parsed["total_area_hectares"] == 1234.5
+    assert parsed["created_at"] == "2024-04-01T12:30:15.123456Z"
+    assert parsed["name"] == PAYLOAD["name"]
+    assert parsed["by_state"] == {1: "BA", "MG": [1, 2.5, None, True]}
+
+
+@pytest.mark.django_db
+def test_message_pack_response(client, create_farms):
+    url = reverse("farm-list")
+    response = client.get(url, HTTP_ACCEPT="application/msgpack")
+    assert response.status_code == HTTP_200_OK
+    assert response["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == client.get(url).json()
+
+
+@pytest.mark.django_db
+def test_message_pack_dashboard(client, create_farms):
+    url = reverse("dashboard")
+    response = client.get(url, {"format": "msgpack"})
+    assert response.status_code == HTTP_200_OK
+    assert msgpack.unpackb(response.content) == client.get(url).json()
+
+
+@pytest.mark.django_db
+def test_message_pack_request(client):
+    data = {"name": "Ana", "cpf_cnpj": "951.810.400-04"}
+    response = client.post(
+        reverse("farmer-list"),
+        msgpack.packb(data),
+        content_type="application/msgpack",
+    )
+    assert response.status_code == HTTP_201_CREATED
+    assert Farmer.objects.filter(cpf_cnpj="95181040004").exists()
+
+
+def test_message_pack_parser():
+    stream = io.BytesIO(msgpack.packb({"name": "João", "farms": [{"total": 1.5}]}))
+    assert MessagePackParser().parse(stream) == {
+        "name": "João",
+        "farms": [{"total": 1.5}],
+    }
+
+
+# Negative cases
+def test_orjson_parser_invalid():
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+@pytest.mark.parametrize("content", [b"\xc1", msgpack.packb({1: "BA"})])
+def test_message_pack_parser_invalid(content):
+    with pytest.raises(ParseError):
+        MessagePackParser().parse(io.BytesIO(content))
+
+
+@pytest.mark.django_db
+def test_invalid_json_request(client):
+    response = client.post(
+        reverse("farmer-list"), b'{"name": ', content_type="application/json"
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["detail"].startswith("JSON parse error")
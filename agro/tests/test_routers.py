@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
+
+from agro.routers import ReplicaRouter, read_from
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Runs against two SQLite files, with the farmer "Réplica" only in the replica
+REPLICA_SCRIPT = """
+import json
+from django.core.management import call_command
+from django.test import Client
+from agro.models import Farmer
+
+for database in ("default", "replica"):
+    call_command("migrate", database=database, verbosity=0)
+Farmer.objects.using("replica").create(name="Réplica", cpf_cnpj="42442756064")
+client, names = Client(HTTP_HOST="localhost"), {}
+
+def get(key, path):
+    response = client.get(path)
+    names[key] = [farmer["name"] for farmer in response.json()["results"]]
+
+get("read", "/farmers/")
+# Cached under the data version, so always computed from the primary
+series = client.get("/dashboard/timeseries/").json()["series"]
+names["timeseries"] = sum(point["farmer_count"] for point in series)
+data = {"name": "Primária", "cpf_cnpj": "95181040004"}
+response = client.post("/farmers/", data, content_type="application/json")
+names["created"] = response.status_code
+get("after_write", "/farmers/")
+client.cookies.clear()
+get("later", "/farmers/")
+print(json.dumps(names))
+"""
+
+
+@pytest.fixture
+def replica_env(tmp_path):
+    return {
+        **os.environ,
+        "DEBUG": "True",
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'primary.sqlite3'}",
+        "REPLICA_DATABASE_URL": f"sqlite:///{tmp_path / 'replica.sqlite3'}",
+    }
+
+
+# Positive cases
+def test_reads_from_replica(replica_env):
+    result = subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c", REPLICA_SCRIPT],
+        cwd=BASE_DIR,
+        env=replica_env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    names = json.loads(result.stdout.splitlines()[-1])
+    assert names["read"] == ["Réplica"]
+    assert names["timeseries"] == 0
+    assert names["created"] == HTTP_201_CREATED
+    # Sticky to the primary right after the write, back on the replica later
+    assert names["after_write"] == ["Primária"]
+    assert names["later"] == ["Réplica"]
+
+
+def test_router():
+    router = ReplicaRouter()
+    assert router.db_for_read(None) is None
+    with read_from("replica"):
+        assert router.db_for_read(None) == "replica"
+        assert router.db_for_write(None) == "default"
+    assert router.db_for_read(None) is None
+
+
+@pytest.mark.django_db
+def test_no_replica(client, create_farmers):
+    data = {"name": "Ana", "cpf_cnpj": "951.810.400-04"}
+    response = client.post(
+        reverse("farmer-list"), data, content_type="application/json"
+    )
+    assert response.status_code == HTTP_201_CREATED
+    assert "agro_primary" not in response.cookies
+    response = client.get(reverse("farmer-list"))
+    assert response.status_code == HTTP_200_OK
+    assert response.data["count"] == 3
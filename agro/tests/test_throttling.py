@@ -0,0 +1,167 @@
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_429_TOO_MANY_REQUESTS
+
+from agro.models import ThrottleCounter
+from agro.throttling import (
+    AnonFixedWindowRateThrottle,
+    delete_expired_counters,
+    increment,
+    increment_counter,
+)
+from agro.views import DashboardAPIView
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+INCREMENT_SCRIPT = """
+from agro.throttling import increment_counter
+
+for _ in range(50):
+    increment_counter("anon:127.0.0.1", 10**10)
+"""
+
+
+class ThreePerMinuteThrottle(AnonFixedWindowRateThrottle):
+    rate = "3/minute"
+
+
+@pytest.fixture
+def throttle(monkeypatch):
+    monkeypatch.setattr(DashboardAPIView, "throttle_classes", [ThreePerMinuteThrottle])
+    return ThreePerMinuteThrottle
+
+
+@pytest.fixture
+def timer(monkeypatch):
+    now = [1200.0]
+    monkeypatch.setattr(ThreePerMinuteThrottle, "timer", lambda self: now[0])
+    return now
+
+
+@pytest.fixture
+def throttle_database(settings):
+    settings.THROTTLE_DATABASE = True
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_throttle_counter(client, throttle, timer, throttle_database):
+    for _ in range(3):
+        assert client.get(reverse("dashboard")).status_code == HTTP_200_OK
+    # One row per client, expiring with the window
+    counter = ThrottleCounter.objects.get()
+    assert counter.key == "agro:throttle:anon:127.0.0.1"
+    assert (counter.expires_at, counter.requests) == (1260, 3)
+
+
+@pytest.mark.django_db
+def test_throttle_cache_counter(client, throttle, timer, django_assert_num_queries):
+    assert client.get(reverse("dashboard")).status_code == HTTP_200_OK
+    # The default store adds no query to the cached dashboard
+    with django_assert_num_queries(1):
+        assert client.get(reverse("dashboard")).status_code == HTTP_200_OK
+    assert client.get(reverse("dashboard")).status_code == HTTP_200_OK
+    # One integer per client and window
+    cache = caches["default"]
+    assert cache.get("agro:throttle:anon:127.0.0.1:20") == 3
+    assert not ThrottleCounter.objects.exists()
+
+
+@pytest.mark.django_db
+def test_throttle_next_window(client, throttle, timer, throttle_database):
+    for _ in range(3):
+        client.get(reverse("dashboard"))
+    timer[0] += 60
+    assert client.get(reverse("dashboard")).status_code == HTTP_200_OK
+    assert ThrottleCounter.objects.get().requests == 1
+
+
+@pytest.mark.django_db
+def test_throttle_server_timing(client, throttle, settings):
+    settings.SERVER_TIMING = {
+        "ENABLED": True,
+        "QUERY_BUDGET": 50,
+        "LATENCY_BUDGET_MS": 10000,
+    }
+    client.get(reverse("dashboard"))
+    response = client.get(reverse("dashboard"))
+    assert 'throttle;desc="anon 2/3"' in response["Server-Timing"]
+
+
+def test_increment():
+    cache = caches["default"]
+    assert increment(cache, "agro:test-counter", 60) == 1
+    assert increment(cache, "agro:test-counter", 60) == 2
+
+
+@pytest.mark.django_db
+def test_increment_counter():
+    assert increment_counter("anon:1", 60) == 1
+    assert increment_counter("anon:1", 60) == 2
+    assert increment_counter("anon:2", 60) == 1
+    # The next window
+    assert increment_counter("anon:1", 120) == 1
+
+
+@pytest.mark.django_db
+def test_delete_expired_counters():
+    increment_counter("anon:1", 60)
+    increment_counter("anon:2", 120)
+    delete_expired_counters(60.5)
+    assert list(ThrottleCounter.objects.values_list("key", flat=True)) == ["anon:2"]
+
+
+def test_increment_counter_across_processes(tmp_path):
+    env = {
+        **os.environ,
+        "DEBUG": "True",
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'throttle.sqlite3'}",
+    }
+    manage = [sys.executable, "manage.py"]
+    subprocess.run(
+        [*manage, "migrate", "--verbosity=0"], cwd=BASE_DIR, env=env, check=True
+    )
+    processes = [
+        subprocess.Popen(
+            [*manage, "shell", "-c", INCREMENT_SCRIPT],
+            cwd=BASE_DIR,
+            env=env,
+            stderr=subprocess.PIPE,
+        )
+        for _ in range(4)
+    ]
+    for process in processes:
+        assert process.wait() == 0, process.stderr.read()
+    script = (
+        "from agro.models import ThrottleCounter; "
+        "print(ThrottleCounter.objects.get().requests)"
+    )
+    result = subprocess.run(
+        [*manage, "shell", "-c", script],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "200"
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_throttled(client, throttle, timer, caplog):
+    timer[0] = 1230.0
+    for _ in range(3):
+        client.get(reverse("dashboard"))
+    with caplog.at_level(logging.WARNING, logger="agro.throttling"):
+        response = client.get(reverse("dashboard"))
+    assert response.status_code == HTTP_429_TOO_MANY_REQUESTS
+    assert response["Retry-After"] == "30"
+    assert "Request throttled: GET /dashboard/ was request 4 of 3" in caplog.text
@@ -0,0 +1,63 @@
+import pytest
+from django.db import transaction
+
+from agro.business.crop_types import CROP_TYPES_VERSION_KEY
+from agro.cache import DATA_VERSION_KEY, get_data_version
+from agro.models import Crop, CropType, Farm
+from agro.transactions import PendingChanges, bump_data_version_on_commit
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_cascading_delete_bumps_once(
+    django_capture_on_commit_callbacks, create_farms, create_crop_types
+):
+    farmer = create_farms[0].farmer
+    Farm.objects.create(
+        name="Fazenda Goiás",
+        farmer=farmer,
+        city="Rio Verde",
+        state="GO",
+        total_area_hectares=300,
+        arable_area_hectares=200,
+        vegetation_area_hectares=100,
+    )
+    for farm in farmer.farms.all():
+        for crop_type in create_crop_types:
+            Crop.objects.create(farm=farm, crop_type=crop_type)
+    version = get_data_version()
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            farmer.delete()
+    assert len(callbacks) == 1
+    assert get_data_version() == version + 1
+
+
+@pytest.mark.django_db
+def test_crop_type_write_bumps_both_versions(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with transaction.atomic():
+            CropType.objects.create(name="Café")
+    assert len(callbacks) == 1
+    assert callbacks[0].versions == {DATA_VERSION_KEY, CROP_TYPES_VERSION_KEY}
+
+
+# Edge/corner/boundary cases
+@pytest.mark.django_db
+def test_rolled_back_savepoint_drops_its_changes(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with transaction.atomic():
+            bump_data_version_on_commit()
+            with transaction.atomic():
+                bump_data_version_on_commit(CROP_TYPES_VERSION_KEY)
+                transaction.set_rollback(True)
+    assert len(callbacks) == 1
+    assert isinstance(callbacks[0], PendingChanges)
+    assert callbacks[0].versions == {DATA_VERSION_KEY}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bump_outside_a_transaction_runs_right_away():
+    version = get_data_version()
+    bump_data_version_on_commit()
+    assert get_data_version() == version + 1
@@ -0,0 +1,180 @@
+import importlib
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import clear_url_caches, reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_404_NOT_FOUND,
+)
+
+import agro.urls
+import brain_ag_teste.urls
+from agro.models import Crop, Farmer
+from agro.views import (
+    CropTypeViewSet,
+    CropViewSet,
+    DashboardAPIView,
+    DashboardTimeseriesAPIView,
+    FarmerViewSet,
+    FarmViewSet,
+)
+
+VIEWS = [
+    FarmerViewSet,
+    FarmViewSet,
+    CropTypeViewSet,
+    CropViewSet,
+    DashboardAPIView,
+    DashboardTimeseriesAPIView,
+]
+
+
+def get(async_client, url, *args, **kwargs):
+    return async_to_sync(async_client.get)(url, *args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def async_views(settings):
+    def set_async_views(enabled):
+        settings.ASYNC_VIEWS = enabled
+        # The views are built sync or async along with the URLconf
+        importlib.reload(agro.urls)
+        importlib.reload(brain_ag_teste.urls)
+        clear_url_caches()
+
+    set_async_views(True)
+    yield set_async_views
+    set_async_views(False)
+
+
+@pytest.fixture
+def create_crops(create_farms, create_crop_types):
+    return [
+        Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+        for farm in create_farms
+    ]
+
+
+# Positive cases
+@pytest.mark.parametrize("view", VIEWS)
+def test_views_are_async(view):
+    assert view.view_is_async
+
+
+@pytest.mark.parametrize("view", VIEWS)
+def test_views_are_sync_under_wsgi(async_views, view):
+    async_views(False)
+    assert not view.view_is_async
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name, params",
+    [
+        ("farmer-list", {}),
+        ("farm-list", {}),
+        ("farm-list", {"pagination": "cursor", "page_size": 1}),
+        ("farm-list", {"fields": "id,farmer.name", "state": "BA"}),
+        ("croptype-list", {}),
+        ("crop-list", {}),
+        ("crop-list", {"pagination": "cursor"}),
+        ("dashboard", {}),
+        ("dashboard-timeseries", {}),
+    ],
+)
+def test_async_list_matches_sync(
+    client, async_client, async_views, create_crops, url_name, params
+):
+    url = reverse(url_name)
+    async_views(False)
+    content = client.get(url, params).content
+    async_views(True)
+    response = get(async_client, url, params)
+    assert response.status_code == HTTP_200_OK
+    assert response.content == content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name, params",
+    [
+        ("farm-detail", {}),
+        ("farm-detail", {"omit": "farmer"}),
+        ("crop-detail", {}),
+        ("crop-detail", {"fields": "id,farm.name"}),
+    ],
+)
+def test_async_detail_matches_sync(
+    client, async_client, async_views, create_crops, url_name, params
+):
+    pk = create_crops[0].farm_id if url_name == "farm-detail" else create_crops[0].pk
+    url = reverse(url_name, kwargs={"pk": pk})
+    async_views(False)
+    content = client.get(url, params).content
+    async_views(True)
+    response = get(async_client, url, params)
+    assert response.status_code == HTTP_200_OK
+    assert response.content == content
+
+
+@pytest.mark.django_db
+def test_async_not_modified(async_client, create_farms, django_assert_num_queries):
+    url = reverse("farm-detail", kwargs={"pk": create_farms[0].pk})
+    response = get(async_client, url)
+    with django_assert_num_queries(1):
+        response = get(async_client, url, headers={"if-none-match": response["ETag"]})
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_async_dashboard_not_modified(async_client, create_farms):
+    url = reverse("dashboard")
+    response = get(async_client, url)
+    response = get(async_client, url, headers={"if-none-match": response["ETag"]})
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_async_export_streams_chunks(async_client, create_farms):
+    response = get(async_client, reverse("farm-export"))
+    assert response.status_code == HTTP_200_OK
+    assert response.is_async
+
+    async def read_content():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    assert len(async_to_sync(read_content)().decode().splitlines()) == 3
+
+
+@pytest.mark.django_db
+def test_sync_actions_under_async_dispatch(async_client):
+    data = {"name": "Ana", "cpf_cnpj": "951.810.400-04"}
+    response = async_to_sync(async_client.post)(
+        reverse("farmer-list"), data, content_type="application/json"
+    )
+    assert response.status_code == HTTP_201_CREATED
+    assert Farmer.objects.filter(cpf_cnpj="95181040004").exists()
+
+
+# Negative cases
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name, pk",
+    [
+        ("farm-detail", "01234567-8901-2345-6789-012345678901"),
+        ("farm-detail", "123"),
+        ("crop-detail", "0"),
+    ],
+)
+def test_async_detail_not_found(async_client, url_name, pk):
+    response = get(async_client, reverse(url_name, kwargs={"pk": pk}))
+    assert response.status_code == HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_async_invalid_page(async_client, create_farms):
+    response = get(async_client, reverse("farm-list"), {"page": 5})
+    assert response.status_code == HTTP_404_NOT_FOUND
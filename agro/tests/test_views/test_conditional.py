@@ -0,0 +1,197 @@
+import math
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_404_NOT_FOUND,
+)
+
+from agro.models import Crop, Farm, Farmer
+
+
+def get_fresh(client, url, response, **params):
+    return client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+@pytest.fixture
+def create_crops(create_farms, create_crop_types):
+    return [
+        Crop.objects.create(farm=farm, crop_type=crop_type)
+        for farm in create_farms
+        for crop_type in create_crop_types
+    ]
+
+
+# Positive cases
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name", ["farmer-list", "farm-list", "croptype-list", "crop-list"]
+)
+def test_list_not_modified(client, create_crops, django_assert_num_queries, url_name):
+    url = reverse(url_name)
+    response = client.get(url)
+    assert response.status_code == HTTP_200_OK
+    assert response["ETag"]
+    # A delete would not change the latest update
+    assert "Last-Modified" not in response
+    with django_assert_num_queries(1):
+        not_modified = get_fresh(client, url, response)
+    assert not_modified.status_code == HTTP_304_NOT_MODIFIED
+    assert not_modified.content == b""
+    assert not_modified["ETag"] == response["ETag"]
+
+
+@pytest.mark.django_db
+def test_detail_not_modified(client, create_farms, django_assert_num_queries):
+    farm = create_farms[0]
+    url = reverse("farm-detail", kwargs={"pk": farm.pk})
+    response = client.get(url)
+    with django_assert_num_queries(1):
+        assert get_fresh(client, url, response).status_code == HTTP_304_NOT_MODIFIED
+    farm.name = "Fazenda Bahia II"
+    farm.save()
+    modified = get_fresh(client, url, response)
+    assert modified.status_code == HTTP_200_OK
+    assert modified.data["name"] == "Fazenda Bahia II"
+    assert modified["ETag"] != response["ETag"]
+
+
+@pytest.mark.django_db
+def test_if_modified_since(client, create_farms):
+    farm = create_farms[0]
+    updated_at = timezone.now() - timedelta(seconds=5.5)
+    Farm.objects.filter(pk=farm.pk).update(updated_at=updated_at)
+    Farmer.objects.filter(pk=farm.farmer_id).update(updated_at=updated_at)
+    url = reverse("farm-detail", kwargs={"pk": farm.pk})
+    response = client.get(url)
+    last_modified = response["Last-Modified"]
+    # Rounded up to the second
+    assert last_modified == http_date(math.ceil(updated_at.timestamp()))
+    not_modified = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert not_modified.status_code == HTTP_304_NOT_MODIFIED
+    farm.name = "Fazenda Bahia II"
+    farm.save()
+    modified = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert modified.status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_nested_relation_modifies_payload(client, create_farms):
+    farm = create_farms[0]
+    urls = [reverse("farm-detail", kwargs={"pk": farm.pk}), reverse("farm-list")]
+    responses = [client.get(url) for url in urls]
+    farm.farmer.name = "João Silva"
+    farm.farmer.save()
+    for url, response in zip(urls, responses):
+        assert get_fresh(client, url, response).status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_list_delete_modifies_payload(client, create_farms):
+    url = reverse("farm-list")
+    response = client.get(url)
+    Farm.objects.filter(pk=create_farms[1].pk).delete()
+    modified = get_fresh(client, url, response)
+    assert modified.status_code == HTTP_200_OK
+    assert modified.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_list_etag_per_page_and_format(client, create_farms):
+    url = reverse("farm-list")
+    response = client.get(url, {"page_size": 1})
+    assert get_fresh(client, url, response, page_size=1).status_code == (
+        HTTP_304_NOT_MODIFIED
+    )
+    for params in [{"page_size": 1, "page": 2}, {"page_size": 1, "format": "msgpack"}]:
+        assert get_fresh(client, url, response, **params).status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_crop_detail_modified_by_farm_crops(client, create_crops, create_farms):
+    crop = create_crops[0]
+    url = reverse("crop-detail", kwargs={"pk": crop.pk})
+    response = client.get(url)
+    assert get_fresh(client, url, response).status_code == HTTP_304_NOT_MODIFIED
+    Crop.objects.filter(farm=crop.farm).exclude(pk=crop.pk).delete()
+    modified = get_fresh(client, url, response)
+    assert modified.status_code == HTTP_200_OK
+    assert len(modified.data["crops"]) == 1
+
+
+@pytest.mark.django_db
+def test_crop_list_modified_by_crop_type(client, create_crops, create_crop_types):
+    url = reverse("crop-list")
+    response = client.get(url)
+    assert response.data["count"] == 2
+    assert get_fresh(client, url, response).status_code == HTTP_304_NOT_MODIFIED
+    crop_type = create_crop_types[0]
+    crop_type.name = "Soja transgênica"
+    crop_type.save()
+    assert get_fresh(client, url, response).status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_farm_crops_not_modified(client, create_crops, create_farms, create_crop_types):
+    farm = create_farms[0]
+    url = reverse("farm-crops", kwargs={"pk": farm.pk})
+    response = client.get(url)
+    assert get_fresh(client, url, response).status_code == HTTP_304_NOT_MODIFIED
+    data = {"crop_type_ids": [create_crop_types[0].id]}
+    client.delete(url, data, content_type="application/json")
+    assert get_fresh(client, url, response).status_code == HTTP_200_OK
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_no_last_modified_within_its_second(client, create_farms):
+    farm = create_farms[0]
+    # Updated in the current second, which could see another update
+    Farm.objects.filter(pk=farm.pk).update(
+        updated_at=timezone.now() + timedelta(seconds=2)
+    )
+    response = client.get(reverse("farm-detail", kwargs={"pk": farm.pk}))
+    assert response["ETag"]
+    assert "Last-Modified" not in response
+
+
+@pytest.mark.django_db
+def test_list_ignores_if_modified_since(client, create_farms):
+    farm = create_farms[0]
+    Farm.objects.filter(pk=farm.pk).update(
+        updated_at=timezone.now() - timedelta(days=1)
+    )
+    url = reverse("farm-list")
+    since = http_date(timezone.now().timestamp())
+    # The deleted farm is not the latest update
+    farm.delete()
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+    assert response.status_code == HTTP_200_OK
+    assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_stale_etag(client, create_farms):
+    url = reverse("farm-list")
+    response = client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+    assert response.status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_cursor_pages_have_no_etag(client, create_farms):
+    response = client.get(reverse("farm-list"), {"pagination": "cursor"})
+    assert response.status_code == HTTP_200_OK
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("pk", ["01234567-8901-2345-6789-012345678901", "123"])
+def test_unknown_detail(client, create_farms, pk):
+    response = client.get(reverse("farm-detail", kwargs={"pk": pk}))
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert not response.has_header("ETag")
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.status import (
     HTTP_200_OK,
@@ -8,6 +10,7 @@ from rest_framework.status import (
     HTTP_404_NOT_FOUND,
 )
 
+from agro.business.crop_types import get_crop_types
 from agro.models import Crop
 
 from ..conftest import fake_id
@@ -24,8 +27,26 @@ def test_crop_list(client, create_farms, create_crop_types):
     url = reverse("crop-list")
     response = client.get(url)
     assert response.status_code == HTTP_200_OK
-    assert len(response.data) == 1
-    assert len(response.data[0]["crops"]) == 2
+    assert response.data["count"] == 1
+    assert len(response.data["results"]) == 1
+    assert response.data["results"][0]["farm"]["id"] == str(farm.id)
+    assert len(response.data["results"][0]["crops"]) == 2
+
+
+@pytest.mark.django_db
+def test_crop_list_is_paginated_by_farm(client, create_farms, create_crop_types):
+    for farm in create_farms:
+        for crop_type in create_crop_types:
+            Crop.objects.create(farm=farm, crop_type=crop_type)
+    url = reverse("crop-list")
+    response = client.get(url, {"page_size": 1})
+    assert response.status_code == HTTP_200_OK
+    assert response.data["count"] == len(create_farms)
+    assert len(response.data["results"]) == 1
+    assert response.data["next"] is not None
+    assert [crop["id"] for crop in response.data["results"][0]["crops"]] == sorted(
+        crop_type.id for crop_type in create_crop_types
+    )
 
 
 @pytest.mark.django_db
@@ -40,6 +61,30 @@ def test_crop_create(client, create_farms, create_crop_types):
     assert Crop.objects.filter(farm=farm, crop_type=crop_type).exists()
 
 
+@pytest.mark.django_db
+def test_crop_types_from_registry(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop_type = create_crop_types[0]
+    get_crop_types()
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(
+            reverse("crop-list"),
+            {"farm_id": farm.id, "crop_type_id": crop_type.id},
+            format="json",
+        )
+        assert response.status_code == HTTP_201_CREATED
+        assert response.data["crop_type"]["name"] == crop_type.name
+        response = client.get(reverse("crop-list"))
+        assert response.data["results"][0]["crops"] == [
+            {"id": crop_type.id, "name": crop_type.name}
+        ]
+        response = client.get(reverse("crop-detail", args=[Crop.objects.get().id]))
+        assert response.data["crops"][0]["name"] == crop_type.name
+    assert not any(
+        "agro_croptype" in query["sql"] for query in context.captured_queries
+    )
+
+
 @pytest.mark.django_db
 def test_crop_update(client, create_farms, create_crop_types):
     farm = create_farms[0]
@@ -87,6 +132,15 @@ def test_crop_retrieve(client, create_farms, create_crop_types):
 
 
 # Negative cases
+@pytest.mark.django_db
+def test_crop_list_skips_farms_without_crops(client, create_farms):
+    url = reverse("crop-list")
+    response = client.get(url)
+    assert response.status_code == HTTP_200_OK
+    assert response.data["count"] == 0
+    assert response.data["results"] == []
+
+
 @pytest.mark.django_db
 def test_crop_create_with_invalid_farm(client, create_crop_types):
     crop_type = create_crop_types[0]
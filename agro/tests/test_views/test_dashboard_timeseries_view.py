@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_400_BAD_REQUEST,
+)
+
+from agro.models import Farm, Farmer
+
+URL = reverse("dashboard-timeseries")
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_dashboard_timeseries(client, create_farms):
+    Farm.objects.filter(pk=create_farms[0].pk).update(
+        created_at=datetime(2024, 3, 1, 2, tzinfo=timezone.utc)
+    )
+    params = {"interval": "month", "start": "2024-01-15", "end": "2024-03-31"}
+    response = client.get(URL, params)
+    assert response.status_code == HTTP_200_OK
+    assert response.data["interval"] == "month"
+    assert response.data["state"] is None
+    assert [point["period"] for point in response.json()["series"]] == [
+        "2024-01-01",
+        "2024-02-01",
+        "2024-03-01",
+    ]
+    assert [point["farm_count"] for point in response.data["series"]] == [0, 1, 0]
+
+
+@pytest.mark.django_db
+def test_dashboard_timeseries_defaults(client, create_farms):
+    response = client.get(URL)
+    assert response.status_code == HTTP_200_OK
+    series = response.json()["series"]
+    assert len(series) == 30
+    assert series[-1]["period"] == localdate().isoformat()
+    assert series[-1]["farm_count"] == 2
+    assert series[-1]["farmer_count"] == 2
+
+
+@pytest.mark.django_db
+def test_dashboard_timeseries_by_state(client, create_farms):
+    response = client.get(URL, {"interval": "week", "state": "ba"})
+    assert response.status_code == HTTP_200_OK
+    assert response.data["state"] == "BA"
+    assert len(response.data["series"]) == 12
+    assert response.data["series"][-1]["farm_count"] == 1
+
+
+@pytest.mark.django_db
+def test_dashboard_timeseries_not_modified(
+    client, create_farms, django_assert_num_queries
+):
+    params = {"interval": "month"}
+    response = client.get(URL, params)
+    with django_assert_num_queries(1):
+        not_modified = client.get(URL, params, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == HTTP_304_NOT_MODIFIED
+    other = client.get(URL, {"interval": "day"}, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert other.status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_dashboard_timeseries_modified_by_farmer(client, run_on_commit, create_farms):
+    response = client.get(URL)
+    with run_on_commit():
+        Farmer.objects.create(name="Ana", cpf_cnpj="95181040004")
+    modified = client.get(URL, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert modified.status_code == HTTP_200_OK
+    assert modified.data["series"][-1]["farmer_count"] == 3
+
+
+@pytest.mark.django_db
+def test_dashboard_timeseries_async(client, async_client, create_farms):
+    response = async_to_sync(async_client.get)(URL, {"interval": "month"})
+    assert response.status_code == HTTP_200_OK
+    assert response.content == client.get(URL, {"interval": "month"}).content
+
+
+# Negative cases
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, errors",
+    [
+        ({"interval": "year"}, ["interval"]),
+        ({"start": "2024-13-01", "end": "ontem"}, ["end", "start"]),
+        ({"state": "XX"}, ["state"]),
+        ({"start": "2024-02-01", "end": "2024-01-01"}, ["start"]),
+        ({"start": "2000-01-01", "end": "2024-01-01"}, ["start"]),
+        ({"interval": "month", "end": "9999-12-01"}, ["start"]),
+    ],
+)
+def test_dashboard_timeseries_invalid_params(client, params, errors):
+    response = client.get(URL, params)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert sorted(response.data) == errors
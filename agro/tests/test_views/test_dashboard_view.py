@@ -1,6 +1,6 @@
 import pytest
 from django.urls import reverse
-from rest_framework.status import HTTP_200_OK
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
 
 from agro.models import Crop, Farm
 
@@ -46,6 +46,54 @@ def test_dashboard_api_view(client, create_farms, create_crop_types):
     )
 
 
+@pytest.mark.django_db
+def test_dashboard_api_view_not_modified(
+    client, django_assert_num_queries, create_farms
+):
+    url = reverse("dashboard")
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert etag.startswith('"')
+    # Only the data version is read
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_dashboard_api_view_cached_until_write(
+    client, django_assert_num_queries, run_on_commit, create_farms
+):
+    url = reverse("dashboard")
+    etag = client.get(url).headers["ETag"]
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    assert response.data["farm_count"] == 2
+    with run_on_commit():
+        create_farms[0].delete()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.data["farm_count"] == 1
+
+
+@pytest.mark.django_db
+def test_dashboard_api_view_invalidated_by_crop_type_rename(
+    client, run_on_commit, create_farms, create_crop_types
+):
+    crop_type = create_crop_types[0]
+    Crop.objects.create(farm=create_farms[0], crop_type=crop_type)
+    url = reverse("dashboard")
+    client.get(url)
+    with run_on_commit():
+        crop_type.name = "Algodão"
+        crop_type.save()
+    response = client.get(url)
+    assert response.data["farm_count_by_crop"] == [
+        {"crop_type_name": "Algodão", "total": 1}
+    ]
+
+
 # Negative cases
 @pytest.mark.django_db
 def test_dashboard_api_view_no_data(client):
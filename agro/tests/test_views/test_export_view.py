@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from agro.models import Crop
+
+
+def read_content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+# Positve cases
+@pytest.mark.django_db
+def test_farm_export_csv(client, create_farms):
+    url = reverse("farm-export")
+    response = client.get(url)
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["Content-Type"].startswith("text/csv")
+    assert 'filename="farm.csv"' in response.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(read_content(response))))
+    assert len(rows) == len(create_farms)
+    farm = create_farms[-1]
+    assert rows[0]["id"] == str(farm.id)
+    assert rows[0]["farmer_id"] == str(farm.farmer_id)
+    assert rows[0]["state"] == farm.state
+    assert rows[0]["total_area_hectares"] == "200.00"
+
+
+@pytest.mark.django_db
+def test_farmer_export_ndjson(client, create_farmers):
+    url = reverse("farmer-export")
+    response = client.get(url, {"output": "ndjson"})
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in read_content(response).splitlines()]
+    assert {row["cpf_cnpj"] for row in rows} == {
+        farmer.cpf_cnpj for farmer in create_farmers
+    }
+    assert list(rows[0]) == ["id", "cpf_cnpj", "name", "created_at", "updated_at"]
+
+
+@pytest.mark.django_db
+def test_crop_export_ndjson(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop_type = create_crop_types[0]
+    crop = Crop.objects.create(farm=farm, crop_type=crop_type)
+    url = reverse("crop-export")
+    response = client.get(url, {"output": "ndjson"})
+    rows = [json.loads(line) for line in read_content(response).splitlines()]
+    assert rows == [
+        {
+            "id": str(crop.id),
+            "farm_id": str(farm.id),
+            "crop_type_id": crop_type.id,
+            "crop_type_name": crop_type.name,
+            "created_at": rows[0]["created_at"],
+            "updated_at": rows[0]["updated_at"],
+        }
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["farmer-export", "farm-export", "crop-export"])
+def test_export_formats_match(client, create_farms, create_crop_types, url_name):
+    Crop.objects.create(farm=create_farms[0], crop_type=create_crop_types[0])
+    url = reverse(url_name)
+    csv_rows = list(csv.DictReader(io.StringIO(read_content(client.get(url)))))
+    ndjson_rows = [
+        json.loads(line)
+        for line in read_content(client.get(url, {"output": "ndjson"})).splitlines()
+    ]
+    assert csv_rows
+    # CSV has no types: every value is compared as the text it writes
+    assert csv_rows == [
+        {field: "" if value is None else str(value) for field, value in row.items()}
+        for row in ndjson_rows
+    ]
+    assert csv_rows[0]["created_at"].endswith("Z")
+
+
+@pytest.mark.django_db
+def test_farm_export_in_chunks(client, settings, create_farms):
+    settings.EXPORT_CHUNK_SIZE = 1
+    url = reverse("farm-export")
+    response = client.get(url)
+    chunks = list(response.streaming_content)
+    assert len(chunks) == len(create_farms) + 1
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_farm_export_with_invalid_output(client):
+    url = reverse("farm-export")
+    response = client.get(url, {"output": "xml"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+# Edge/corner/boundary cases
+@pytest.mark.django_db
+def test_farm_export_empty(client):
+    url = reverse("farm-export")
+    response = client.get(url)
+    assert response.status_code == HTTP_200_OK
+    assert read_content(response).splitlines() == [
+        "id,farmer_id,name,city,state,total_area_hectares,arable_area_hectares,"
+        "vegetation_area_hectares,created_at,updated_at"
+    ]
@@ -0,0 +1,160 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+from agro.business.crop_types import get_crop_types
+from agro.business.dashboard import calculate_dashboard_data, get_dashboard_data
+from agro.models import Crop, CropType
+
+
+def get_url(farm):
+    return reverse("farm-crops", kwargs={"pk": farm.pk})
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_farm_crops(client, create_farms, create_crop_types, django_assert_num_queries):
+    farm = create_farms[0]
+    for crop_type in create_crop_types:
+        Crop.objects.create(farm=farm, crop_type=crop_type)
+    # The crop type names come from the registry, loaded once per process
+    get_crop_types()
+    # The ETag metadata query, then the farm with its crop type ids; the crop
+    # type version is not read again within CROP_TYPES_TIMEOUT
+    with django_assert_num_queries(2):
+        response = client.get(get_url(farm))
+    assert response.status_code == HTTP_200_OK
+    assert response.data["farm"]["id"] == str(farm.id)
+    assert response.data["farm"]["farmer"]["name"] == farm.farmer.name
+    assert response.data["crops"] == [
+        {"id": crop_type.id, "name": crop_type.name} for crop_type in create_crop_types
+    ]
+
+
+@pytest.mark.django_db
+def test_farm_crops_empty(client, create_farms):
+    response = client.get(get_url(create_farms[0]))
+    assert response.status_code == HTTP_200_OK
+    assert response.data["crops"] == []
+
+
+@pytest.mark.django_db
+def test_farm_crops_add(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop_type1, crop_type2 = create_crop_types
+    Crop.objects.create(farm=farm, crop_type=crop_type1)
+    data = {"crop_type_ids": [crop_type1.id, crop_type2.id, crop_type2.id]}
+    response = client.post(get_url(farm), data, content_type="application/json")
+    assert response.status_code == HTTP_200_OK
+    assert [crop["id"] for crop in response.data["crops"]] == [
+        crop_type1.id,
+        crop_type2.id,
+    ]
+    assert Crop.objects.filter(farm=farm).count() == 2
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_farm_crops_remove(client, create_farms, create_crop_types):
+    farm1, farm2 = create_farms
+    crop_type1, crop_type2 = create_crop_types
+    for farm in create_farms:
+        for crop_type in create_crop_types:
+            Crop.objects.create(farm=farm, crop_type=crop_type)
+    data = {"crop_type_ids": [crop_type1.id]}
+    response = client.delete(get_url(farm1), data, content_type="application/json")
+    assert response.status_code == HTTP_200_OK
+    assert response.data["crops"] == [{"id": crop_type2.id, "name": crop_type2.name}]
+    assert Crop.objects.filter(farm=farm2).count() == 2
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_farm_crops_set(client, create_farms, create_crop_types, method):
+    farm1, farm2 = create_farms
+    crop_type1, crop_type2 = create_crop_types
+    crop_type3 = CropType.objects.create(name="Café")
+    Crop.objects.create(farm=farm1, crop_type=crop_type1)
+    Crop.objects.create(farm=farm1, crop_type=crop_type2)
+    Crop.objects.create(farm=farm2, crop_type=crop_type1)
+    data = {"crop_type_ids": [crop_type3.id, crop_type2.id, crop_type3.id]}
+    response = getattr(client, method)(
+        get_url(farm1), data, content_type="application/json"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert [crop["id"] for crop in response.data["crops"]] == [
+        crop_type2.id,
+        crop_type3.id,
+    ]
+    assert Crop.objects.filter(farm=farm2).count() == 1
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_farm_crops_set_unchanged(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    for crop_type in create_crop_types:
+        Crop.objects.create(farm=farm, crop_type=crop_type)
+    data = {"crop_type_ids": [crop_type.id for crop_type in create_crop_types]}
+    get_crop_types()
+    with CaptureQueriesContext(connection) as context:
+        response = client.put(get_url(farm), data, content_type="application/json")
+    assert response.status_code == HTTP_200_OK
+    assert len(response.data["crops"]) == 2
+    assert not any(
+        query["sql"].startswith(("INSERT", "DELETE", "UPDATE"))
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_farm_crops_set_empty(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+    data = {"crop_type_ids": []}
+    response = client.put(get_url(farm), data, content_type="application/json")
+    assert response.status_code == HTTP_200_OK
+    assert response.data["crops"] == []
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_farm_crops_not_found(client, create_farms):
+    url = reverse("farm-crops", kwargs={"pk": "01234567-8901-2345-6789-012345678901"})
+    assert client.get(url).status_code == HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "data", [{}, {"crop_type_ids": []}, {"crop_type_ids": ["soja"]}]
+)
+def test_farm_crops_invalid_data(client, create_farms, create_crop_types, data):
+    response = client.post(
+        get_url(create_farms[0]), data, content_type="application/json"
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert "crop_type_ids" in response.data
+
+
+@pytest.mark.django_db
+def test_farm_crops_unknown_crop_type(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    data = {"crop_type_ids": [create_crop_types[0].id, 999]}
+    response = client.post(get_url(farm), data, content_type="application/json")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert "999" in str(response.data["crop_type_ids"])
+    assert not Crop.objects.filter(farm=farm).exists()
+
+
+@pytest.mark.django_db
+def test_farm_crops_set_unknown_crop_type(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+    data = {"crop_type_ids": [999]}
+    response = client.put(get_url(farm), data, content_type="application/json")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert Crop.objects.filter(farm=farm).count() == 1
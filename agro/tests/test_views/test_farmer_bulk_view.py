@@ -0,0 +1,161 @@
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.status import (
+    HTTP_201_CREATED,
+    HTTP_207_MULTI_STATUS,
+    HTTP_400_BAD_REQUEST,
+)
+
+from agro.business import onboarding
+from agro.business.dashboard import calculate_dashboard_data, get_dashboard_data
+from agro.models import Crop, Farm, Farmer
+
+
+def farm_data(**kwargs):
+    data = {
+        "name": "Fazenda Sergipe",
+        "city": "Lagarto",
+        "state": "SE",
+        "total_area_hectares": "100.00",
+        "arable_area_hectares": "60.00",
+        "vegetation_area_hectares": "40.00",
+    }
+    data.update(kwargs)
+    return data
+
+
+def post_bulk(client, data):
+    url = reverse("farmer-bulk")
+    return client.post(url, json.dumps(data), content_type="application/json")
+
+
+# Positve cases
+@pytest.mark.django_db
+def test_farmer_bulk_create(client, create_crop_types):
+    crop_type1, crop_type2 = create_crop_types
+    data = [
+        {
+            "name": "Ana",
+            "cpf_cnpj": "951.810.400-04",
+            "farms": [
+                farm_data(crop_type_ids=[crop_type1.id, crop_type2.id]),
+                farm_data(name="Fazenda Tocantins", state="TO"),
+            ],
+        },
+        {"name": "Cooperativa", "cpf_cnpj": "77759188000180"},
+    ]
+    response = post_bulk(client, data)
+    assert response.status_code == HTTP_201_CREATED
+    assert response.data["created"] == {"farmers": 2, "farms": 2, "crops": 2}
+    assert response.data["errors"] == []
+    assert Farmer.objects.filter(cpf_cnpj="95181040004").exists()
+    assert Farm.objects.filter(farmer__name="Ana").count() == 2
+    assert Crop.objects.filter(farm__name="Fazenda Sergipe").count() == 2
+    assert get_dashboard_data() == calculate_dashboard_data()
+
+
+@pytest.mark.django_db
+def test_farmer_bulk_create_in_batches(client, settings, django_assert_max_num_queries):
+    settings.BULK_ONBOARDING = {"BATCH_SIZE": 2, "MAX_FARMERS": 100}
+    data = [
+        {"name": "Ana", "cpf_cnpj": "95181040004", "farms": [farm_data()]},
+        {"name": "Bia", "cpf_cnpj": "53545781089", "farms": [farm_data()]},
+        {"name": "Cooperativa", "cpf_cnpj": "77759188000180"},
+    ]
+    with django_assert_max_num_queries(30):
+        response = post_bulk(client, data)
+    assert response.status_code == HTTP_201_CREATED
+    assert response.data["created"]["farmers"] == 3
+    assert Farm.objects.count() == 2
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_farmer_bulk_create_reports_errors_per_item(client, create_farmers):
+    data = [
+        {"name": "Ana", "cpf_cnpj": "95181040004"},
+        {"name": "Inválido", "cpf_cnpj": "12345678901"},
+        {"name": "Repetido", "cpf_cnpj": create_farmers[0].cpf_cnpj},
+        {
+            "name": "Sem área",
+            "cpf_cnpj": "53545781089",
+            "farms": [farm_data(arable_area_hectares="90.00")],
+        },
+        {"name": "Ana de novo", "cpf_cnpj": "951.810.400-04"},
+    ]
+    response = post_bulk(client, data)
+    assert response.status_code == HTTP_207_MULTI_STATUS
+    assert response.data["created"]["farmers"] == 1
+    assert [error["index"] for error in response.data["errors"]] == [1, 2, 3, 4]
+    assert "cpf_cnpj" in response.data["errors"][0]["errors"]
+    assert "cpf_cnpj" in response.data["errors"][1]["errors"]
+    assert "farms" in response.data["errors"][2]["errors"]
+    assert "cpf_cnpj" in response.data["errors"][3]["errors"]
+
+
+@pytest.mark.django_db
+def test_farmer_bulk_create_concurrent_duplicate(client, monkeypatch):
+    check_cpf_cnpjs = onboarding._check_cpf_cnpjs
+
+    def check_then_create(farmers_data, errors):
+        found = check_cpf_cnpjs(farmers_data, errors)
+        if not Farmer.objects.exists():
+            # Created by a concurrent request right after the check
+            Farmer.objects.create(name="Ana", cpf_cnpj="95181040004")
+        return found
+
+    monkeypatch.setattr(onboarding, "_check_cpf_cnpjs", check_then_create)
+    data = [
+        {"name": "Ana", "cpf_cnpj": "95181040004"},
+        {"name": "Cooperativa", "cpf_cnpj": "77759188000180"},
+    ]
+    response = post_bulk(client, data)
+    assert response.status_code == HTTP_207_MULTI_STATUS
+    assert response.data["created"]["farmers"] == 1
+    assert response.data["errors"] == [
+        {
+            "index": 0,
+            "errors": {
+                "cpf_cnpj": [
+                    "A farmer with the CPF or CNPJ 95181040004 already exists."
+                ]
+            },
+        }
+    ]
+    assert Farmer.objects.filter(cpf_cnpj="77759188000180").exists()
+
+
+@pytest.mark.django_db
+def test_farmer_bulk_create_with_invalid_crop_type(client):
+    data = [
+        {
+            "name": "Ana",
+            "cpf_cnpj": "95181040004",
+            "farms": [farm_data(crop_type_ids=[999])],
+        }
+    ]
+    response = post_bulk(client, data)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert Farmer.objects.count() == 0
+
+
+# Edge/corner/boundary cases
+@pytest.mark.parametrize("data", [[], {"name": "Ana"}])
+@pytest.mark.django_db
+def test_farmer_bulk_create_requires_a_list(client, data):
+    response = post_bulk(client, data)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_farmer_bulk_create_over_the_limit(client, settings):
+    settings.BULK_ONBOARDING = {"BATCH_SIZE": 2, "MAX_FARMERS": 1}
+    data = [
+        {"name": "Ana", "cpf_cnpj": "95181040004"},
+        {"name": "Bia", "cpf_cnpj": "53545781089"},
+    ]
+    response = post_bulk(client, data)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert Farmer.objects.count() == 0
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from django.urls import reverse
 from rest_framework.status import (
@@ -65,6 +67,23 @@ def test_farmer_retrieve(client, create_farmers):
     assert response.data["cpf_cnpj"] == farmer.cpf_cnpj
 
 
+@pytest.mark.django_db
+def test_farmer_validate_documents(client):
+    url = reverse("farmer-validate-documents")
+    documents = ["951.810.400-04", "12345678901", "77759188000180", ""]
+    response = client.post(
+        url, json.dumps({"documents": documents}), content_type="application/json"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.data["valid_count"] == 2
+    assert response.data["results"] == [
+        {"document": "951.810.400-04", "valid": True},
+        {"document": "12345678901", "valid": False},
+        {"document": "77759188000180", "valid": True},
+        {"document": "", "valid": False},
+    ]
+
+
 # Negative cases
 @pytest.mark.django_db
 def test_retrieve_nonexistent_farmer(client):
@@ -105,6 +124,14 @@ def test_update_farmer_with_invalid_data(client, create_farmers):
     assert response.status_code == HTTP_400_BAD_REQUEST
 
 
+@pytest.mark.parametrize("data", [{}, {"documents": []}, {"documents": "95181040004"}])
+@pytest.mark.django_db
+def test_farmer_validate_documents_with_invalid_payload(client, data):
+    url = reverse("farmer-validate-documents")
+    response = client.post(url, json.dumps(data), content_type="application/json")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
 # Edge/corner/boundary cases
 @pytest.mark.django_db
 def test_create_farmer_with_invalid_cpf_cnpj_format(client):
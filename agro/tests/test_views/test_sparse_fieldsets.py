@@ -0,0 +1,169 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_400_BAD_REQUEST,
+)
+
+from agro.models import Crop
+
+
+def get_select_queries(context):
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("SELECT")
+    ]
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_farm_list_fields(client, create_farms):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse("farm-list"), {"fields": "id,name"})
+    assert response.status_code == HTTP_200_OK
+    assert all(set(farm) == {"id", "name"} for farm in response.data["results"])
+    page_query = get_select_queries(context)[-1]
+    assert "agro_farmer" not in page_query
+    assert "city" not in page_query
+
+
+@pytest.mark.django_db
+def test_farm_list_collapses_farmer(client, create_farms):
+    response = client.get(reverse("farm-list"), {"expand": ""})
+    assert response.status_code == HTTP_200_OK
+    farmers = {str(farm.farmer_id) for farm in create_farms}
+    assert {farm["farmer"] for farm in response.json()["results"]} == farmers
+    assert "state" in response.json()["results"][0]
+
+
+@pytest.mark.django_db
+def test_farm_list_nested_fields(client, create_farms):
+    response = client.get(reverse("farm-list"), {"fields": "name,farmer.name"})
+    assert response.status_code == HTTP_200_OK
+    names = {farm.farmer.name for farm in create_farms}
+    assert {farm["farmer"]["name"] for farm in response.data["results"]} == names
+    assert all(set(farm) == {"name", "farmer"} for farm in response.data["results"])
+    assert all(set(farm["farmer"]) == {"name"} for farm in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_farm_detail_omit(client, create_farms):
+    farm = create_farms[0]
+    url = reverse("farm-detail", kwargs={"pk": farm.pk})
+    response = client.get(url, {"omit": "farmer.cpf_cnpj,city"})
+    assert response.status_code == HTTP_200_OK
+    assert "city" not in response.data
+    assert response.data["farmer"] == {
+        "id": str(farm.farmer.id),
+        "name": farm.farmer.name,
+    }
+
+
+@pytest.mark.django_db
+def test_farmer_list_omit(client, create_farmers):
+    response = client.get(reverse("farmer-list"), {"omit": "cpf_cnpj"})
+    assert response.status_code == HTTP_200_OK
+    assert all(set(farmer) == {"id", "name"} for farmer in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_crop_type_list_fields(client, create_crop_types):
+    response = client.get(reverse("croptype-list"), {"fields": "name"})
+    assert response.status_code == HTTP_200_OK
+    assert response.data == [
+        {"name": crop_type.name} for crop_type in create_crop_types
+    ]
+
+
+@pytest.mark.django_db
+def test_crop_list_fields(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse("crop-list"), {"fields": "farm.name,crops"})
+    assert response.status_code == HTTP_200_OK
+    assert response.data["results"] == [
+        {
+            "farm": {"name": farm.name},
+            "crops": [
+                {"id": create_crop_types[0].id, "name": create_crop_types[0].name}
+            ],
+        }
+    ]
+    assert "agro_farmer" not in get_select_queries(context)[-1]
+
+
+@pytest.mark.django_db
+def test_crop_list_collapses_farm(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop = Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+    response = client.get(reverse("crop-list"), {"expand": "", "omit": "crops"})
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["results"] == [{"id": str(crop.id), "farm": str(farm.id)}]
+
+
+@pytest.mark.django_db
+def test_crop_detail_fields(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop = Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+    url = reverse("crop-detail", kwargs={"pk": crop.pk})
+    response = client.get(url, {"fields": "id,farm.state"})
+    assert response.status_code == HTTP_200_OK
+    assert response.data == {"id": crop.id, "farm": {"state": farm.state}}
+
+
+# Negative cases
+@pytest.mark.django_db
+def test_fieldset_ignored_on_write(client, create_farmers):
+    url = f"{reverse('farmer-list')}?fields=id"
+    data = {"name": "Ana", "cpf_cnpj": "951.810.400-04"}
+    response = client.post(url, data, format="json")
+    assert response.status_code == HTTP_201_CREATED
+    assert set(response.data) == {"id", "name", "cpf_cnpj"}
+
+
+@pytest.mark.django_db
+def test_fieldset_unknown_fields(client, create_farmers):
+    response = client.get(reverse("farmer-list"), {"fields": "id,unknown"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json() == {"fields": ["Unknown fields: unknown."]}
+
+
+@pytest.mark.django_db
+def test_fieldset_unknown_nested_fields(client, create_farms):
+    url = reverse("farm-detail", kwargs={"pk": create_farms[0].pk})
+    response = client.get(
+        url, {"omit": "farmer.unknown,name.first", "expand": "unknown"}
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        "omit": ["Unknown fields: farmer.unknown, name.first."],
+        "expand": ["Unknown fields: unknown."],
+    }
+
+
+@pytest.mark.django_db
+def test_crop_list_unknown_fields(client, create_farms, create_crop_types):
+    response = client.get(reverse("crop-list"), {"fields": "crop_type,crops.name"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json() == {"fields": ["Unknown fields: crop_type, crops.name."]}
+
+
+# Edge/corner/boundary cases
+@pytest.mark.django_db
+def test_crop_list_payload_fields(client, create_farms, create_crop_types):
+    farm = create_farms[0]
+    crop = Crop.objects.create(farm=farm, crop_type=create_crop_types[0])
+    response = client.get(reverse("crop-list"), {"fields": "id,farm.name,crops"})
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["results"] == [
+        {
+            "id": str(crop.id),
+            "farm": {"name": farm.name},
+            "crops": [{"id": crop.crop_type_id, "name": crop.crop_type.name}],
+        }
+    ]
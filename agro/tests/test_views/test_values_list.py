@@ -0,0 +1,80 @@
+import pytest
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK
+
+from agro.models import Farm
+from agro.views import CropTypeViewSet, FarmerViewSet, FarmViewSet
+
+VIEWSETS = [
+    ("farmer-list", FarmerViewSet),
+    ("farm-list", FarmViewSet),
+    ("croptype-list", CropTypeViewSet),
+]
+
+
+@pytest.fixture
+def create_data(create_farms, create_crop_types):
+    farmer = create_farms[0].farmer
+    Farm.objects.create(
+        name="Fazenda São João",
+        farmer=farmer,
+        city="Ribeirão Preto",
+        state="SP",
+        total_area_hectares="1234.56",
+        arable_area_hectares="0.10",
+        vegetation_area_hectares="1000",
+    )
+
+
+# Positive cases
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name, viewset", VIEWSETS)
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"page_size": 2},
+        {"page": 2, "page_size": 1},
+        {"pagination": "cursor", "page_size": 2},
+        {"fields": "id,name"},
+        {"omit": "id", "expand": ""},
+    ],
+)
+def test_values_list_matches_serializer(
+    client, monkeypatch, create_data, url_name, viewset, params
+):
+    url = reverse(url_name)
+    response = client.get(url, params)
+    assert response.status_code == HTTP_200_OK
+    monkeypatch.setattr(viewset, "list_from_values", False)
+    expected = client.get(url, params)
+    assert expected.status_code == HTTP_200_OK
+    assert response.content == expected.content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params", [{"fields": "id,name,farmer.name"}, {"omit": "farmer.cpf_cnpj"}]
+)
+def test_values_list_matches_nested_serializer(
+    client, monkeypatch, create_data, params
+):
+    url = reverse("farm-list")
+    response = client.get(url, params)
+    assert response.status_code == HTTP_200_OK
+    monkeypatch.setattr(FarmViewSet, "list_from_values", False)
+    expected = client.get(url, params)
+    assert expected.status_code == HTTP_200_OK
+    assert response.content == expected.content
+
+
+@pytest.mark.django_db
+def test_values_list_next_cursor(client, create_data):
+    url = reverse("farm-list")
+    response = client.get(url, {"pagination": "cursor", "page_size": 2})
+    assert response.status_code == HTTP_200_OK
+    next_page = client.get(response.data["next"])
+    assert next_page.status_code == HTTP_200_OK
+    names = [farm["name"] for farm in response.data["results"]]
+    names += [farm["name"] for farm in next_page.data["results"]]
+    assert sorted(names) == sorted(Farm.objects.values_list("name", flat=True))
@@ -0,0 +1,27 @@
+import pytest
+from django.db import connection
+
+from agro.warmup import connect_databases
+
+
+@pytest.fixture
+def closed(monkeypatch):
+    closed = []
+    monkeypatch.setattr(connection, "close", lambda: closed.append(connection))
+    return closed
+
+
+# Positive cases
+@pytest.mark.django_db
+def test_connect_databases_keeps_persistent_connections(monkeypatch, closed):
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 60)
+    connect_databases()
+    assert connection.connection is not None
+    assert connection not in closed
+
+
+@pytest.mark.django_db
+def test_connect_databases_closes_connections_per_request(monkeypatch, closed):
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 0)
+    connect_databases()
+    assert connection in closed
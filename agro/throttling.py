@@ -0,0 +1,102 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
+
+from .models import ThrottleCounter
+from .timing import get_request_timings
+
+logger = logging.getLogger(__name__)
+
+
+def get_throttle_cache():
+    if settings.THROTTLE_DATABASE:
+        return None
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def increment(cache, key, timeout):
+    # A single incr() for every request of a window but the first, which
+    # creates the counter; add() settles the race of two first requests.
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout):
+            return 1
+        return cache.incr(key)
+
+
+def increment_counter(key, expires_at):
+    # A single upsert, atomic in SQLite and Postgres: the row of the client
+    # starts over at 1 once its window is over.
+    database = connections[DEFAULT_DB_ALIAS]
+    quote = database.ops.quote_name
+    table = quote(ThrottleCounter._meta.db_table)
+    key_column, expires_at_column, requests_column = (
+        quote(ThrottleCounter._meta.get_field(name).column)
+        for name in ("key", "expires_at", "requests")
+    )
+    with database.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({key_column}, {expires_at_column}, "
+            f"{requests_column}) VALUES (%s, %s, 1) "
+            f"ON CONFLICT ({key_column}) DO UPDATE SET {requests_column} = "
+            f"CASE WHEN {table}.{expires_at_column} = %s "
+            f"THEN {table}.{requests_column} + 1 ELSE 1 END, "
+            f"{expires_at_column} = %s RETURNING {requests_column}",
+            [key, expires_at, expires_at, expires_at],
+        )
+        return cursor.fetchone()[0]
+
+
+def delete_expired_counters(now):
+    return (
+        ThrottleCounter.objects.using(DEFAULT_DB_ALIAS)
+        .filter(expires_at__lte=now)
+        .delete()[0]
+    )
+
+
+class FixedWindowRateThrottle(SimpleRateThrottle):
+    # One counter per client and window, instead of the list of request
+    # timestamps that SimpleRateThrottle reads and writes back every time.
+    cache_format = "agro:throttle:%(scope)s:%(ident)s"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        cache = get_throttle_cache()
+        if cache is not None:
+            count = increment(cache, f"{self.key}:{window}", self.duration)
+        else:
+            # The rows of clients that stopped sending requests are left to
+            # the clear_throttle_counters command.
+            count = increment_counter(self.key, (window + 1) * self.duration)
+        allowed = count <= self.num_requests
+        self.report(request, count, allowed)
+        return allowed
+
+    def wait(self):
+        return self.duration - self.now % self.duration
+
+    def report(self, request, count, allowed):
+        timings = get_request_timings(request)
+        if timings is not None:
+            timings.throttles.append((self.scope, count, self.num_requests))
+        if not allowed:
+            logger.warning(
+                f"Request throttled: {request.method} {request.get_full_path()} "
+                f"was request {count} of {self.num_requests} allowed in "
+                f"{self.duration}s for {self.key}"
+            )
+
+
+class AnonFixedWindowRateThrottle(FixedWindowRateThrottle, AnonRateThrottle):
+    pass
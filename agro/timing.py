@@ -0,0 +1,88 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+# The timings of the request being handled, copied by sync_to_async into the
+# thread that runs its queries.
+_request_timings = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.durations = defaultdict(float)
+        self.active = set()
+        # (scope, requests in the window, allowed requests) per throttle
+        self.throttles = []
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durations["db"] += time.perf_counter() - started_at
+            self.queries += 1
+
+    @contextmanager
+    def measure(self, name):
+        # Nested measurements of the same step (e.g. a serializer inside
+        # another one) are only counted once.
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - started_at
+            self.active.discard(name)
+
+    def timed(self, name, function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.measure(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started_at
+
+
+def get_request_timings(request):
+    return getattr(request, "server_timing", None)
+
+
+@contextmanager
+def track_queries(timings):
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    timings = _request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute_wrapper(execute, sql, params, many, context)
+
+
+def install_execute_wrapper(connection, **kwargs):
+    # Installed once per connection, which concurrent requests may share:
+    # each query is counted for the request of its own context.
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def server_timing(request, name):
+    timings = get_request_timings(request)
+    if timings is None:
+        return nullcontext()
+    return timings.measure(name)
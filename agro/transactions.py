@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from agro.business.dashboard import record_crops, record_farms
+from agro.cache import DATA_VERSION_KEY, bump_data_version
+
+
+class PendingChanges:
+    # What a transaction changed, applied once when it commits
+    def __init__(self):
+        self.removed_farms = []
+        self.removed_crops = []
+        self.versions = set()
+
+    def __call__(self):
+        # The summary first, so the new versions never cache the old one
+        if self.removed_farms or self.removed_crops:
+            with transaction.atomic():
+                record_farms(removed=self.removed_farms)
+                record_crops(removed=self.removed_crops)
+        for key in sorted(self.versions):
+            bump_data_version(key)
+
+
+@contextmanager
+def pending_changes(using=DEFAULT_DB_ALIAS):
+    # One instance per transaction and savepoint: rolling a savepoint back
+    # drops its callback, and the changes recorded under it with it.
+    connection = connections[using]
+    savepoint_ids = set(connection.savepoint_ids)
+    for callback_savepoint_ids, callback, _ in connection.run_on_commit:
+        if (
+            isinstance(callback, PendingChanges)
+            and callback_savepoint_ids == savepoint_ids
+        ):
+            yield callback
+            return
+    changes = PendingChanges()
+    yield changes
+    # Outside a transaction, it runs right away
+    transaction.on_commit(changes, using=using)
+
+
+def bump_data_version_on_commit(key=DATA_VERSION_KEY, using=DEFAULT_DB_ALIAS):
+    # Bumped only after commit, so a concurrent reader can never cache data
+    # that is about to be rolled back under the new version.
+    with pending_changes(using) as changes:
+        changes.versions.add(key)
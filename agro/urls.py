@@ -12,4 +12,9 @@ router.register(r"crops", views.CropViewSet)
 urlpatterns = [
     path("", include(router.urls)),
     path("dashboard/", views.DashboardAPIView.as_view(), name="dashboard"),
+    path(
+        "dashboard/timeseries/",
+        views.DashboardTimeseriesAPIView.as_view(),
+        name="dashboard-timeseries",
+    ),
 ]
@@ -1,88 +1,510 @@
 import logging
+import time
 
-from rest_framework import status, viewsets
+from adrf import viewsets
+from adrf.views import APIView
+from django.conf import settings
+from django.db.models import Count, F
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
-from .business.dashboard import get_dashboard_data
+from .business.crop_types import aget_crop_types, get_crop_types
+from .business.crops import (
+    add_crop_types,
+    annotate_crop_types,
+    get_crop_types_data,
+    get_farms_with_crops,
+    remove_crop_types,
+    set_crop_types,
+)
+from .business.dashboard import aget_cached_dashboard_data, get_cached_dashboard_data
+from .business.documents import validate_cpf_cnpj_batch
+from .business.onboarding import onboard_farmers
+from .business.timeseries import (
+    aget_cached_timeseries,
+    get_cached_timeseries,
+    get_period_range,
+)
+from .cache import aget_data_version, get_data_version
+from .fieldsets import Fieldset
+from .filters import (
+    QueryFilterBackend,
+    clean_area,
+    clean_date,
+    clean_document,
+    clean_integer,
+    clean_interval,
+    clean_state,
+    clean_text,
+    clean_uuid,
+)
+from .mixins import (
+    AsyncReadMixin,
+    ConditionalMixin,
+    ExportMixin,
+    ReplicaReadMixin,
+    ServerTimingMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+)
 from .models import Crop, CropType, Farm, Farmer
 from .pagination import StandardResultsSetPagination
 from .serializers import (
+    BulkFarmerSerializer,
     CropSerializer,
     CropTypeSerializer,
+    DocumentValidationSerializer,
+    FarmCropTypeSetSerializer,
+    FarmCropTypesSerializer,
     FarmerSerializer,
     FarmSerializer,
 )
+from .timing import server_timing
 
 logger = logging.getLogger(__name__)
 
 
-class FarmerViewSet(viewsets.ModelViewSet):
+class FarmerViewSet(
+    ReplicaReadMixin,
+    ConditionalMixin,
+    AsyncReadMixin,
+    ValuesListMixin,
+    SparseFieldsetMixin,
+    ServerTimingMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Farmer.objects.order_by("-updated_at").all()
     serializer_class = FarmerSerializer
     pagination_class = StandardResultsSetPagination
+    filter_backends = [QueryFilterBackend]
+    query_filters = {"document": ("cpf_cnpj", clean_document)}
+    export_fields = ("id", "cpf_cnpj", "name", "created_at", "updated_at")
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="validate-documents",
+        serializer_class=DocumentValidationSerializer,
+    )
+    def validate_documents(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        documents = serializer.validated_data["documents"]
+        results = validate_cpf_cnpj_batch(documents)
+        return Response(
+            {
+                "results": [
+                    {"document": document, "valid": valid}
+                    for document, valid in zip(documents, results)
+                ],
+                "valid_count": sum(results),
+            }
+        )
+
+    @action(detail=False, methods=["post"], serializer_class=BulkFarmerSerializer)
+    def bulk(self, request):
+        farmers_data = request.data
+        max_farmers = settings.BULK_ONBOARDING["MAX_FARMERS"]
+        if not isinstance(farmers_data, list) or not farmers_data:
+            return Response(
+                {"error": "Expected a non-empty list of farmers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(farmers_data) > max_farmers:
+            return Response(
+                {"error": f"A single request accepts up to {max_farmers} farmers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        started_at = time.perf_counter()
+        context = self.get_serializer_context()
+        context["crop_type_ids"] = set(get_crop_types(refresh=True).names)
+        batch_size = settings.BULK_ONBOARDING["BATCH_SIZE"]
+        created = {"farmers": 0, "farms": 0, "crops": 0}
+        errors = []
+        for start in range(0, len(farmers_data), batch_size):
+            indexes, batch = [], []
+            end = start + batch_size
+            for index, farmer_data in enumerate(farmers_data[start:end], start=start):
+                serializer = self.get_serializer(data=farmer_data, context=context)
+                if serializer.is_valid():
+                    indexes.append(index)
+                    batch.append(serializer.validated_data)
+                else:
+                    errors.append({"index": index, "errors": serializer.errors})
+            if not batch:
+                continue
+            batch_created, batch_errors = onboard_farmers(batch)
+            for key, total in batch_created.items():
+                created[key] += total
+            errors.extend(
+                {"index": indexes[position], "errors": error}
+                for position, error in batch_errors.items()
+            )
+        elapsed = time.perf_counter() - started_at
+        rows = sum(created.values())
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif rows:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "created": created,
+                "errors": sorted(errors, key=lambda error: error["index"]),
+                "elapsed_seconds": round(elapsed, 3),
+                "rows_per_second": round(rows / elapsed) if elapsed else rows,
+            },
+            status=response_status,
+        )
 
 
-class FarmViewSet(viewsets.ModelViewSet):
+class FarmViewSet(
+    ReplicaReadMixin,
+    ConditionalMixin,
+    AsyncReadMixin,
+    ValuesListMixin,
+    SparseFieldsetMixin,
+    ServerTimingMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Farm.objects.select_related("farmer").order_by("-updated_at").all()
     serializer_class = FarmSerializer
     pagination_class = StandardResultsSetPagination
+    conditional_actions = ("list", "retrieve", "crops")
+    conditional_lookups = ("updated_at", "farmer__updated_at")
+    filter_backends = [QueryFilterBackend]
+    query_filters = {
+        "state": ("state", clean_state),
+        "city": ("city", clean_text),
+        "farmer": ("farmer_id", clean_uuid),
+        "total_area_hectares_min": ("total_area_hectares__gte", clean_area),
+        "total_area_hectares_max": ("total_area_hectares__lte", clean_area),
+        "arable_area_hectares_min": ("arable_area_hectares__gte", clean_area),
+        "arable_area_hectares_max": ("arable_area_hectares__lte", clean_area),
+    }
+    export_fields = (
+        "id",
+        "farmer_id",
+        "name",
+        "city",
+        "state",
+        "total_area_hectares",
+        "arable_area_hectares",
+        "vegetation_area_hectares",
+        "created_at",
+        "updated_at",
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "crops":
+            return annotate_crop_types(queryset)
+        return queryset
 
+    def get_conditional_lookups(self):
+        lookups = super().get_conditional_lookups()
+        if self.action == "crops":
+            return lookups + ("crops__updated_at",)
+        return lookups
 
-class CropTypeViewSet(viewsets.ModelViewSet):
+    def get_registry_updated_at(self):
+        if self.action == "crops":
+            return [get_crop_types().updated_at]
+        return []
+
+    def get_serializer_class(self):
+        if self.action == "crops" and self.request.method in ("PUT", "PATCH"):
+            return FarmCropTypeSetSerializer
+        return super().get_serializer_class()
+
+    @action(
+        detail=True,
+        methods=["get", "post", "put", "patch", "delete"],
+        serializer_class=FarmCropTypesSerializer,
+    )
+    def crops(self, request, pk=None):
+        farm = self.get_object()
+        if request.method != "GET":
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            crop_type_ids = serializer.validated_data["crop_type_ids"]
+            if request.method == "POST":
+                add_crop_types(farm, crop_type_ids)
+            elif request.method == "DELETE":
+                remove_crop_types(farm, crop_type_ids)
+            else:
+                set_crop_types(farm, crop_type_ids)
+            farm = self.get_object()
+        return Response(
+            {
+                "farm": FarmSerializer(farm).data,
+                "crops": get_crop_types_data(farm, get_crop_types()),
+            }
+        )
+
+
+class CropTypeViewSet(
+    ReplicaReadMixin,
+    ConditionalMixin,
+    AsyncReadMixin,
+    ValuesListMixin,
+    SparseFieldsetMixin,
+    ServerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = CropType.objects.order_by("id").all()
     serializer_class = CropTypeSerializer
 
 
-class CropViewSet(viewsets.ModelViewSet):
+class CropViewSet(
+    ReplicaReadMixin,
+    ConditionalMixin,
+    AsyncReadMixin,
+    SparseFieldsetMixin,
+    ServerTimingMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
-        Crop.objects.select_related("crop_type", "farm", "farm__farmer")
+        Crop.objects.select_related("farm", "farm__farmer")
         .order_by("-updated_at")
         .all()
     )
     serializer_class = CropSerializer
     pagination_class = StandardResultsSetPagination
+    conditional_lookups = (
+        "updated_at",
+        "farm__updated_at",
+        "farm__farmer__updated_at",
+    )
+    # The list is paginated by farm
+    conditional_page_count = Count("farm", distinct=True)
+    filter_backends = [QueryFilterBackend]
+    query_filters = {
+        "crop_type": ("crop_type_id", clean_integer),
+        "state": ("farm__state", clean_state),
+    }
+    export_fields = (
+        "id",
+        "farm_id",
+        "crop_type_id",
+        "crop_type_name",
+        "created_at",
+        "updated_at",
+    )
+    export_expressions = {"crop_type_name": F("crop_type__name")}
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        farm_data = {}
-        for crop in queryset:
-            farm_id = crop.farm.id
-            if farm_id not in farm_data:
-                farm_data[farm_id] = {
-                    "id": crop.id,
-                    "farm": FarmSerializer(crop.farm).data,
-                    "crops": [],
-                }
-            farm_data[farm_id]["crops"].append(
-                {"id": crop.crop_type.id, "name": crop.crop_type.name}
-            )
-        response_data = [value for value in farm_data.values()]
-        return Response(response_data)
+        page = self.paginate_queryset(self.get_farms())
+        return self.get_list_response(page, get_crop_types())
+
+    async def alist(self, request, *args, **kwargs):
+        page = await self.apaginate_queryset(self.get_farms())
+        return self.get_list_response(page, await aget_crop_types())
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        farm_id = instance.farm.id
-        queryset = self.queryset.filter(farm_id=farm_id)
-        farm_data = {
-            "id": instance.id,
-            "farm": FarmSerializer(instance.farm).data,
-            "crops": [
-                {"id": crop.crop_type.id, "name": crop.crop_type.name}
-                for crop in queryset
-            ],
-        }
+        crop_types_data = []
+        if self.includes_crops():
+            crop_types_data = get_crop_types().get_data(
+                list(self.get_crop_type_ids(instance))
+            )
+        return self.get_detail_response(instance, crop_types_data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        crop_types_data = []
+        if self.includes_crops():
+            crop_types = await aget_crop_types()
+            crop_types_data = crop_types.get_data(
+                [
+                    crop_type_id
+                    async for crop_type_id in self.get_crop_type_ids(instance)
+                ]
+            )
+        return self.get_detail_response(instance, crop_types_data)
+
+    def get_farms(self):
+        crops = self.filter_queryset(self.get_queryset())
+        farms = get_farms_with_crops(crops)
+        if self.get_fieldset() is not None:
+            farms = self.apply_fieldset(farms, self.get_farm_serializer())
+        return farms
+
+    def get_list_response(self, page, crop_types):
+        with server_timing(self.request, "serialize"):
+            farms_data = self.get_farm_serializer(page, many=True).data
+            response_data = [
+                self.get_crop_data(
+                    farm.crop_id,
+                    farm_data,
+                    lambda: get_crop_types_data(farm, crop_types),
+                )
+                for farm, farm_data in zip(page, farms_data)
+            ]
+        return self.get_paginated_response(response_data)
+
+    def includes_crops(self):
+        fieldset = self.get_fieldset()
+        return fieldset is None or fieldset.includes("crops")
+
+    def get_crop_type_ids(self, instance):
+        crops = self.queryset.filter(farm_id=instance.farm_id)
+        return crops.values_list("crop_type_id", flat=True)
+
+    def get_detail_response(self, instance, crop_types_data):
+        with server_timing(self.request, "serialize"):
+            farm_data = self.get_crop_data(
+                instance.id,
+                self.get_farm_serializer(instance.farm).data,
+                lambda: crop_types_data,
+            )
         return Response(farm_data)
 
+    def get_registry_updated_at(self):
+        return [get_crop_types().updated_at]
+
+    def get_conditional_queryset(self):
+        queryset = super().get_conditional_queryset()
+        if self.action == "retrieve":
+            # The payload lists every crop of the farm
+            return self.queryset.filter(farm__in=queryset.values("farm_id"))
+        return queryset
+
+    def get_fieldset_names(self):
+        return {
+            "id": {},
+            "farm": FarmSerializer().get_fieldset_names(),
+            # The crop types are always listed whole
+            "crops": {},
+        }
+
+    def get_fieldset_serializer(self):
+        # The payloads are built around the farm, see get_farm_serializer
+        return None
+
+    def get_farm_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            if fieldset.includes("farm") and fieldset.expands("farm"):
+                kwargs["fieldset"] = fieldset.nested("farm")
+            else:
+                # Only the farm id is rendered
+                kwargs["fieldset"] = Fieldset(fields={"id": {}})
+        return FarmSerializer(*args, **kwargs)
+
+    def get_crop_data(self, crop_id, farm_data, get_crops):
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return {"id": crop_id, "farm": farm_data, "crops": get_crops()}
+        crop_data = {}
+        if fieldset.includes("id"):
+            crop_data["id"] = crop_id
+        if fieldset.includes("farm"):
+            expanded = fieldset.expands("farm")
+            crop_data["farm"] = farm_data if expanded else farm_data["id"]
+        if fieldset.includes("crops"):
+            crop_data["crops"] = get_crops()
+        return crop_data
+
+
+def dashboard_etag(request, version):
+    return f"dashboard-{version}-{request.accepted_renderer.format}"
+
+
+class DashboardAPIView(ReplicaReadMixin, AsyncReadMixin, APIView):
+    async_handlers = ("get",)
 
-class DashboardAPIView(APIView):
     def get(self, request):
+        version = get_data_version()
+        etag = quote_etag(dashboard_etag(request, version))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            try:
+                response = Response(get_cached_dashboard_data(version))
+            except Exception as e:
+                response = self.get_error_response(e)
+        response.headers.setdefault("ETag", etag)
+        return response
+
+    async def aget(self, request):
+        version = await aget_data_version()
+        etag = quote_etag(dashboard_etag(request, version))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            try:
+                response = Response(await aget_cached_dashboard_data(version))
+            except Exception as e:
+                response = self.get_error_response(e)
+        response.headers.setdefault("ETag", etag)
+        return response
+
+    def get_error_response(self, e):
+        logger.error(f"Error retrieving dashboard data: {e}", exc_info=True)
+        return Response(
+            {"error": "An error occurred while processing your request."},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+class DashboardTimeseriesAPIView(ReplicaReadMixin, AsyncReadMixin, APIView):
+    async_handlers = ("get",)
+    query_params = {
+        "interval": clean_interval,
+        "start": clean_date,
+        "end": clean_date,
+        "state": clean_state,
+    }
+
+    def get(self, request):
+        params = self.get_params(request)
+        version = get_data_version()
+        etag = self.get_etag(request, params, version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(get_cached_timeseries(**params, version=version))
+        response.headers.setdefault("ETag", etag)
+        return response
+
+    async def aget(self, request):
+        params = self.get_params(request)
+        version = await aget_data_version()
+        etag = self.get_etag(request, params, version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(await aget_cached_timeseries(**params, version=version))
+        response.headers.setdefault("ETag", etag)
+        return response
+
+    def get_etag(self, request, params, version):
+        return quote_etag(
+            f"timeseries-{version}-{request.accepted_renderer.format}-"
+            + "-".join(str(value or "") for value in params.values())
+        )
+
+    def get_params(self, request):
+        params, errors = {"interval": "day", "start": None, "end": None}, {}
+        for param, clean in self.query_params.items():
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                params[param] = clean(value)
+            except ValueError as exc:
+                errors[param] = [str(exc)]
+        if errors:
+            raise ValidationError(errors)
         try:
-            dashboard_data = get_dashboard_data()
-            return Response(dashboard_data)
-        except Exception as e:
-            logger.error(f"Error retrieving dashboard data: {e}", exc_info=True)
-            return Response(
-                {"error": "An error occurred while processing your request."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            params["start"], params["end"] = get_period_range(
+                params["interval"], params["start"], params["end"]
             )
+        except ValueError as exc:
+            raise ValidationError({"start": [str(exc)]})
+        return params
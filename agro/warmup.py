@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+from django.utils import translation
+
+
+def load_urls():
+    # Imports the URLconf, with the views and serializers, and compiles
+    # every pattern, which Django otherwise does on the first request.
+    get_resolver()
+    reverse("api-root")
+
+
+def load_serializers():
+    from agro.urls import router
+
+    translation.activate(settings.LANGUAGE_CODE)
+    for _, viewset, _ in router.registry:
+        viewset.serializer_class().fields
+
+
+def connect_databases():
+    # Opened once to load the driver and resolve the server. A persistent
+    # connection (CONN_MAX_AGE != 0) stays open for the first request of a
+    # sync worker to reuse, and close() hands a pooled one back to the pool.
+    # Under ASGI each request runs the ORM in a thread of its own, with its
+    # own connections: only the pooled ones are reused there.
+    for connection in connections.all():
+        connection.ensure_connection()
+        if connection.settings_dict["CONN_MAX_AGE"] == 0:
+            connection.close()
+
+
+def warm_up():
+    load_urls()
+    load_serializers()
+    connect_databases()
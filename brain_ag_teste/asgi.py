@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "brain_ag_teste.settings")
+# Read by the settings, before the URLconf builds the views
+os.environ.setdefault("ASYNC_VIEWS", "True")
 
 application = get_asgi_application()
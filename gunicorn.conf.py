@@ -0,0 +1,28 @@
+# Read by gunicorn from the working directory, see agro/warmup.py
+import os
+
+# Sync workers by default, which served more requests per second in
+# `make load-test`; ASGI=True serves the async views with uvicorn workers.
+if os.environ.get("ASGI", "").lower() in ("1", "true", "yes", "on"):
+    worker_class = "uvicorn.workers.UvicornWorker"
+    wsgi_app = "brain_ag_teste.asgi"
+else:
+    wsgi_app = "brain_ag_teste.wsgi"
+
+# Import the app once in the master, so the workers fork with it loaded
+preload_app = True
+
+
+def when_ready(server):
+    # Still in the master: no database connection may be opened here, as the
+    # workers would share its socket.
+    from agro.warmup import load_serializers, load_urls
+
+    load_urls()
+    load_serializers()
+
+
+def post_fork(server, worker):
+    from agro.warmup import connect_databases
+
+    connect_databases()